@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Banc d'essai de l'analyse des expressions linéaires.
+
+Compare analyse_lineaire (lp_core) à l'ancienne analyse par expression
+régulière ([+-]?[\\d.]*[a-zA-Z]+, un terme à la fois) sur une expression
+aléatoire (100 000 termes par défaut), puis mesure l'accès au cache.
+
+À froid, analyse_lineaire est au mieux au niveau de l'ancienne expression,
+le plus souvent plus lente : le gain vient du cache et de la syntaxe élargie.
+
+Usage : python bench_analyse.py [--termes 100000] [--repetitions 5]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+
+from lp_core import analyse_lineaire
+
+_ANCIEN_TERME = re.compile(r'([+-]?[\d.]*[a-zA-Z]+)')
+_ANCIEN_COEF = re.compile(r'^[\d.]+')
+
+
+def analyse_ancienne(expression):
+    """Ancienne analyse : chiffres des variables perdus, constantes ignorées, sans fusion."""
+    analysee = []
+    for terme in _ANCIEN_TERME.findall(expression.replace(" ", "")):
+        signe = -1.0 if terme.startswith('-') else 1.0
+        terme = terme.lstrip('+-')
+        coef = _ANCIEN_COEF.match(terme)
+        variable = terme[len(coef.group()):] if coef else terme
+        analysee.append((signe * (float(coef.group()) if coef else 1.0), variable))
+    return analysee
+
+
+def generer_expression(n_termes, graine=0, variables=("x", "y", "z", "u", "v", "w")):
+    """Somme de `n_termes` termes « 37x » aux signes aléatoires (syntaxe commune aux deux)."""
+    rng = random.Random(graine)
+    return " ".join(f"{rng.choice('+-')} {rng.randint(1, 99)}{rng.choice(variables)}"
+                    for _ in range(n_termes)).lstrip("+ ")
+
+
+def chronometrer(fonction, expression, repetitions):
+    """Meilleur temps (s) sur `repetitions` appels."""
+    meilleur = float("inf")
+    for _ in range(repetitions):
+        if hasattr(fonction, "cache_clear"):
+            fonction.cache_clear()
+        debut = time.perf_counter()
+        fonction(expression)
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur
+
+
+def main(arguments=None):
+    parseur = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parseur.add_argument("--termes", type=int, default=100_000, help="nombre de termes")
+    parseur.add_argument("--repetitions", type=int, default=5)
+    args = parseur.parse_args(arguments)
+
+    expression = generer_expression(args.termes)
+    ancien = chronometrer(analyse_ancienne, expression, args.repetitions)
+    nouveau = chronometrer(analyse_lineaire, expression, args.repetitions)
+    debut = time.perf_counter()
+    analyse_lineaire(expression)
+    cache = time.perf_counter() - debut
+
+    # Mêmes coefficients une fois les termes de l'ancienne analyse fusionnés
+    fusion = {}
+    for coeff, var in analyse_ancienne(expression):
+        fusion[var] = fusion.get(var, 0.0) + coeff
+    identiques = all(abs(fusion[var] - coeff) <= 1e-9 * (1 + abs(coeff))
+                     for coeff, var in analyse_lineaire(expression).termes)
+
+    print(f"{args.termes} termes ({len(expression)} caractères)")
+    print(f"  expression régulière ancienne : {ancien * 1000:9.1f} ms")
+    print(f"  analyse_lineaire              : {nouveau * 1000:9.1f} ms  (×{ancien / nouveau:.2f})")
+    print(f"  analyse_lineaire, en cache    : {cache * 1e6:9.1f} µs")
+    print(f"  coefficients identiques       : {'oui' if identiques else 'NON'}")
+    return 0 if identiques else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Banc d'essai des solveurs (CBC, HiGHS, simplexe NumPy).
+
+Génère des programmes linéaires creux aléatoires, réalisables et bornés,
+de 10 à 100 000 variables, et mesure pour chaque solveur le temps de
+construction, le temps de résolution et le pic mémoire Python. L'écart
+relatif de chaque objectif à celui de CBC sert de contrôle d'exactitude.
+
+Usage : python bench_solveurs.py [--tailles 10 100 1000] [--csv resultats.csv]
+        python bench_solveurs.py --solveurs "CBC (PuLP)" "Simplexe NumPy" --regle bland
+
+Remarque : CBC tourne dans un sous-processus ; sa mémoire propre
+n'apparaît pas dans le pic mesuré (seule la traduction PuLP y figure).
+"""
+
+import argparse
+import csv
+import sys
+import time
+import tracemalloc
+from functools import partial
+
+import numpy as np
+
+from lp_core import assembler_modele, ecart_relatif
+from lp_solveurs import SOLVEURS
+
+TAILLES = (10, 100, 1_000, 10_000, 100_000)
+# Le simplexe NumPy travaille sur un tableau dense : au-delà, il est ignoré
+LIMITE_SIMPLEXE = 1_000
+
+
+def generer_modele(n, densite=5, graine=0):
+    """max c·x sous A x <= b, A >= 0 : x = 0 est réalisable et chaque colonne est bornée."""
+    rng = np.random.default_rng(graine)
+    m = max(2, n // 2)
+    nnz = densite * n
+    lignes = rng.integers(0, m, nnz)
+    # Chaque variable apparaît au moins une fois, ce qui borne le problème
+    colonnes = np.concatenate([np.arange(n), rng.integers(0, n, nnz - n)])
+    valeurs = rng.uniform(1.0, 10.0, nnz)
+    b = rng.uniform(10.0, 100.0, m)
+    c = rng.uniform(1.0, 10.0, n)
+    variables = [f"x{j:06d}" for j in range(n)]
+    return assembler_modele("max", variables, c, lignes, colonnes, valeurs, b, ["<="] * m)
+
+
+def mesurer(solveur, n):
+    """Renvoie (Resultat, construction en s, pic mémoire en Mo)."""
+    tracemalloc.start()
+    debut = time.perf_counter()
+    modele = generer_modele(n)
+    generation = time.perf_counter() - debut
+    resultat = solveur(modele)
+    _, pic = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultat, generation + resultat.construction, pic / 2**20
+
+
+def main(arguments=None):
+    parseur = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parseur.add_argument("--tailles", type=int, nargs="+", default=TAILLES,
+                         help="nombres de variables à tester")
+    parseur.add_argument("--solveurs", nargs="+", default=list(SOLVEURS),
+                         choices=list(SOLVEURS), help="solveurs à comparer")
+    parseur.add_argument("--limite-simplexe", type=int, default=LIMITE_SIMPLEXE,
+                         help="taille maximale confiée au simplexe NumPy")
+    parseur.add_argument("--regle", choices=["dantzig", "bland"], default="dantzig",
+                         help="règle de pivot du simplexe NumPy")
+    parseur.add_argument("--csv", help="fichier CSV de sortie")
+    args = parseur.parse_args(arguments)
+
+    solveurs = dict(SOLVEURS, **{"Simplexe NumPy": partial(SOLVEURS["Simplexe NumPy"],
+                                                           regle=args.regle)})
+    # CBC d'abord : son objectif sert de référence aux suivants
+    noms = sorted(args.solveurs, key=lambda nom: nom != "CBC (PuLP)")
+    lignes = []
+    print(f"{'Variables':>10}  {'Solveur':<16}{'Statut':<12}{'Construction':>14}"
+          f"{'Résolution':>14}{'Mémoire':>11}{'Objectif':>16}{'Écart CBC':>11}")
+    for n in args.tailles:
+        reference = None
+        for nom in noms:
+            if nom == "Simplexe NumPy" and n > args.limite_simplexe:
+                continue
+            resultat, construction, memoire = mesurer(solveurs[nom], n)
+            if nom == "CBC (PuLP)":
+                reference = resultat.objectif
+            ligne = {"variables": n, "solveur": nom, "statut": resultat.statut,
+                     "construction_ms": construction * 1000, "resolution_ms": resultat.temps * 1000,
+                     "memoire_mo": memoire, "objectif": resultat.objectif,
+                     "ecart_cbc": ecart_relatif(resultat.objectif, reference)}
+            lignes.append(ligne)
+            objectif = "-" if resultat.objectif is None else f"{resultat.objectif:.4f}"
+            ecart = "-" if ligne["ecart_cbc"] is None else f"{ligne['ecart_cbc']:.1e}"
+            print(f"{n:>10}  {nom:<16}{resultat.statut:<12}{ligne['construction_ms']:>11.1f} ms"
+                  f"{ligne['resolution_ms']:>11.1f} ms{memoire:>8.1f} Mo{objectif:>16}{ecart:>11}",
+                  flush=True)
+
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as fichier:
+            ecrivain = csv.DictWriter(fichier, fieldnames=list(lignes[0]))
+            ecrivain.writeheader()
+            ecrivain.writerows(lignes)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Cache des figures Matplotlib rendues en PNG.
+
+Chaque figure est dessinée et encodée une seule fois par clé (problème,
+style) ; les mêmes octets servent à l'affichage (st.image) et au bouton
+de téléchargement, et la figure est fermée aussitôt après le rendu.
+"""
+
+import io
+
+import matplotlib.pyplot as plt
+import streamlit as st
+
+from cache_lru import CacheLRU
+
+CAPACITE = 64
+
+
+@st.cache_resource
+def cache_figures(capacite=CAPACITE):
+    """Instance unique du cache PNG pour tout le processus Streamlit."""
+    return CacheLRU(capacite)
+
+
+def figure_png(cle, dessiner, cache=None, **options):
+    """Renvoie le PNG de la figure `dessiner()`, rendue seulement en cas d'absence.
+
+    `cle` doit décrire tout ce qui change l'image ; `options` sont passées
+    à savefig.
+    """
+    cache = cache if cache is not None else cache_figures()
+    png = cache.obtenir(cle)
+    if png is None:
+        fig = dessiner()
+        tampon = io.BytesIO()
+        try:
+            fig.savefig(tampon, format="png", **options)
+        finally:
+            plt.close(fig)
+        png = tampon.getvalue()
+        cache.ajouter(cle, png)
+    return png
+
+
+def afficher_figure(cle, dessiner, nom_fichier, libelle="📸 Télécharger le graphique",
+                    cache=None, **options):
+    """Affiche la figure et propose son téléchargement à partir du même PNG."""
+    png = figure_png(cle, dessiner, cache, **options)
+    st.image(png)
+    st.download_button(libelle, data=png, file_name=nom_fichier, mime="image/png")
+    return png
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+Dictionnaire LRU borné et sûr entre threads.
+
+Sans autre dépendance que la bibliothèque standard : les caches de
+résolutions (lp_cache), de figures (cache_figures) et de polyèdres
+(lp_polyedre) l'utilisent sans charger le reste de la chaîne LP.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class CacheLRU:
+    """Dictionnaire LRU borné, protégé par un verrou (une session = un thread)."""
+
+    def __init__(self, capacite):
+        self.capacite = capacite
+        self.hits = 0
+        self.misses = 0
+        self._entrees = OrderedDict()
+        self._verrou = threading.Lock()
+
+    def __len__(self):
+        return len(self._entrees)
+
+    def obtenir(self, cle):
+        with self._verrou:
+            if cle in self._entrees:
+                self._entrees.move_to_end(cle)
+                self.hits += 1
+                return self._entrees[cle]
+            self.misses += 1
+            return None
+
+    def ajouter(self, cle, valeur):
+        with self._verrou:
+            self._entrees[cle] = valeur
+            self._entrees.move_to_end(cle)
+            while len(self._entrees) > self.capacite:
+                self._entrees.popitem(last=False)
+
+    def vider(self):
+        with self._verrou:
+            self._entrees.clear()
+            self.hits = self.misses = 0
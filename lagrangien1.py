@@ -8,8 +8,12 @@ Created on Thu Oct  9 20:26:14 2025
 import sympy as sp
 import streamlit as st
 import matplotlib.pyplot as plt
-import numpy as np
-from pulp import LpMaximize, LpMinimize, LpProblem, LpVariable, LpStatus
+from lp_core import (analyse_contrainte, analyse_objectif,
+                     construire_modele)
+from lp_cache import resoudre_en_cache, afficher_statistiques
+from lp_historique import afficher_historique
+from lp_graphique import tracer_zone_realisable
+from lp_solveurs import SOLVEURS_2D, choisir_solveur
 import re
 
 # ==============================
@@ -24,75 +28,21 @@ def corriger_saisie(expr: str) -> str:
     return expr
 
 
-# ==============================
-# Fonction de parsing linéaire
-# ==============================
-def analyse_syntaxique(expression):
-    expression = expression.replace(" ", "")
-    termes = re.findall(r'([+-]?[\d.]*[a-zA-Z]+)', expression)
-    analysee = []
-    
-    for terme in termes:
-        signe = 1
-        if terme.startswith('-'):
-            signe = -1
-            terme = terme[1:]
-        elif terme.startswith('+'):
-            terme = terme[1:]
-        
-        partie_coef = re.match(r'^[\d.]+', terme)
-        partie_variable = terme[len(partie_coef.group()):] if partie_coef else terme
-        
-        coeff = float(partie_coef.group()) if partie_coef else 1.0
-        coeff *= signe
-        
-        if partie_variable:
-            analysee.append((coeff, partie_variable))
-    
-    return analysee
-
-
 # ==============================
 # Affichage graphique
 # ==============================
-def affichage_graphique(contraintes, solution_x, solution_y, variables):
+def affichage_graphique(modele, contraintes, solution_x, solution_y):
     fig, ax = plt.subplots(figsize=(10, 8))
-    x_max = max(solution_x * 2, 50) if solution_x > 0 else 50
-    x_vals = np.linspace(0, x_max, 400)
-    colors = ['blue', 'green', 'red', 'orange', 'purple']
+    variables = modele.variables
+    libelles = [f'{lhs} {op} {rhs}' for lhs, op, rhs in contraintes]
+    tracer_zone_realisable(ax, modele, libelles, (solution_x, solution_y))
     
-    for i, (lhs, op, rhs) in enumerate(contraintes):
-        if i < len(colors):
-            termes = analyse_syntaxique(lhs)
-            if len(termes) == 2:
-                a, var1 = termes[0]
-                b, var2 = termes[1]
-                if b != 0:
-                    y_vals = (rhs - a * x_vals) / b
-                    label = f'{lhs} {op} {rhs}'
-                    ax.plot(x_vals, y_vals, label=label, linewidth=2, color=colors[i])
-                    if op == '>=':
-                        ax.fill_between(x_vals, y_vals, y_vals + 100, alpha=0.2, color=colors[i])
-                    elif op == '<=':
-                        ax.fill_between(x_vals, y_vals, 0, alpha=0.2, color=colors[i])
-    
-    if solution_x is not None and solution_y is not None:
-        ax.plot(solution_x, solution_y, 'ro', markersize=10, 
-                label=f'Solution ({solution_x:.2f}, {solution_y:.2f})')
-    
-    ax.set_xlabel(variables[0] if variables else 'x')
-    ax.set_ylabel(variables[1] if len(variables) > 1 else 'y')
+    ax.set_xlabel(variables[0])
+    ax.set_ylabel(variables[1])
     ax.set_title('Représentation Graphique de la Solution')
     ax.legend()
     ax.grid(True, alpha=0.3)
     
-    if solution_x is not None and solution_y is not None:
-        ax.set_xlim(0, max(solution_x * 1.5, 10))
-        ax.set_ylim(0, max(solution_y * 1.5, 10))
-    else:
-        ax.set_xlim(0, 50)
-        ax.set_ylim(0, 50)
-    
     return fig
 
 
@@ -102,6 +52,11 @@ def affichage_graphique(contraintes, solution_x, solution_y, variables):
 st.set_page_config(page_title="Optimisation linéaire", page_icon="🔢", layout="centered")
 
 # 🎨 Dégradé dynamique
+zone_cache = st.sidebar.empty()
+afficher_statistiques(zone_cache)
+solveur = choisir_solveur(SOLVEURS_2D)
+afficher_historique()
+
 st.sidebar.header("🎨 Fond dégradé")
 gradient_type = st.sidebar.selectbox("Type de dégradé", ["linear-gradient", "radial-gradient"])
 angle = st.sidebar.slider("Angle (°)", 0, 360, 135)
@@ -143,11 +98,9 @@ contraintes = []
 for i in range(n_contraintes):
     contrainte = st.text_input(f"Contrainte {i+1} (ex: 2x + 3y <= 12)")
     if contrainte:
-        for op in ['<=', '>=', '==', '=']:
-            if op in contrainte:
-                lhs, rhs = contrainte.split(op, 1)
-                contraintes.append((lhs.strip(), op.strip(), float(rhs.strip())))
-                break
+        analysee = analyse_contrainte(contrainte)
+        if analysee:
+            contraintes.append(analysee)
 
 afficher_graphique = st.checkbox("Afficher le graphique")
 
@@ -158,54 +111,41 @@ if st.button("Résoudre"):
     if not objectif:
         st.error("Veuillez entrer une fonction économique valide.")
     else:
-        if objectif.lower().startswith("max"):
-            modele_type = LpMaximize
-            expression = objectif[3:].strip()
-        elif objectif.lower().startswith("min"):
-            modele_type = LpMinimize
-            expression = objectif[3:].strip()
-        else:
-            st.error("La fonction doit commencer par 'max' ou 'min'.")
+        try:
+            sens, expression = analyse_objectif(objectif)
+            modele = construire_modele(sens, expression, contraintes)
+        except ValueError as e:
+            st.error(str(e))
             st.stop()
         
-        probleme = LpProblem("Probleme_Lineaire", modele_type)
-        termes_objectif = analyse_syntaxique(expression)
-        
-        variables = set()
-        for coeff, var in termes_objectif:
-            variables.add(var)
-        for lhs, _, _ in contraintes:
-            for coeff, var in analyse_syntaxique(lhs):
-                variables.add(var)
-        variables = sorted(variables)
+        variables = modele.variables
         
         if len(variables) != 2:
             st.error("⚠️ Cette application ne gère que 2 variables (x et y).")
             st.stop()
         
-        lp_vars = LpVariable.dicts("Var", variables, lowBound=0)
-        probleme += sum(coeff * lp_vars[var] for coeff, var in termes_objectif)
-        
-        for lhs, op, rhs in contraintes:
-            expression = sum(coeff * lp_vars[var] for coeff, var in analyse_syntaxique(lhs))
-            if op == '<=':
-                probleme += expression <= rhs
-            elif op == '>=':
-                probleme += expression >= rhs
-            else:
-                probleme += expression == rhs
-        
-        probleme.solve()
+        resultat = resoudre_en_cache(modele, solveur)
+        afficher_statistiques(zone_cache)
         
         st.subheader("Résultats de l'optimisation")
-        st.write("**Statut :**", LpStatus[probleme.status])
-        
-        solution = {var: lp_vars[var].varValue for var in variables}
+        st.write("**Statut :**", resultat.statut)
+
+        if resultat.statut == "Infeasible":
+            st.warning("Aucune solution réalisable : les contraintes sont incompatibles.")
+            st.stop()
+        if resultat.statut == "Unbounded":
+            st.warning("Problème non borné : la fonction économique n'a pas d'optimum fini.")
+            st.stop()
+        if resultat.objectif is None:
+            st.warning("Pas de solution optimale pour ce problème.")
+            st.stop()
+
+        solution = resultat.valeurs
         var1, var2 = variables
         x_val, y_val = solution[var1], solution[var2]
         
         st.write(f"**Solution optimale :** ({var1}, {var2}) = ({x_val:.2f}, {y_val:.2f})")
-        st.write(f"**Valeur optimale :** z = {probleme.objective.value():.2f}")
+        st.write(f"**Valeur optimale :** z = {resultat.objectif:.2f}")
         
         # --- Affichage des contraintes corrigées ---
         st.write("**Fonction économique :**")
@@ -217,5 +157,5 @@ if st.button("Résoudre"):
             st.latex(f"{i}.\\; {lhs} {op} {rhs}")
 
         if afficher_graphique:
-            fig = affichage_graphique(contraintes, x_val, y_val, variables)
+            fig = affichage_graphique(modele, contraintes, x_val, y_val)
             st.pyplot(fig)
@@ -5,36 +5,33 @@ Created on Sat Oct  4 14:23:52 2025
 @author: mokrane
 """
 
+import io
+import os
+import time
+from functools import partial
 import streamlit as st
-from pulp import LpMaximize, LpMinimize, LpProblem, LpVariable, LpStatus
-import re
+import numpy as np
 import pandas as pd
-
-
-# --- Fonction d’analyse d’une expression linéaire ---
-def parse_expression(expr):
-    """Parse une expression linéaire en liste de (coefficient, variable)."""
-    expr = expr.replace(" ", "")
-    terms = re.findall(r'([+-]?[\d.]*[a-zA-Z]+)', expr)
-    parsed = []
-
-    for term in terms:
-        sign = 1
-        if term.startswith('-'):
-            sign = -1
-            term = term[1:]
-        elif term.startswith('+'):
-            term = term[1:]
-
-        coeff_part = re.match(r'^[\d.]+', term)
-        var_part = term[len(coeff_part.group()):] if coeff_part else term
-
-        coeff = float(coeff_part.group()) if coeff_part else 1.0
-        coeff *= sign
-
-        if var_part:
-            parsed.append((coeff, var_part))
-    return parsed
+from lp_core import (analyse_syntaxique, analyse_contrainte, analyse_declaration,
+                     construire_modele, declarer_entieres, resoudre)
+from lp_cache import resoudre_en_cache, afficher_statistiques, cle_canonique
+from lp_historique import afficher_historique
+from lp_balayage import balayer, nom_parametre
+from lp_pareto import METHODES, front_pareto, lire_objectifs, non_domines
+from lp_sensibilite import afficher_sensibilite
+from lp_solveurs import SOLVEURS_MIP, choisir_solveur
+from lp_iis import afficher_iis, trouver_iis
+from lp_presolve import resoudre_avec_presolve, afficher_presolve
+from lp_tache import ResolutionArrierePlan, suivi_streamlit
+from lp_saisie import (lire_fichier, matrice_couts, modele_depuis_tableau, tableau_decoupe,
+                       tableau_scenarios, tableau_transport, tableau_vers_csv)
+from lp_stochastique import analyser_scenarios, evpi, vss
+from lp_decoupe import MAITRES, generation_colonnes, maitre_highs
+from lp_transport import (modele_affectation, modele_transport, resoudre_affectation,
+                          resoudre_transport)
+from lp_formats import lire_modele, exporter, ecrire_mps, ecrire_lp
+from lp_polyedre import polyedre_en_cache, tracer_polyedre
+from cache_figures import afficher_figure
 
 
 # --- Application principale Streamlit ---
@@ -97,6 +94,19 @@ def main():
     """, unsafe_allow_html=True)
 
     # --- 🎨 Fond dégradé ---
+    zone_cache = st.sidebar.empty()
+    afficher_statistiques(zone_cache)
+    solveur = choisir_solveur()
+    afficher_historique()
+    avec_presolve = st.sidebar.checkbox("Présolve (réduction du modèle)", value=True)
+    mesurer_gain = avec_presolve and st.sidebar.checkbox("Mesurer le temps gagné par le présolve")
+    limite_temps = st.sidebar.number_input("Limite de temps (s)", min_value=1, value=60, step=5)
+    coeurs = os.cpu_count() or 1
+    threads = st.sidebar.number_input("Threads (nombres entiers)", min_value=1, max_value=coeurs,
+                                      value=coeurs)
+    ecart_mip = st.sidebar.number_input("Écart MIP toléré (%)", min_value=0.0, max_value=100.0,
+                                        value=0.0, step=0.5) / 100
+
     st.sidebar.header("🎨 Fond dégradé de la page")
     gradient_type = st.sidebar.selectbox("Type de dégradé", ["linear-gradient", "radial-gradient"])
     angle = st.sidebar.slider("Angle (degrés)", 0, 360, 135)
@@ -132,79 +142,599 @@ def main():
     """
     st.markdown(page_bg, unsafe_allow_html=True)
 
+    # === Problèmes à structure particulière : méthodes dédiées ===
+    type_modele = st.radio("Type de modèle :",
+                           ["Programme linéaire", "Transport", "Affectation", "Découpe"],
+                           horizontal=True)
+    if type_modele == "Découpe":
+        probleme_decoupe(solveur, limite_temps)
+        return
+    if type_modele != "Programme linéaire":
+        probleme_reseau(type_modele == "Affectation", solveur, limite_temps)
+        return
+
     # === Paramètres du problème linéaire ===
     modele_type_str = st.radio("Type de problème :", ["Maximisation", "Minimisation"])
-    modele_type = LpMaximize if modele_type_str == "Maximisation" else LpMinimize
+    sens = "max" if modele_type_str == "Maximisation" else "min"
 
     expr_objectif = st.text_input("Entrez la fonction économique (ex: 3x + 5y + 2z) :", "3x + 5y + 2z")
 
-    n_contraintes = st.number_input("Nombre de contraintes :", min_value=1, max_value=10, step=1, value=4)
-
-    contraintes = []
-    for i in range(int(n_contraintes)):
-        contraintes.append(st.text_input(f"Contrainte {i+1} (ex: 2x + 3y + z <= 12) :", key=f"c{i}"))
+    # === Saisie des contraintes ===
+    mode_saisie = st.radio("Saisie des contraintes :",
+                           ["Texte", "Grille", "Fichier CSV/XLSX", "Fichier MPS/LP"],
+                           horizontal=True)
+    libelles = None
+    try:
+        if mode_saisie == "Texte":
+            n_contraintes = st.number_input("Nombre de contraintes :", min_value=1, step=1, value=4)
+
+            contraintes = []
+            for i in range(int(n_contraintes)):
+                contraintes.append(st.text_input(f"Contrainte {i+1} (ex: 2x + 3y + z <= 12) :", key=f"c{i}"))
+
+            # Analyse des contraintes
+            contraintes_parsed = []
+            for c in contraintes:
+                if not c.strip():
+                    continue
+                analysee = analyse_contrainte(c)
+                if analysee:
+                    contraintes_parsed.append(analysee)
+            libelles = [f"{lhs} {op} {rhs}" for lhs, op, rhs in contraintes_parsed]
+            modele = modele_depuis_contraintes(sens, expr_objectif, tuple(contraintes_parsed))
+        elif mode_saisie == "Grille":
+            modele = saisie_grille(sens, expr_objectif)
+        elif mode_saisie == "Fichier CSV/XLSX":
+            modele = saisie_fichier(sens, expr_objectif)
+        else:
+            modele = saisie_mps_lp()
+
+        # Variables entières : champ dédié, et lignes « int x » / « bin y » en mode texte
+        texte_entieres = st.text_input("Variables entières (ex : int x, y ; bin z) :", "")
+        declarations = [analyse_declaration(partie) for partie in texte_entieres.split(";")]
+        if mode_saisie == "Texte":
+            declarations += [analyse_declaration(c) for c in contraintes]
+        entieres = [var for d in declarations if d and d[0] == "int" for var in d[1]]
+        binaires = [var for d in declarations if d and d[0] == "bin" for var in d[1]]
+        if modele is not None and (entieres or binaires):
+            modele = declarer_entieres(modele, entieres, binaires)
+    except (ValueError, KeyError) as e:
+        st.error(f"Contraintes illisibles : {e}")
+        return
 
     # === Résolution du problème ===
+    if st.session_state.pop("resolution_interrompue", False):
+        st.warning("⏹️ Résolution annulée.")
+
     if st.button("Résoudre"):
-        if not expr_objectif.strip():
+        if not expr_objectif.strip() and mode_saisie != "Fichier MPS/LP":
             st.error("Veuillez entrer la fonction économique.")
             return
+        if modele is None:
+            st.error("Veuillez charger un fichier de contraintes.")
+            return
+        if modele.mip and solveur not in SOLVEURS_MIP:
+            st.error("Ce solveur ne traite pas les variables entières : choisissez CBC ou HiGHS.")
+            return
 
-        # Création du problème
-        probleme = LpProblem("Probleme_Lineaire", modele_type)
-        termes_objectif = parse_expression(expr_objectif)
-
-        # Analyse des contraintes
-        contraintes_parsed = []
-        for c in contraintes:
-            if not c.strip():
-                continue
-            for op in ['<=', '>=', '==', '=']:
-                if op in c:
-                    lhs, rhs = c.split(op, 1)
-                    contraintes_parsed.append((lhs.strip(), op.strip(), float(rhs.strip())))
-                    break
-
-        # Collecte des variables
-        variables = set(var for _, var in termes_objectif)
-        for lhs, _, _ in contraintes_parsed:
-            for _, var in parse_expression(lhs):
-                variables.add(var)
-
-        # Création des variables PuLP
-        lp_vars = LpVariable.dicts("", variables, lowBound=0)
-
-        # Ajout de la fonction objectif
-        probleme += sum(coeff * lp_vars[var] for coeff, var in termes_objectif)
-
-        # Ajout des contraintes
-        for lhs, op, rhs in contraintes_parsed:
-            expr = sum(coeff * lp_vars[var] for coeff, var in parse_expression(lhs))
-            if op == '<=':
-                probleme += expr <= rhs
-            elif op == '>=':
-                probleme += expr >= rhs
+        # Résolution en arrière-plan (le cache porte sur le modèle réduit).
+        # Cliquer sur « Annuler » relance le script, ce qui arrête le processus.
+        zone_annuler, zone_suivi = st.empty(), st.empty()
+        zone_annuler.button("⏹️ Annuler la résolution")
+        options = dict(threads=int(threads), ecart_mip=ecart_mip) if modele.mip else {}
+        tache = ResolutionArrierePlan(solveur, limite_temps, suivi_streamlit(zone_suivi, limite_temps),
+                                      journal=modele.mip and solveur is resoudre, **options)
+        # L'indicateur ne reste levé que si « Annuler » arrête le script (exception de
+        # contrôle Streamlit, hors Exception) ; une erreur du solveur le baisse aussi
+        st.session_state["resolution_interrompue"] = True
+        erreur = None
+        try:
+            if avec_presolve:
+                resultat, reduction = resoudre_avec_presolve(modele, partial(resoudre_en_cache,
+                                                                             solveur=tache))
             else:
-                probleme += expr == rhs
-
-        # Résolution
-        probleme.solve()
+                resultat = resoudre_en_cache(modele, tache)
+        except Exception as e:
+            erreur = e
+        st.session_state["resolution_interrompue"] = False
+        zone_annuler.empty()
+        zone_suivi.empty()
+        if erreur is not None:
+            st.error(f"Échec de la résolution : {erreur}")
+            return
+        afficher_statistiques(zone_cache)
 
         # --- Résultats ---
         st.subheader("📊 Résultats du problème linéaire")
-        st.write(f"**Statut :** {LpStatus[probleme.status]}")
+        st.write(f"**Statut :** {resultat.statut}")
+        st.caption(f"⏱️ {resultat.methode} : construction {resultat.construction * 1000:.2f} ms"
+                   f" • résolution {resultat.temps * 1000:.2f} ms")
+        if modele.mip and resultat.objectif is not None:
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Meilleure solution", f"{resultat.objectif:.6g}")
+            col2.metric("Borne", "-" if resultat.borne is None else f"{resultat.borne:.6g}")
+            col3.metric("Écart", "-" if resultat.ecart is None else f"{resultat.ecart:.2%}")
+        if avec_presolve:
+            gain = None
+            if mesurer_gain:
+                direct = tache(modele)
+                gain = (direct.construction + direct.temps) - \
+                       (reduction.temps + resultat.construction + resultat.temps)
+            afficher_presolve(reduction, gain)
+        incomplet = resultat.statut == "Not Solved" and resultat.objectif is not None
+        if resultat.statut != "Optimal" and not incomplet:
+            st.warning("Pas de solution optimale pour ce problème.")
+            if resultat.statut == "Infeasible":
+                afficher_iis(trouver_iis(modele), libelles)
+            return
+        if incomplet:
+            st.warning("⏱️ Limite de temps atteinte : meilleure solution trouvée, "
+                       "sans preuve d'optimalité.")
 
         # Tableau des valeurs optimales
-        resultats = {var_name: v.varValue for var_name, v in lp_vars.items()}
+        resultats = resultat.valeurs
         df_resultats = pd.DataFrame({
             "Variable": list(resultats.keys()),
             "Valeur": list(resultats.values())
         })
 
         st.table(df_resultats)
+        # Sommet optimal repris par la vue 3D tant que le problème ne change pas
+        st.session_state["polyedre_solution"] = (
+            cle_canonique(modele), tuple(resultats[var] for var in modele.variables))
 
         # Valeur optimale
-        st.success(f"**Valeur optimale = {probleme.objective.value():.3f}**")
+        if incomplet:
+            st.info(f"**Meilleure valeur trouvée = {resultat.objectif:.3f}**")
+        else:
+            st.success(f"**Valeur optimale = {resultat.objectif:.3f}**")
+
+        # Prix ombre, coûts réduits et intervalles de validité
+        afficher_sensibilite(modele, resultat, libelles)
+
+    # === Polyèdre réalisable (3 variables) ===
+    if modele is not None and modele.n_variables == 3 and not modele.mip:
+        vue_polyedre(modele, libelles)
+
+    # === Export du modèle ===
+    if modele is not None and st.checkbox("📤 Exporter le modèle (MPS / LP)"):
+        col1, col2 = st.columns(2)
+        col1.download_button("Télécharger .mps", exporter(modele, ecrire_mps),
+                             file_name="modele.mps", mime="text/plain")
+        col2.download_button("Télécharger .lp", exporter(modele, ecrire_lp),
+                             file_name="modele.lp", mime="text/plain")
+
+    # === Balayage paramétrique ===
+    if modele is not None and modele.n_variables:
+        balayage_parametrique(modele, solveur)
+
+    # === Plusieurs fonctions économiques ===
+    if modele is not None and modele.n_variables and not modele.mip:
+        front_multiobjectif(modele, solveur)
+
+    # === Incertitude sur les seconds membres ===
+    if modele is not None and modele.n_variables and modele.n_contraintes:
+        programme_stochastique(modele, libelles, solveur)
+
+
+# --- Construction du modèle (mise en cache : ré-analyse seulement si la saisie change) ---
+@st.cache_data(max_entries=64, show_spinner=False)
+def modele_depuis_contraintes(sens, expr_objectif, contraintes):
+    return construire_modele(sens, expr_objectif, list(contraintes))
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def modele_depuis_fichier(sens, expr_objectif, contenu, nom):
+    return modele_depuis_tableau(sens, expr_objectif, lire_fichier(io.BytesIO(contenu), nom))
+
+
+def saisie_grille(sens, expr_objectif):
+    """Grille matricielle : une colonne par variable, puis « op » et « b »."""
+    variables = sorted({var for _, var in analyse_syntaxique(expr_objectif)})
+    vide = pd.DataFrame({**{var: pd.Series(dtype=float) for var in variables},
+                         "op": pd.Series(dtype=str), "b": pd.Series(dtype=float)})
+    grille = st.data_editor(
+        vide, num_rows="dynamic", key="grille_" + "_".join(variables),
+        column_config={"op": st.column_config.SelectboxColumn("op", options=["<=", ">=", "="])},
+    )
+    st.download_button("📥 Télécharger la grille (CSV)", tableau_vers_csv(grille),
+                       file_name="contraintes.csv", mime="text/csv")
+    return modele_depuis_tableau(sens, expr_objectif, grille.dropna(subset=["b"]))
+
+
+def saisie_fichier(sens, expr_objectif):
+    """Téléversement CSV/XLSX, même disposition que la grille ou colonne « contrainte »."""
+    fichier = st.file_uploader("Fichier de contraintes (variables + op + b, ou colonne « contrainte ») :",
+                               type=["csv", "xlsx"])
+    if fichier is None:
+        return None
+    modele = modele_depuis_fichier(sens, expr_objectif, fichier.getvalue(), fichier.name)
+    st.caption(f"{modele.n_contraintes} contraintes • {modele.n_variables} variables chargées")
+    return modele
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def modele_depuis_mps_lp(contenu, nom):
+    # Lecture en flux : le contenu n'est jamais décodé d'un bloc
+    with io.TextIOWrapper(io.BytesIO(contenu), encoding="utf-8", errors="replace") as flux:
+        return lire_modele(flux, nom)
+
+
+def saisie_mps_lp():
+    """Import d'un modèle complet (objectif compris) au format MPS ou CPLEX-LP."""
+    fichier = st.file_uploader("Modèle MPS ou LP :", type=["mps", "lp"])
+    if fichier is None:
+        return None
+    modele, avertissements = modele_depuis_mps_lp(fichier.getvalue(), fichier.name)
+    for message in avertissements:
+        st.warning(message)
+    st.caption(f"Modèle importé ({'maximisation' if modele.sens == 'max' else 'minimisation'}) : "
+               f"{modele.n_contraintes} contraintes • {modele.n_variables} variables. "
+               "La fonction économique et le type de problème viennent du fichier.")
+    return modele
+
+
+# Un fragment ne réexécute que lui-même quand on tourne la vue
+_fragment = getattr(st, "fragment", lambda fonction: fonction)
+
+
+@_fragment
+def vue_polyedre(modele, libelles=None):
+    """Vue 3D du polyèdre réalisable et du sommet optimal, orientable par curseurs."""
+    if not st.checkbox("🧊 Afficher le polyèdre réalisable (3D)"):
+        return
+    debut = time.perf_counter()
+    polyedre = polyedre_en_cache(modele)
+    duree = (time.perf_counter() - debut) * 1000
+    if not len(polyedre.faces):
+        st.warning("Zone réalisable vide : rien à représenter.")
+        return
+
+    cle = cle_canonique(modele)
+    memorisee = st.session_state.get("polyedre_solution")
+    solution = memorisee[1] if memorisee and memorisee[0] == cle else None
+    libelles = libelles or [f"C{i + 1}" for i in range(modele.n_contraintes)]
+    col1, col2 = st.columns(2)
+    elevation = col1.slider("Élévation (°)", -90, 90, 25, step=5)
+    azimut = col2.slider("Azimut (°)", -180, 180, -60, step=5)
+    afficher_figure(("lineaire3", cle, tuple(libelles), solution, elevation, azimut),
+                    lambda: tracer_polyedre(polyedre, modele.variables, libelles, solution,
+                                            elevation, azimut),
+                    "polyedre.png", bbox_inches="tight")
+    st.caption(f"{len(polyedre.sommets)} sommets • {len(polyedre.faces)} faces • "
+               f"polyèdre obtenu en {duree:.1f} ms"
+               + ("" if polyedre.borne else " • zone non bornée, tronquée par la boîte grise"))
+
+
+def balayage_parametrique(modele, solveur):
+    """Résout le modèle pour une plage de valeurs d'un second membre ou d'un coût."""
+    st.subheader("🔁 Balayage paramétrique")
+    parametres = [("b", i) for i in range(modele.n_contraintes)] + \
+                 [("c", j) for j in range(modele.n_variables)]
+    if not parametres:
+        return
+
+    parametre = st.selectbox("Paramètre à faire varier :", parametres,
+                             format_func=lambda p: nom_parametre(modele, p))
+    genre, k = parametre
+    actuelle = float(modele.b[k] if genre == "b" else modele.c[k])
+    col1, col2, col3 = st.columns(3)
+    debut = col1.number_input("De :", value=0.0)
+    fin = col2.number_input("À :", value=max(2 * actuelle, 1.0))
+    n_points = col3.number_input("Nombre de valeurs :", min_value=2, max_value=1000, value=50)
+
+    if st.button("Lancer le balayage"):
+        if modele.mip and solveur not in SOLVEURS_MIP:
+            st.error("Ce solveur ne traite pas les variables entières : choisissez CBC ou HiGHS.")
+            return
+        nom = nom_parametre(modele, parametre)
+        grille = {parametre: np.linspace(debut, fin, int(n_points))}
+        progression = st.progress(0.0)
+        zone_graphique = st.empty()
+        zone_tableau = st.empty()
+
+        lignes = []
+        for n, (_, valeurs, resultat) in enumerate(balayer(modele, grille, solveur=solveur), 1):
+            lignes.append({nom: valeurs[parametre], "Statut": resultat.statut,
+                           "Valeur optimale": resultat.objectif, **resultat.valeurs})
+            df = pd.DataFrame(lignes).sort_values(nom)
+            progression.progress(n / int(n_points))
+            zone_graphique.line_chart(df[df["Statut"] == "Optimal"], x=nom, y="Valeur optimale")
+            zone_tableau.dataframe(df, hide_index=True)
+
+
+def front_multiobjectif(modele, solveur):
+    """Front de Pareto entre la fonction économique et des fonctions supplémentaires."""
+    st.subheader("🎯 Optimisation multi-objectif")
+    texte = st.text_area("Autres fonctions économiques, une par ligne (ex : min x + y) :", "")
+    col1, col2 = st.columns(2)
+    methode = col1.radio("Méthode :", METHODES, horizontal=True)
+    n_points = col2.number_input("Nombre de points :", min_value=2, max_value=2000, value=50)
+
+    if st.button("Tracer le front de Pareto"):
+        try:
+            objectifs = lire_objectifs(modele, texte.splitlines())
+        except ValueError as e:
+            st.error(str(e))
+            return
+        if len(objectifs) < 2:
+            st.error("Ajoutez au moins une autre fonction économique.")
+            return
+        noms = [f"f{i + 1} ({sens})" for i, (sens, _) in enumerate(objectifs)]
+        signes = np.array([1.0 if sens == "max" else -1.0 for sens, _ in objectifs])
+
+        try:
+            points = front_pareto(modele, objectifs, methode, int(n_points), solveur=solveur)
+            total = next(points)
+        except ValueError as e:
+            st.error(str(e))
+            return
+        progression = st.progress(0.0)
+        zone_graphique = st.empty()
+        lignes, echecs = [], 0
+        for n, point in enumerate(points, 1):
+            if point.objectifs is None:
+                echecs += 1
+            else:
+                lignes.append({**dict(zip(noms, point.objectifs)), **point.valeurs})
+                # Front affiché au fur et à mesure (deux premières fonctions)
+                zone_graphique.scatter_chart(pd.DataFrame(lignes), x=noms[0], y=noms[1])
+            progression.progress(n / total)
+
+        df = pd.DataFrame(lignes)
+        if df.empty:
+            st.warning("Aucun point réalisable.")
+            return
+        df["Pareto"] = non_domines(df[noms].to_numpy() * signes)
+        df = df[df["Pareto"]].drop(columns="Pareto").drop_duplicates(subset=noms).sort_values(noms[0])
+        # Deux fonctions : le front d'un PL est la ligne brisée joignant ces points
+        if len(noms) == 2:
+            zone_graphique.line_chart(df, x=noms[0], y=noms[1])
+        else:
+            zone_graphique.scatter_chart(df, x=noms[0], y=noms[1])
+        st.caption(f"{len(df)} points non dominés sur {total} résolutions"
+                   + (f" • {echecs} sans solution" if echecs else ""))
+        st.dataframe(df.round(6), hide_index=True)
+
+
+def _scenarios_par_defaut(modele, colonnes):
+    """Trois scénarios (bas, moyen, haut : b × 0,8 / 1 / 1,2) à compléter par l'utilisateur."""
+    lignes = []
+    for nom, probabilite, facteur in [("bas", 0.25, 0.8), ("moyen", 0.5, 1.0), ("haut", 0.25, 1.2)]:
+        lignes.append({"scénario": nom, "probabilité": probabilite,
+                       **{col: float(facteur * b) for col, b in zip(colonnes, modele.b)}})
+    return pd.DataFrame(lignes)
+
+
+def programme_stochastique(modele, libelles, solveur):
+    """Seconds membres aléatoires : équivalent déterministe, ou scénarios résolus un à un."""
+    st.subheader("🎲 Scénarios sur les seconds membres")
+    colonnes = [f"C{i + 1}" for i in range(len(libelles) if libelles else modele.n_contraintes)]
+    if libelles:
+        st.caption(" • ".join(f"{col} : {libelle}" for col, libelle in zip(colonnes, libelles)))
+    # La clé suit le problème : le tableau repart des seconds membres du modèle s'il change
+    suffixe = cle_canonique(modele)[:8]
+    df = st.data_editor(_scenarios_par_defaut(modele, colonnes), num_rows="dynamic",
+                        key=f"scenarios_{suffixe}")
+    premier_niveau = st.multiselect("Variables de premier niveau (décidées avant l'aléa) :",
+                                    modele.variables, default=modele.variables,
+                                    key=f"premier_niveau_{suffixe}")
+    methode = st.radio("Méthode :", ["Équivalent déterministe", "Scénarios indépendants"],
+                       horizontal=True, key="methode_scenarios")
+
+    if not st.button("Analyser les scénarios"):
+        return
+    try:
+        noms, probabilites, seconds_membres = tableau_scenarios(df, modele.b, colonnes)
+        debut = time.perf_counter()
+        analyse = analyser_scenarios(modele, premier_niveau, seconds_membres, probabilites, solveur,
+                                     deterministe=methode == "Équivalent déterministe")
+        duree = time.perf_counter() - debut
+    except ValueError as e:
+        st.error(str(e))
+        return
+
+    def valeur(z):
+        if z is None:
+            return "-"
+        return "∞" if np.isinf(z) else ("sans optimum" if np.isnan(z) else f"{z:.6g}")
+
+    ws = analyse.esperance(analyse.ws)
+    if analyse.rp is None:
+        optimaux = sorted(r.objectif for r in analyse.ws if r.statut == "Optimal")
+        pire, meilleur = (optimaux[0], optimaux[-1]) if optimaux else (None, None)
+        if modele.sens == "min":
+            pire, meilleur = meilleur, pire
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Valeur espérée (WS)", valeur(ws))
+        col2.metric("Pire scénario", valeur(pire))
+        col3.metric("Meilleur scénario", valeur(meilleur))
+    else:
+        if analyse.rp.statut != "Optimal":
+            st.warning(f"Équivalent déterministe : {analyse.rp.statut}. Aucune décision de premier "
+                       "niveau ne convient à tous les scénarios.")
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Solution stochastique (RP)", valeur(analyse.rp.objectif))
+        col2.metric("Décision moyenne (EEV)", valeur(analyse.esperance(analyse.eev)))
+        col3.metric("VSS", valeur(vss(analyse, modele.sens)))
+        col4.metric("EVPI", valeur(evpi(analyse, modele.sens)))
+        decisions = {"Stochastique (RP)": analyse.rp, "Valeur moyenne (EV)": analyse.ev}
+        st.write("**Décisions de premier niveau :**")
+        st.dataframe(pd.DataFrame({nom: {var: r.valeurs.get(var) for var in premier_niveau}
+                                   for nom, r in decisions.items() if r.statut == "Optimal"}))
+
+    par_scenario = pd.DataFrame({
+        "Scénario": noms, "Probabilité": analyse.probabilites.round(4),
+        "Statut": [r.statut for r in analyse.ws],
+        "Optimum du scénario (WS)": [r.objectif for r in analyse.ws],
+    })
+    if analyse.valeurs_rp is not None:
+        par_scenario["Avec la décision RP"] = analyse.valeurs_rp
+    if analyse.eev is not None:
+        par_scenario["Avec la décision EV"] = [r.objectif if r.statut == "Optimal" else None
+                                               for r in analyse.eev]
+    valeurs = pd.DataFrame([r.valeurs for r in analyse.ws]).add_prefix("WS ")
+    st.write("**Résultats par scénario :**")
+    st.dataframe(pd.concat([par_scenario, valeurs], axis=1).round(6), hide_index=True)
+    resolutions = sum(len(r) for r in (analyse.ws, analyse.eev) if r) + \
+        sum(r is not None for r in (analyse.rp, analyse.ev))
+    st.caption(f"⏱️ {resolutions} résolutions en {duree * 1000:.1f} ms • probabilités normalisées à 1")
+
+
+# --- Transport et affectation ---
+EXEMPLE_TRANSPORT = pd.DataFrame({
+    "source": ["S1", "S2", "S3", "demande"],
+    "D1": [8.0, 9.0, 14.0, 45.0], "D2": [6.0, 12.0, 9.0, 20.0],
+    "D3": [10.0, 13.0, 16.0, 30.0], "D4": [9.0, 7.0, 5.0, 30.0],
+    "offre": [35.0, 50.0, 40.0, None],
+})
+EXEMPLE_AFFECTATION = pd.DataFrame({
+    "agent": ["A", "B", "C"], "T1": [9.0, 6.0, 5.0], "T2": [2.0, 4.0, 8.0], "T3": [7.0, 3.0, 1.0],
+})
+
+
+def probleme_reseau(affectation, solveur, limite_temps):
+    """Transport (offres, demandes, coûts) ou affectation (coûts), saisis en grille ou en fichier."""
+    if affectation:
+        st.markdown("**Matrice de coûts** : une ligne par agent, une colonne par tâche.")
+    else:
+        st.markdown("**Tableau de transport** : une ligne par source avec sa colonne « offre », "
+                    "une colonne par destination, et une dernière ligne « demande ».")
+    if st.radio("Saisie :", ["Grille", "Fichier CSV/XLSX"], horizontal=True) == "Grille":
+        df = st.data_editor(EXEMPLE_AFFECTATION if affectation else EXEMPLE_TRANSPORT,
+                            num_rows="dynamic", key="affectation" if affectation else "transport")
+    else:
+        fichier = st.file_uploader("Fichier :", type=["csv", "xlsx"])
+        if fichier is None:
+            return
+        df = lire_fichier(io.BytesIO(fichier.getvalue()), fichier.name)
+    maximiser = affectation and st.checkbox("Maximiser (gains plutôt que coûts)")
+    comparer = st.checkbox("Comparer avec la résolution générique (solveur de la barre latérale)",
+                           value=True)
+
+    if not st.button("Résoudre"):
+        return
+    try:
+        if affectation:
+            lignes, colonnes, couts = matrice_couts(df)
+            plan = resoudre_affectation(couts, maximiser)
+        else:
+            lignes, colonnes, couts, offres, demandes = tableau_transport(df)
+            plan = resoudre_transport(couts, offres, demandes)
+    except ValueError as e:
+        st.error(str(e))
+        return
+
+    st.subheader("📊 Résultats")
+    st.write(f"**Statut :** {plan.statut}")
+    if plan.statut != "Optimal":
+        st.warning("La demande totale dépasse l'offre totale." if plan.statut == "Infeasible"
+                   else "Pas de solution optimale pour ce problème.")
+        return
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Gain total" if maximiser else "Coût total", f"{plan.cout:.6g}")
+    col2.metric(plan.methode, f"{plan.temps * 1000:.2f} ms")
+
+    if comparer:
+        debut = time.perf_counter()
+        modele = modele_affectation(couts, maximiser) if affectation \
+            else modele_transport(couts, offres, demandes)
+        construction = time.perf_counter() - debut
+        resultat = solveur(modele, limite_temps=limite_temps)
+        generique = construction + resultat.construction + resultat.temps
+        col3.metric("Accélération", f"× {generique / max(plan.temps, 1e-9):.1f}")
+        accord = resultat.statut == "Optimal" and \
+            abs(resultat.objectif - plan.cout) <= 1e-6 * (1 + abs(plan.cout))
+        st.caption(f"{'✅' if accord else '⚠️'} {resultat.methode} : {resultat.statut}"
+                   + ("" if resultat.objectif is None else f", valeur {resultat.objectif:.6g}")
+                   + f" en {generique * 1000:.1f} ms (construction du modèle comprise, "
+                   f"{modele.n_variables} variables)")
+
+    flux = pd.DataFrame(plan.flux, index=lignes, columns=colonnes)
+    if affectation:
+        i, j = np.nonzero(plan.flux)
+        st.dataframe(pd.DataFrame({"Agent": np.array(lignes)[i], "Tâche": np.array(colonnes)[j],
+                                   "Gain" if maximiser else "Coût": couts[i, j]}), hide_index=True)
+    else:
+        st.write("**Quantités transportées :**")
+        st.dataframe(flux.round(6))
+    st.download_button("📥 Télécharger la solution (CSV)", flux.to_csv(),
+                       file_name="affectation.csv" if affectation else "transport.csv",
+                       mime="text/csv")
+
+
+# --- Découpe de barres (génération de colonnes) ---
+EXEMPLE_DECOUPE = pd.DataFrame({"longueur": [45, 36, 31, 14], "demande": [97, 610, 395, 211]})
+
+
+def probleme_decoupe(solveur, limite_temps):
+    """Découpe unidimensionnelle : patrons générés à la demande, puis arrondis en nombres entiers."""
+    st.markdown("**Pièces à découper** : une ligne par longueur de pièce, avec sa demande. "
+                "Longueurs entières (mm, cm...), dans la même unité que la barre.")
+    capacite = st.number_input("Longueur des barres :", min_value=1, value=100, step=1)
+    if st.radio("Saisie :", ["Grille", "Fichier CSV/XLSX"], horizontal=True,
+                key="saisie_decoupe") == "Grille":
+        df = st.data_editor(EXEMPLE_DECOUPE, num_rows="dynamic", key="decoupe")
+    else:
+        fichier = st.file_uploader("Fichier :", type=["csv", "xlsx"], key="fichier_decoupe")
+        if fichier is None:
+            return
+        df = lire_fichier(io.BytesIO(fichier.getvalue()), fichier.name)
+    # Le maître a besoin des prix duaux : CBC ou HiGHS, HiGHS pour les autres solveurs
+    maitre = MAITRES.get(solveur, maitre_highs)
+
+    if not st.button("Résoudre"):
+        return
+    try:
+        longueurs, demandes = tableau_decoupe(df)
+        decoupe = generation_colonnes(longueurs, demandes, capacite, maitre,
+                                      limite_temps=limite_temps)
+    except ValueError as e:
+        st.error(str(e))
+        return
+
+    st.subheader("📊 Résultats")
+    st.write(f"**Statut :** {decoupe.statut}")
+    if decoupe.quantites is None:
+        st.warning("Pas de solution pour ce problème.")
+        return
+    if decoupe.statut != "Optimal":
+        st.warning(f"Génération arrêtée après {len(decoupe.iterations)} itérations : "
+                   "la borne inférieure n'est pas garantie.")
+    iterations = pd.DataFrame([vars(i) for i in decoupe.iterations])
+    minimum = int(np.ceil(decoupe.borne - 1e-6))
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Barres", decoupe.barres, f"{decoupe.barres - minimum:+d} sur la borne",
+                delta_color="inverse")
+    col2.metric("Borne (relaxation)", f"{decoupe.borne:.6g}")
+    col3.metric("Itérations", len(iterations))
+    nom_maitre = "HiGHS" if maitre is maitre_highs else "CBC"
+    st.caption(f"⏱️ Total {decoupe.temps * 1000:.1f} ms • maître ({nom_maitre}) "
+               f"{iterations['temps_maitre'].mean() * 1000:.2f} ms / itération • sac à dos "
+               f"{iterations['temps_pricing'].mean() * 1000:.2f} ms / itération • "
+               f"arrondi : {decoupe.arrondi}")
+
+    noms = [f"{l:g}" for l in longueurs]
+    chutes = capacite - decoupe.patrons @ longueurs
+    plan = pd.DataFrame({
+        "Patron": [" + ".join(f"{a}×{nom}" for a, nom in zip(patron, noms) if a)
+                   for patron in decoupe.patrons],
+        "Barres": decoupe.quantites, "Relaxation": decoupe.relaxation.round(4), "Chute": chutes,
+    })
+    st.write("**Plan de découpe :**")
+    st.dataframe(plan, hide_index=True)
+    produites = decoupe.patrons.T @ decoupe.quantites
+    st.caption(f"Chute totale : {chutes @ decoupe.quantites:g} • surplus de pièces : "
+               f"{int((produites - demandes).sum())}")
+
+    st.write("**Itérations de la génération de colonnes :**")
+    st.line_chart(iterations, x="numero", y="objectif")
+    st.dataframe(iterations.rename(columns={
+        "numero": "Itération", "objectif": "Maître", "cout_reduit": "Coût réduit",
+        "patrons": "Patrons", "temps_maitre": "Maître (s)", "temps_pricing": "Sac à dos (s)",
+    }).round(6), hide_index=True)
+    st.download_button("📥 Télécharger le plan (CSV)", plan.to_csv(index=False),
+                       file_name="decoupe.csv", mime="text/csv")
 
 
 # --- Lancement de l'application ---
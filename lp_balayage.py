@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Balayage paramétrique d'un programme linéaire.
+
+Le modèle analysé est envoyé une seule fois à chaque processus du pool ;
+chaque scénario ne transporte ensuite que les valeurs modifiées du second
+membre (b) ou des coefficients de la fonction économique (c).
+"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import replace
+
+from lp_core import Resultat, resoudre
+
+_MODELE = None
+_SOLVEUR = resoudre
+
+
+def nom_parametre(modele, parametre):
+    """Libellé lisible d'un paramètre ("b", i) ou ("c", j)."""
+    genre, k = parametre
+    if genre == "b":
+        return f"b{k + 1}"
+    return f"c({modele.variables[k]})"
+
+
+def appliquer(modele, valeurs):
+    """Copie du modèle où b et c reçoivent les valeurs du scénario (A partagée)."""
+    b, c = modele.b.copy(), modele.c.copy()
+    for (genre, k), v in valeurs.items():
+        if genre == "b":
+            b[k] = v
+        else:
+            c[k] = v
+    return replace(modele, b=b, c=c)
+
+
+def grille_scenarios(grille):
+    """Produit cartésien {paramètre: valeurs} -> liste de {paramètre: valeur}."""
+    parametres = list(grille)
+    return [dict(zip(parametres, combinaison))
+            for combinaison in itertools.product(*(grille[p] for p in parametres))]
+
+
+def _initialiser(modele, solveur):
+    global _MODELE, _SOLVEUR
+    _MODELE, _SOLVEUR = modele, solveur
+
+
+def _resoudre_scenario(numero, valeurs):
+    return numero, valeurs, _SOLVEUR(appliquer(_MODELE, valeurs))
+
+
+def balayer(modele, grille, processus=None, solveur=resoudre):
+    """Résout tous les scénarios de la grille dans un pool de processus.
+
+    Générateur : chaque (numéro, valeurs, Resultat) est produit dès qu'il
+    est disponible, dans l'ordre d'achèvement ; un scénario dont la
+    résolution lève une exception reçoit le statut « Erreur : ... ».
+    `solveur` doit être une fonction de module (transmise aux processus
+    par pickle).
+    """
+    scenarios = grille_scenarios(grille)
+    processus = processus or max(1, min(len(scenarios), os.cpu_count() or 1))
+    with ProcessPoolExecutor(max_workers=processus, initializer=_initialiser,
+                             initargs=(modele, solveur)) as pool:
+        taches = {pool.submit(_resoudre_scenario, i, valeurs): (i, valeurs)
+                  for i, valeurs in enumerate(scenarios)}
+        for tache in as_completed(taches):
+            erreur = tache.exception()
+            if erreur is None:
+                yield tache.result()
+            else:
+                # Un scénario en échec n'interrompt pas le balayage : l'erreur devient son statut
+                numero, valeurs = taches[tache]
+                yield numero, valeurs, Resultat(f"Erreur : {erreur}", dict.fromkeys(modele.variables))
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Cache de résolutions partagé entre toutes les sessions Streamlit.
+
+La clé est une forme canonique du problème : variables triées, lignes
+normalisées (coefficient de plus grande valeur absolue ramené à 1, '>='
+retourné en '<='), lignes triées et dédoublonnées. Deux saisies
+équivalentes du même exercice tombent donc sur la même entrée. En cas
+d'absence, l'historique SQLite (lp_historique) est consulté avant le
+solveur, et toute résolution effective y est enregistrée.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import time
+from dataclasses import replace
+
+import numpy as np
+import streamlit as st
+
+from cache_lru import CacheLRU
+from lp_core import resoudre
+from lp_historique import historique_partage
+
+CAPACITE = 512
+DECIMALES = 12
+
+_journal = logging.getLogger(__name__)
+
+
+# ==============================
+# Forme canonique
+# ==============================
+def _arrondi(valeurs):
+    return tuple((np.round(np.atleast_1d(valeurs), DECIMALES) + 0.0).tolist())
+
+
+def forme_canonique(modele):
+    """Renvoie un tuple hachable indépendant de l'écriture du problème."""
+    A = modele.A.tocsr(copy=True)
+    A.eliminate_zeros()
+    A.sort_indices()
+    b = modele.b.astype(float)
+    ops = np.asarray(modele.operateurs)
+
+    echelle = np.asarray(abs(A).max(axis=1).todense()).ravel()
+    echelle[echelle == 0] = 1.0
+    # '>=' devient '<=' ; une égalité commence par un coefficient positif
+    premiers = np.array([A.data[A.indptr[i]] if A.indptr[i] < A.indptr[i + 1] else 1.0
+                         for i in range(A.shape[0])])
+    signe = np.where(ops == '>=', -1.0, 1.0)
+    signe = np.where((ops == '==') & (premiers < 0), -1.0, signe)
+    facteur = signe / echelle
+
+    lignes = set()
+    for i in range(A.shape[0]):
+        debut, fin = A.indptr[i], A.indptr[i + 1]
+        lignes.add(('==' if ops[i] == '==' else '<=',
+                    tuple(A.indices[debut:fin].tolist()),
+                    _arrondi(A.data[debut:fin] * facteur[i]),
+                    _arrondi(b[i] * facteur[i])))
+
+    entieres = () if not modele.mip else tuple(np.flatnonzero(modele.entieres).tolist())
+    return (modele.sens, tuple(modele.variables), _arrondi(modele.c),
+            tuple(sorted(lignes)), entieres)
+
+
+def cle_canonique(modele):
+    """Empreinte SHA-1 de la forme canonique."""
+    return hashlib.sha1(repr(forme_canonique(modele)).encode()).hexdigest()
+
+
+@st.cache_resource
+def cache_partage(capacite=CAPACITE):
+    """Instance unique du cache pour tout le processus Streamlit."""
+    return CacheLRU(capacite)
+
+
+def resoudre_en_cache(modele, solveur=resoudre, cache=None, historique=None):
+    """Résout via le cache, puis l'historique ; le solveur n'est appelé qu'en cas d'absence."""
+    cache = cache if cache is not None else cache_partage()
+    historique = historique if historique is not None else historique_partage()
+    debut = time.perf_counter()
+    empreinte = cle_canonique(modele)
+    cle = (solveur.__module__, solveur.__name__, empreinte)
+
+    resultat = cache.obtenir(cle)
+    if resultat is not None:
+        return replace(resultat, temps=time.perf_counter() - debut,
+                       methode=f"Cache ({resultat.methode})")
+
+    nom_solveur = f"{solveur.__module__}.{solveur.__name__}"
+    if historique is not None:
+        # L'historique est facultatif : base verrouillée ou en lecture seule, on résout
+        try:
+            resultat = historique.retrouver(empreinte, nom_solveur)
+        except sqlite3.Error as e:
+            _journal.warning("Historique illisible (%s) : résolution directe.", e)
+            resultat = None
+        if resultat is not None:
+            cache.ajouter(cle, resultat)
+            return replace(resultat, temps=time.perf_counter() - debut,
+                           methode=f"Historique ({resultat.methode})")
+
+    resultat = solveur(modele)
+    # Une résolution interrompue (limite de temps) n'est pas mémorisée, mais son temps compte
+    if resultat.statut != "Not Solved":
+        cache.ajouter(cle, resultat)
+    if historique is not None:
+        try:
+            historique.enregistrer(empreinte, nom_solveur, modele, resultat)
+        except sqlite3.Error as e:
+            _journal.warning("Résolution non enregistrée dans l'historique (%s).", e)
+    return resultat
+
+
+def afficher_statistiques(zone, cache=None):
+    """Affiche les compteurs succès / échecs du cache dans `zone` (barre latérale)."""
+    cache = cache if cache is not None else cache_partage()
+    total = cache.hits + cache.misses
+    taux = 100 * cache.hits / total if total else 0.0
+    with zone.container():
+        st.markdown("**🗄️ Cache des résolutions**")
+        col1, col2 = st.columns(2)
+        col1.metric("Succès", cache.hits)
+        col2.metric("Échecs", cache.misses)
+        st.caption(f"Taux de succès : {taux:.0f} % • {len(cache)}/{cache.capacite} entrées")
@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""
+Noyau commun de programmation linéaire.
+
+Les applications (optimisation.py, optimisation1.py, lagrangien1.py,
+lineaire3.py) analysent une seule fois la fonction économique et les
+contraintes vers une représentation creuse (c, A, b, opérateurs), puis
+transmettent le modèle au solveur en bloc.
+"""
+
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import numpy as np
+from scipy import sparse
+from pulp import (LpMaximize, LpMinimize, LpProblem, LpVariable, LpStatus,
+                  LpAffineExpression, LpConstraint, LpConstraintLE,
+                  LpConstraintGE, LpConstraintEQ, PULP_CBC_CMD)
+
+OPERATEURS = ['<=', '>=', '==', '=']
+
+_SENS_PULP = {'<=': LpConstraintLE, '>=': LpConstraintGE, '==': LpConstraintEQ}
+
+# Un terme entier par correspondance : signes, puis « 2x », « 2*x », « x*2 », « 1.5e3 x1 »
+# ou une constante seule ; les espaces sont admis partout
+_NOMBRE_LINEAIRE = r'(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?'
+_VARIABLE = r'[a-zA-Z_]\w*'
+_TERME = re.compile(rf"""(\s*(?P<signes>[-+][\s+-]*)?
+    (?: (?P<coef>{_NOMBRE_LINEAIRE}) (?:\s*\*?\s*(?P<var>{_VARIABLE}))?
+      | (?P<seule>{_VARIABLE}) (?:\s*\*\s*(?P<facteur>{_NOMBRE_LINEAIRE}))? )\s*)""", re.VERBOSE)
+_DECLARATION = re.compile(r'^\s*(int|bin)\s+([a-zA-Z][\w\s,;]*)$', re.IGNORECASE)
+
+# Journal CBC : solutions entières et borne (valeurs en minimisation interne)
+_NOMBRE = r'([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)'
+_CBC_SOLUTION = re.compile(r'Integer solution of ' + _NOMBRE + '|' + _NOMBRE + r' best solution')
+_CBC_BORNE = re.compile(r'best possible ' + _NOMBRE)
+# CBC affiche 1e+50 tant qu'aucune solution entière n'est connue
+_CBC_INFINI = 1e49
+
+
+# ==============================
+# Analyse syntaxique
+# ==============================
+class ErreurSyntaxe(ValueError):
+    """Expression illisible ; `position` (à partir de 0) repère le caractère fautif."""
+
+    def __init__(self, message, expression, position):
+        self.message, self.expression, self.position = message, expression, position
+        super().__init__(f"{message} (position {position + 1}) : "
+                         f"{expression[:position]}⟦{expression[position:position + 1]}⟧"
+                         f"{expression[position + 1:]}")
+
+
+@dataclass(frozen=True)
+class ExpressionLineaire:
+    """Termes (coefficient, variable) fusionnés, dans l'ordre d'apparition, et constante."""
+    termes: tuple
+    constante: float = 0.0
+
+
+def _localiser_erreur(expression):
+    """Reprend l'expression terme à terme et lève ErreurSyntaxe au premier défaut."""
+    position, fin = 0, len(expression.rstrip())
+    while position < fin:
+        terme = _TERME.match(expression, position)
+        if terme is None:
+            position += len(expression[position:]) - len(expression[position:].lstrip())
+            caractere = expression[position]
+            raise ErreurSyntaxe("Terme attendu après le signe" if caractere in "+-"
+                                else f"Caractère inattendu « {caractere} »", expression, position)
+        if terme.group("signes") is None and position > 0:
+            raise ErreurSyntaxe("Opérateur + ou - attendu", expression,
+                                terme.start("coef") if terme.group("coef") else terme.start("seule"))
+        position = terme.end()
+
+
+@lru_cache(maxsize=4096)
+def analyse_lineaire(expression):
+    """Analyse « 2x1 - 3*y + x1 + 1.5e2 » en une seule passe d'expression régulière.
+
+    Les variables répétées sont additionnées, les constantes cumulées à part.
+    Lève ErreurSyntaxe (un ValueError) à la première incohérence. Le
+    résultat, immuable, est mis en cache : une saisie inchangée n'est pas
+    ré-analysée d'une réexécution à l'autre.
+    """
+    termes = _TERME.findall(expression)
+    # Termes jointifs couvrant tout le texte, chacun précédé d'un signe sauf le premier
+    if sum(len(terme[0]) for terme in termes) != len(expression) \
+            or not all(terme[1] for terme in termes[1:]):
+        _localiser_erreur(expression)
+
+    coefficients, constante = {}, 0.0
+    for _, signes, coef, var, seule, facteur in termes:
+        coeff = -1.0 if signes.count("-") % 2 else 1.0
+        nombre = coef or facteur
+        if nombre:
+            coeff *= float(nombre)
+        variable = var or seule
+        if variable:
+            coefficients[variable] = coefficients.get(variable, 0.0) + coeff
+        else:
+            constante += coeff
+    return ExpressionLineaire(tuple((coeff, var) for var, coeff in coefficients.items()), constante)
+
+
+def analyse_syntaxique(expression):
+    """Analyse une expression linéaire en liste de (coefficient, variable).
+
+    Les constantes éventuelles sont exclues : voir analyse_lineaire.
+    """
+    return list(analyse_lineaire(expression).termes)
+
+
+def analyse_contrainte(texte):
+    """Découpe « 2x + 3y <= 12 » en (lhs, op, rhs), ou None si aucun opérateur."""
+    for op in OPERATEURS:
+        if op in texte:
+            lhs, rhs = texte.split(op, 1)
+            return lhs.strip(), op.strip(), float(rhs.strip())
+    return None
+
+
+def analyse_declaration(texte):
+    """Découpe « int x, y » ou « bin z » en ("int"|"bin", [variables]), sinon None."""
+    declaration = _DECLARATION.match(texte)
+    if not declaration:
+        return None
+    return declaration.group(1).lower(), re.findall(r'[a-zA-Z]\w*', declaration.group(2))
+
+
+def analyse_objectif(texte):
+    """Découpe « max 3x + 2y » en ("max", "3x + 2y")."""
+    texte = texte.strip()
+    sens = texte[:3].lower()
+    if sens not in ("max", "min"):
+        raise ValueError("La fonction doit commencer par 'max' ou 'min'.")
+    return sens, texte[3:].strip()
+
+
+# ==============================
+# Modèle creux
+# ==============================
+@dataclass
+class ModeleLineaire:
+    """Programme linéaire sous forme creuse : opt c·x  s.c.  A x (op) b, x >= 0.
+
+    `entieres` : masque booléen des variables entières (None : tout continu).
+    """
+    sens: str
+    variables: list
+    c: np.ndarray
+    A: sparse.csr_matrix
+    b: np.ndarray
+    operateurs: list = field(default_factory=list)
+    entieres: np.ndarray = None
+
+    @property
+    def mip(self):
+        return self.entieres is not None and bool(np.any(self.entieres))
+
+    @property
+    def n_variables(self):
+        return len(self.variables)
+
+    @property
+    def n_contraintes(self):
+        return self.A.shape[0]
+
+
+@dataclass
+class Resultat:
+    """Résultat d'une résolution : statut PuLP, valeurs, z, durées (s) et méthode.
+
+    `temps` mesure la résolution seule, `construction` la traduction du
+    modèle vers le format du solveur. Un statut "Not Solved" accompagné
+    d'un objectif désigne la meilleure solution réalisable trouvée avant
+    la limite de temps. En nombres entiers, `borne` est la meilleure borne
+    connue et `ecart` l'écart relatif entre elle et l'objectif.
+    """
+    statut: str
+    valeurs: dict
+    objectif: float = None
+    temps: float = 0.0
+    methode: str = "CBC"
+    construction: float = 0.0
+    borne: float = None
+    ecart: float = None
+
+
+def construire_modele(sens, objectif, contraintes):
+    """Construit un ModeleLineaire à partir de l'objectif et des (lhs, op, rhs).
+
+    Les termes sont accumulés en triplets (ligne, colonne, valeur) puis
+    assemblés d'un coup ; les variables répétées sont additionnées.
+    """
+    objectif = analyse_lineaire(objectif)
+    if objectif.constante:
+        raise ValueError("Constante dans la fonction économique : elle ne change pas la solution, "
+                         "retirez-la.")
+    termes_objectif = objectif.termes
+    # Une constante du membre de gauche passe dans le second membre
+    gauches = [analyse_lineaire(lhs) for lhs, _, _ in contraintes]
+    termes_contraintes = [gauche.termes for gauche in gauches]
+
+    noms = {var for _, var in termes_objectif}
+    for termes in termes_contraintes:
+        noms.update(var for _, var in termes)
+    variables = sorted(noms)
+    index = {var: j for j, var in enumerate(variables)}
+
+    c = np.zeros(len(variables))
+    for coeff, var in termes_objectif:
+        c[index[var]] += coeff
+
+    lignes, colonnes, valeurs = [], [], []
+    for i, termes in enumerate(termes_contraintes):
+        for coeff, var in termes:
+            lignes.append(i)
+            colonnes.append(index[var])
+            valeurs.append(coeff)
+
+    b = [rhs - gauche.constante for (_, _, rhs), gauche in zip(contraintes, gauches)]
+    operateurs = [op for _, op, _ in contraintes]
+    return assembler_modele(sens, variables, c, lignes, colonnes, valeurs, b, operateurs)
+
+
+def assembler_modele(sens, variables, c, lignes, colonnes, valeurs, b, operateurs):
+    """Assemble un ModeleLineaire à partir de triplets (ligne, colonne, valeur)."""
+    A = sparse.coo_matrix((valeurs, (lignes, colonnes)),
+                          shape=(len(b), len(variables))).tocsr()
+    A.sum_duplicates()
+    operateurs = ['==' if op == '=' else op for op in operateurs]
+    return ModeleLineaire(sens, list(variables), np.asarray(c, dtype=float), A,
+                          np.asarray(b, dtype=float), operateurs)
+
+
+def declarer_entieres(modele, entieres=(), binaires=()):
+    """Copie du modèle où les variables nommées sont entières ; binaire : entière et <= 1."""
+    index = {var: j for j, var in enumerate(modele.variables)}
+    inconnues = [var for var in [*entieres, *binaires] if var not in index]
+    if inconnues:
+        raise ValueError(f"Variable(s) déclarée(s) absente(s) du modèle : {', '.join(inconnues)}")
+    masque = np.zeros(modele.n_variables, dtype=bool) if modele.entieres is None \
+        else modele.entieres.copy()
+    masque[[index[var] for var in [*entieres, *binaires]]] = True
+
+    colonnes = sorted({index[var] for var in binaires})
+    A = sparse.vstack([modele.A, sparse.csr_matrix((np.ones(len(colonnes)),
+                                                    (np.arange(len(colonnes)), colonnes)),
+                                                   shape=(len(colonnes), modele.n_variables))])
+    return ModeleLineaire(modele.sens, modele.variables, modele.c, A.tocsr(),
+                          np.concatenate([modele.b, np.ones(len(colonnes))]),
+                          list(modele.operateurs) + ['<='] * len(colonnes), masque)
+
+
+# ==============================
+# Passage au solveur
+# ==============================
+def vers_pulp(modele, nom="Probleme_Lineaire"):
+    """Traduit le modèle en LpProblem ligne par ligne, sans sommes Python."""
+    probleme = LpProblem(nom, LpMaximize if modele.sens == "max" else LpMinimize)
+    entieres = modele.entieres if modele.entieres is not None else [False] * modele.n_variables
+    lp_vars = [LpVariable(f"Var_{var}", lowBound=0, cat="Integer" if entiere else "Continuous")
+               for var, entiere in zip(modele.variables, entieres)]
+
+    probleme.setObjective(LpAffineExpression(
+        [(lp_vars[j], modele.c[j]) for j in np.flatnonzero(modele.c)]))
+
+    A = modele.A
+    for i in range(modele.n_contraintes):
+        debut, fin = A.indptr[i], A.indptr[i + 1]
+        expression = LpAffineExpression(
+            [(lp_vars[j], v) for j, v in zip(A.indices[debut:fin], A.data[debut:fin])])
+        probleme.addConstraint(LpConstraint(expression, _SENS_PULP[modele.operateurs[i]],
+                                            rhs=modele.b[i]))
+    return probleme, lp_vars
+
+
+def est_realisable(modele, x, tolerance=1e-6):
+    """Vérifie x >= 0 et toutes les contraintes, à la tolérance près."""
+    x = np.asarray(x, dtype=float)
+    if x.shape != (modele.n_variables,) or not np.all(np.isfinite(x)) or np.any(x < -tolerance):
+        return False
+    if modele.mip and np.any(np.abs(x - np.round(x))[modele.entieres] > tolerance):
+        return False
+    ecart = modele.A @ x - modele.b
+    ops = np.asarray(modele.operateurs)
+    marge = tolerance * (1 + np.abs(modele.b))
+    return bool(np.all(np.where(ops == '<=', ecart <= marge,
+                                np.where(ops == '>=', ecart >= -marge, np.abs(ecart) <= marge))))
+
+
+def lire_journal_cbc(texte, sens):
+    """Dernière solution entière et meilleure borne lues dans un journal CBC.
+
+    CBC minimise en interne : les valeurs sont remises dans le sens du modèle.
+    """
+    signe = -1.0 if sens == "max" else 1.0
+    solutions = [float(a or b) for a, b in _CBC_SOLUTION.findall(texte)]
+    bornes = [float(v) for v in _CBC_BORNE.findall(texte)]
+    solutions = [v for v in solutions if abs(v) < _CBC_INFINI]
+    solution = solutions[-1] * signe if solutions else None
+    borne = bornes[-1] * signe if bornes else None
+    return solution, borne
+
+
+def ecart_relatif(objectif, borne):
+    """Écart relatif |z - borne| / |z| (définition de CBC et HiGHS)."""
+    if objectif is None or borne is None:
+        return None
+    return abs(objectif - borne) / max(abs(objectif), 1e-10)
+
+
+def resoudre(modele, limite_temps=None, threads=None, ecart_mip=None, journal=None):
+    """Résout le modèle avec CBC et renvoie un Resultat.
+
+    Avec `limite_temps` (s), CBC s'arrête et rend sa meilleure solution.
+    `threads` et `ecart_mip` (écart relatif toléré) règlent le branch and
+    bound ; le journal CBC est écrit dans le fichier `journal` s'il est donné.
+    """
+    debut = time.perf_counter()
+    probleme, lp_vars = vers_pulp(modele)
+    construction = time.perf_counter() - debut
+    temporaire = journal is None and modele.mip
+    if temporaire:
+        descripteur, journal = tempfile.mkstemp(suffix=".log")
+        os.close(descripteur)
+    debut = time.perf_counter()
+    try:
+        probleme.solve(PULP_CBC_CMD(msg=False, timeLimit=limite_temps, threads=threads,
+                                    gapRel=ecart_mip, logPath=journal))
+        temps = time.perf_counter() - debut
+        borne = None
+        if modele.mip and os.path.exists(journal):
+            with open(journal, encoding="utf-8", errors="ignore") as f:
+                _, borne = lire_journal_cbc(f.read(), modele.sens)
+    finally:
+        if temporaire:
+            os.remove(journal)
+
+    statut = LpStatus[probleme.status]
+    valeurs = {var: v.varValue for var, v in zip(modele.variables, lp_vars)}
+    # z recalculé sur le modèle : PuLP rend None pour un objectif sans terme
+    x = list(valeurs.values())
+    objectif = None if None in x else float(modele.c @ np.asarray(x, dtype=float))
+    if statut == "Not Solved" and objectif is not None and not est_realisable(modele, x):
+        objectif = None
+    if modele.mip and statut == "Optimal" and borne is None:
+        borne = objectif    # résolu à la racine, sans branchement
+    return Resultat(statut, valeurs, objectif, temps, construction=construction,
+                    borne=borne, ecart=ecart_relatif(objectif, borne) if modele.mip else None)
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+Découpe unidimensionnelle (cutting stock) par génération de colonnes.
+
+On coupe des pièces de longueurs lᵢ, demandées dᵢ fois, dans des barres
+de longueur L, en utilisant le moins de barres possible. Énumérer tous les
+patrons de découpe est combinatoire ; on n'en garde qu'une poignée :
+- problème maître (ModeleLineaire, résolu par HiGHS ou CBC) :
+  min Σ x_p  s.c.  Σ_p a_ip x_p >= dᵢ, x >= 0, sur les patrons connus ;
+- sous-problème : sac à dos borné max Σ πᵢ aᵢ s.c. Σ lᵢ aᵢ <= L, résolu
+  par programmation dynamique NumPy (une passe vectorisée par lot de
+  pièces, découpage binaire des quantités), πᵢ étant les prix duaux du
+  maître. Un patron de valeur > 1 a un coût réduit négatif : il rejoint
+  le maître, jusqu'à ce qu'aucun n'en ait.
+La solution fractionnaire est ensuite arrondie en nombres entiers sur les
+patrons générés (milp HiGHS, repli sur l'arrondi supérieur).
+"""
+
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+from pulp import PULP_CBC_CMD, LpStatus
+from scipy.optimize import linprog
+
+from lp_core import Resultat, assembler_modele, declarer_entieres, resoudre, vers_pulp
+from lp_solveurs import matrices_highs, resoudre_highs
+
+TOLERANCE = 1e-9
+ITERATIONS_MAX = 500
+# L'arrondi en nombres entiers peut être long : on garde alors sa meilleure solution
+LIMITE_ARRONDI = 10.0
+# Taille maximale (cases) de la table de décision de la programmation dynamique
+CASES_MAX = 50_000_000
+
+
+@dataclass
+class IterationColonnes:
+    """Une itération : valeur du maître, coût réduit du meilleur patron, durées (s)."""
+    numero: int
+    objectif: float
+    cout_reduit: float
+    patrons: int
+    temps_maitre: float
+    temps_pricing: float
+
+
+@dataclass
+class Decoupe:
+    """Patrons (une ligne par patron, une colonne par pièce) et nombre de barres de chacun."""
+    statut: str
+    patrons: np.ndarray = None
+    quantites: np.ndarray = None
+    relaxation: np.ndarray = None
+    borne: float = None
+    iterations: list = field(default_factory=list)
+    temps: float = 0.0
+    arrondi: str = ""
+
+    @property
+    def barres(self):
+        return int(self.quantites.sum()) if self.quantites is not None else None
+
+
+# ==============================
+# Problème maître
+# ==============================
+def modele_maitre(patrons, demandes):
+    """min Σ x_p  s.c.  Σ_p a_ip x_p >= dᵢ (variables p1, p2, ...)."""
+    i, p = np.nonzero(patrons.T)
+    return assembler_modele("min", [f"p{k + 1}" for k in range(len(patrons))],
+                            np.ones(len(patrons)), i, p, patrons.T[i, p].astype(float),
+                            np.asarray(demandes, dtype=float), [">="] * len(demandes))
+
+
+def maitre_highs(modele):
+    """Résout le maître avec HiGHS ; renvoie (Resultat, prix duaux ∂z/∂b)."""
+    debut = time.perf_counter()
+    A_ub, b_ub, _, _ = matrices_highs(modele)
+    sortie = linprog(modele.c, A_ub=A_ub, b_ub=b_ub, bounds=(0, None), method="highs")
+    temps = time.perf_counter() - debut
+    if sortie.status != 0:
+        return Resultat("Infeasible" if sortie.status == 2 else "Not Solved",
+                        dict.fromkeys(modele.variables), temps=temps, methode="HiGHS"), None
+    # Lignes '>=' négativées par matrices_highs : le dual change de signe
+    duales = -sortie.ineqlin.marginals
+    valeurs = {var: float(v) for var, v in zip(modele.variables, sortie.x)}
+    return Resultat("Optimal", valeurs, float(sortie.fun), temps, methode="HiGHS"), duales
+
+
+def maitre_cbc(modele):
+    """Résout le maître avec CBC (PuLP) ; renvoie (Resultat, prix duaux ∂z/∂b)."""
+    debut = time.perf_counter()
+    probleme, lp_vars = vers_pulp(modele, "Maitre")
+    probleme.solve(PULP_CBC_CMD(msg=False))
+    temps = time.perf_counter() - debut
+    statut = LpStatus[probleme.status]
+    if statut != "Optimal":
+        return Resultat(statut, dict.fromkeys(modele.variables), temps=temps), None
+    duales = np.array([contrainte.pi or 0.0 for contrainte in probleme.constraints.values()])
+    valeurs = {var: v.varValue for var, v in zip(modele.variables, lp_vars)}
+    x = np.array(list(valeurs.values()), dtype=float)
+    return Resultat(statut, valeurs, float(modele.c @ x), temps), duales
+
+
+# Solveur de la barre latérale -> résolution du maître avec prix duaux
+MAITRES = {resoudre: maitre_cbc, resoudre_highs: maitre_highs}
+
+
+# ==============================
+# Sous-problème : sac à dos borné
+# ==============================
+def sac_a_dos(valeurs, longueurs, capacite, bornes):
+    """max Σ vᵢ aᵢ  s.c.  Σ lᵢ aᵢ <= capacite, 0 <= aᵢ <= bornesᵢ entiers.
+
+    Chaque quantité bornée est découpée en paquets 1, 2, 4, ... (sac à dos
+    0/1 équivalent) ; chaque paquet met à jour toute la table des capacités
+    d'un seul calcul NumPy. Renvoie (valeur, quantités).
+    """
+    paquets = []
+    for i in np.flatnonzero(np.asarray(valeurs) > TOLERANCE):
+        reste, taille = int(bornes[i]), 1
+        while reste > 0:
+            q = min(taille, reste)
+            if q * longueurs[i] <= capacite:
+                paquets.append((i, q))
+            reste -= q
+            taille *= 2
+    if len(paquets) * (capacite + 1) > CASES_MAX:
+        raise ValueError("Barres trop longues pour la programmation dynamique : "
+                         "exprimez les longueurs dans une unité plus grossière.")
+
+    meilleur = np.zeros(capacite + 1)
+    pris = np.zeros((len(paquets), capacite + 1), dtype=bool)
+    for k, (i, q) in enumerate(paquets):
+        poids = q * longueurs[i]
+        candidat = meilleur[:capacite + 1 - poids] + q * valeurs[i]
+        mieux = candidat > meilleur[poids:] + TOLERANCE
+        pris[k, poids:] = mieux
+        meilleur[poids:] = np.where(mieux, candidat, meilleur[poids:])
+
+    quantites = np.zeros(len(longueurs), dtype=int)
+    reste = capacite
+    for k in range(len(paquets) - 1, -1, -1):
+        if pris[k, reste]:
+            i, q = paquets[k]
+            quantites[i] += q
+            reste -= q * longueurs[i]
+    return float(meilleur[capacite]), quantites
+
+
+# ==============================
+# Génération de colonnes
+# ==============================
+def _longueurs_entieres(longueurs):
+    entieres = np.rint(longueurs)
+    if np.any(np.abs(longueurs - entieres) > TOLERANCE) or np.any(entieres <= 0):
+        raise ValueError("Longueurs entières et positives attendues (exprimez-les en mm ou en cm).")
+    return entieres.astype(int)
+
+
+def arrondir(patrons, demandes, relaxation, limite_temps=LIMITE_ARRONDI):
+    """Nombre entier de barres par patron : milp HiGHS sur les patrons générés, sinon arrondi supérieur."""
+    modele = modele_maitre(patrons, demandes)
+    entier = resoudre_highs(declarer_entieres(modele, modele.variables), limite_temps=limite_temps)
+    plafond = np.ceil(relaxation - 1e-6).astype(int)
+    if entier.objectif is not None and entier.objectif <= plafond.sum():
+        quantites = np.rint([entier.valeurs[var] for var in modele.variables]).astype(int)
+        return quantites, "Optimal sur les patrons" if entier.statut == "Optimal" else "Meilleure solution"
+    return plafond, "Arrondi supérieur"
+
+
+def generation_colonnes(longueurs, demandes, capacite, maitre=maitre_highs,
+                        iterations_max=ITERATIONS_MAX, limite_temps=LIMITE_ARRONDI):
+    """Résout la découpe : renvoie une Decoupe avec le journal des itérations.
+
+    Départ : un patron homogène par pièce (autant d'exemplaires que possible).
+    `borne` est la valeur du maître à la dernière itération, minorant du
+    nombre de barres quand la génération s'est arrêtée sur l'optimum.
+    `limite_temps` (s) borne l'arrondi en nombres entiers.
+    """
+    debut = time.perf_counter()
+    longueurs = _longueurs_entieres(np.asarray(longueurs, dtype=float))
+    demandes = np.asarray(demandes, dtype=float)
+    capacite = int(capacite)
+    if longueurs.shape != demandes.shape or np.any(demandes < 0):
+        raise ValueError("Une demande positive par longueur de pièce est attendue.")
+    if np.any(longueurs > capacite):
+        raise ValueError("Une pièce est plus longue que la barre.")
+
+    bornes = np.minimum(capacite // longueurs, np.ceil(demandes)).astype(int)
+    patrons = np.diag(capacite // longueurs)
+    iterations = []
+    for numero in range(1, iterations_max + 1):
+        debut_maitre = time.perf_counter()
+        resultat, duales = maitre(modele_maitre(patrons, demandes))
+        temps_maitre = time.perf_counter() - debut_maitre
+        if resultat.statut != "Optimal":
+            return Decoupe(resultat.statut, iterations=iterations, temps=time.perf_counter() - debut)
+
+        debut_pricing = time.perf_counter()
+        valeur, patron = sac_a_dos(duales, longueurs, capacite, bornes)
+        temps_pricing = time.perf_counter() - debut_pricing
+        iterations.append(IterationColonnes(numero, resultat.objectif, 1.0 - valeur, len(patrons),
+                                            temps_maitre, temps_pricing))
+        # Aucun patron de coût réduit négatif (ou patron déjà connu : tolérances) : optimum
+        optimal = valeur <= 1.0 + 1e-7 or np.any(np.all(patrons == patron, axis=1))
+        if optimal or numero == iterations_max:
+            statut = "Optimal" if optimal else "Not Solved"
+            break
+        patrons = np.vstack([patrons, patron])
+
+    relaxation = np.array(list(resultat.valeurs.values()), dtype=float)
+    quantites, methode = arrondir(patrons, demandes, relaxation, limite_temps)
+    utiles = quantites > 0
+    return Decoupe(statut, patrons[utiles], quantites[utiles], relaxation[utiles],
+                   resultat.objectif, iterations, time.perf_counter() - debut, methode)
@@ -0,0 +1,447 @@
+# -*- coding: utf-8 -*-
+"""
+Import / export des modèles aux formats MPS et CPLEX-LP.
+
+Les lecteurs parcourent le fichier ligne par ligne, section par section,
+et accumulent directement les triplets (ligne, colonne, valeur) du modèle
+creux : le texte complet n'est jamais conservé en mémoire. Les écrivains
+produisent un fichier relisible par n'importe quel solveur (CBC, HiGHS,
+GLPK, CPLEX...).
+
+Le noyau ne connaît que des variables x >= 0 : les bornes finies sont
+traduites en contraintes et les variables libres sont refusées.
+L'intégrité (marqueurs INTORG, bornes BV/LI/UI, sections General et
+Binary) est conservée dans le masque `entieres` du modèle.
+"""
+
+import io
+import re
+from array import array
+from dataclasses import replace
+
+import numpy as np
+
+from lp_core import assembler_modele
+
+INFINI = 1e30
+
+_TYPES_MPS = {'L': '<=', 'G': '>=', 'E': '=='}
+_INVERSE = {'<=': '>=', '>=': '<=', '==': '=='}
+
+_JETON_LP = re.compile(r"""
+    (?P<op><=|>=|=<|=>|<|>|=)
+  | (?P<signe>[+-])
+  | (?P<deux_points>:)
+  | (?P<nombre>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?|(?i:inf(?:inity)?)(?![\w.]))
+  | (?P<nom>[A-Za-z_!"\#$%&()/,.;?@`'{}|~][^\s+\-*<>=:^]*)
+""", re.VERBOSE)
+
+_SECTIONS_LP = {
+    'maximize': 'max', 'maximise': 'max', 'maximum': 'max', 'max': 'max',
+    'minimize': 'min', 'minimise': 'min', 'minimum': 'min', 'min': 'min',
+    'subject to': 'st', 'such that': 'st', 'st': 'st', 's.t.': 'st', 'st.': 'st',
+    'bounds': 'bounds', 'bound': 'bounds',
+    'general': 'int', 'generals': 'int', 'gen': 'int',
+    'integer': 'int', 'integers': 'int',
+    'binary': 'bin', 'binaries': 'bin', 'bin': 'bin',
+    'end': 'end',
+}
+_ENTETE_LP = re.compile(r'^(maximi[sz]e|minimi[sz]e|subject\s+to|such\s+that)\b(.*)$', re.I)
+
+
+class _Accumulateur:
+    """Triplets et second membre accumulés pendant la lecture."""
+
+    def __init__(self):
+        self.colonnes = {}
+        self.lignes, self.indices, self.valeurs = array('l'), array('l'), array('d')
+        self.b = array('d')
+        self.operateurs = []
+        self.c = {}
+        self.entiers = set()
+
+    def colonne(self, nom):
+        return self.colonnes.setdefault(nom, len(self.colonnes))
+
+    def nouvelle_ligne(self, termes, op, rhs):
+        i = len(self.b)
+        for nom, coeff in termes.items():
+            self.lignes.append(i)
+            self.indices.append(self.colonne(nom))
+            self.valeurs.append(coeff)
+        self.b.append(rhs)
+        self.operateurs.append(op)
+        return i
+
+    def borne(self, nom, op, valeur):
+        """Traduit une borne de variable en contrainte (x >= 0 implicite)."""
+        self.colonne(nom)
+        if op == '>=':
+            if valeur <= -INFINI or valeur < 0:
+                raise ValueError(f"Variable « {nom} » : bornes inférieures négatives "
+                                 "ou variables libres non prises en charge.")
+            if valeur > 0:
+                self.nouvelle_ligne({nom: 1.0}, '>=', valeur)
+        elif op == '<=':
+            if valeur < INFINI:
+                self.nouvelle_ligne({nom: 1.0}, '<=', valeur)
+        else:
+            self.nouvelle_ligne({nom: 1.0}, '==', valeur)
+
+    def modele(self, sens):
+        """Assemble le modèle, variables triées par nom."""
+        noms = list(self.colonnes)
+        ordre = np.argsort(noms, kind="stable")
+        rang = np.empty(len(noms), dtype=int)
+        rang[ordre] = np.arange(len(noms))
+        variables = [noms[j] for j in ordre]
+
+        c = np.zeros(len(noms))
+        for j, coeff in self.c.items():
+            c[rang[j]] += coeff
+        colonnes = rang[np.frombuffer(self.indices, dtype=self.indices.typecode)]
+        modele = assembler_modele(sens, variables, c,
+                                  np.frombuffer(self.lignes, dtype=self.lignes.typecode), colonnes,
+                                  np.frombuffer(self.valeurs), np.frombuffer(self.b),
+                                  self.operateurs)
+        if not self.entiers:
+            return modele
+        return replace(modele, entieres=np.array([var in self.entiers for var in variables]))
+
+
+def _nombre(texte):
+    texte = texte.lower()
+    if texte.lstrip('+-') in ('inf', 'infinity'):
+        return -INFINI if texte.startswith('-') else INFINI
+    return float(texte)
+
+
+# ==============================
+# Lecture MPS (fixe ou libre)
+# ==============================
+def lire_mps(lignes):
+    """Lit un flux de lignes MPS ; renvoie (ModeleLineaire, avertissements)."""
+    acc = _Accumulateur()
+    section, sens, objectif = None, "min", None
+    index_lignes, autres_n = {}, set()
+    plages, bornes_differees = {}, []
+    marqueur_entier = False
+
+    for ligne in lignes:
+        if ligne.upper().startswith("*SENSE:"):
+            # Convention de PuLP pour le sens de l'objectif
+            sens = "max" if ligne[7:].strip().upper().startswith("MAX") else "min"
+            continue
+        if not ligne.strip() or ligne.startswith('*'):
+            continue
+        mots = ligne.split()
+        if not ligne[0].isspace():
+            section = mots[0].upper()
+            if section == "OBJSENSE" and len(mots) > 1:
+                sens = "max" if mots[1].upper().startswith("MAX") else "min"
+            if section == "ENDATA":
+                break
+            continue
+
+        if section == "OBJSENSE":
+            sens = "max" if mots[0].upper().startswith("MAX") else "min"
+        elif section == "ROWS":
+            genre, nom = mots[0].upper(), mots[1]
+            if genre == 'N':
+                if objectif is None:
+                    objectif = nom
+                else:
+                    autres_n.add(nom)
+            else:
+                index_lignes[nom] = acc.nouvelle_ligne({}, _TYPES_MPS[genre], 0.0)
+        elif section == "COLUMNS":
+            if len(mots) >= 3 and mots[1].strip("'").upper() == "MARKER":
+                marqueur_entier = "INTORG" in mots[2].upper()
+                continue
+            nom = mots[0]
+            j = acc.colonne(nom)
+            if marqueur_entier:
+                acc.entiers.add(nom)
+            for nom_ligne, valeur in zip(mots[1::2], mots[2::2]):
+                if nom_ligne == objectif:
+                    acc.c[j] = acc.c.get(j, 0.0) + float(valeur)
+                elif nom_ligne in index_lignes:
+                    acc.lignes.append(index_lignes[nom_ligne])
+                    acc.indices.append(j)
+                    acc.valeurs.append(float(valeur))
+                elif nom_ligne not in autres_n:
+                    raise ValueError(f"Ligne MPS inconnue : « {nom_ligne} ».")
+        elif section in ("RHS", "RANGES"):
+            paires = mots[1:] if len(mots) % 2 else mots
+            for nom_ligne, valeur in zip(paires[0::2], paires[1::2]):
+                if nom_ligne not in index_lignes:
+                    continue
+                if section == "RHS":
+                    acc.b[index_lignes[nom_ligne]] = float(valeur)
+                else:
+                    plages[index_lignes[nom_ligne]] = float(valeur)
+        elif section == "BOUNDS":
+            genre = mots[0].upper()
+            if genre in ("FR", "MI", "PL", "BV"):
+                nom, valeur = (mots[2] if len(mots) >= 3 else mots[1]), None
+            else:
+                nom, valeur = (mots[2], mots[3]) if len(mots) >= 4 else (mots[1], mots[2])
+            bornes_differees.append((genre, nom, None if valeur is None else _nombre(valeur)))
+
+    # Plages : « R » ajoute la contrainte complémentaire
+    if plages:
+        noms = {j: nom for nom, j in acc.colonnes.items()}
+        termes_plages = {i: {} for i in plages}
+        for i, j, valeur in zip(acc.lignes, acc.indices, acc.valeurs):
+            if i in termes_plages:
+                termes_plages[i][noms[j]] = termes_plages[i].get(noms[j], 0.0) + valeur
+        for i, r in plages.items():
+            op, rhs = acc.operateurs[i], acc.b[i]
+            if op == '<=':
+                acc.nouvelle_ligne(termes_plages[i], '>=', rhs - abs(r))
+            elif op == '>=':
+                acc.nouvelle_ligne(termes_plages[i], '<=', rhs + abs(r))
+            else:
+                acc.operateurs[i] = '>=' if r > 0 else '<='
+                acc.nouvelle_ligne(termes_plages[i], '<=' if r > 0 else '>=', rhs + r)
+
+    for genre, nom, valeur in bornes_differees:
+        if genre in ("FR", "MI"):
+            acc.borne(nom, '>=', -INFINI)
+        elif genre in ("LO", "LI"):
+            acc.borne(nom, '>=', valeur)
+        elif genre in ("UP", "UI", "SC"):
+            acc.borne(nom, '<=', valeur)
+        elif genre == "FX":
+            acc.borne(nom, '==', valeur)
+        elif genre == "BV":
+            acc.entiers.add(nom)
+            acc.borne(nom, '<=', 1.0)
+        if genre in ("LI", "UI"):
+            acc.entiers.add(nom)
+
+    avertissements = []
+    if autres_n:
+        avertissements.append(f"{len(autres_n)} ligne(s) N supplémentaire(s) ignorée(s).")
+    return acc.modele(sens), avertissements
+
+
+# ==============================
+# Lecture CPLEX-LP
+# ==============================
+def _jetons_lp(texte):
+    return [(m.lastgroup, m.group()) for m in _JETON_LP.finditer(texte)]
+
+
+def lire_lp(lignes):
+    """Lit un flux de lignes au format CPLEX-LP ; renvoie (ModeleLineaire, avertissements)."""
+    acc = _Accumulateur()
+    section, sens = None, "min"
+    termes, coeff, signe, op = {}, None, 1.0, None
+
+    def reinitialiser():
+        nonlocal termes, coeff, signe, op
+        termes, coeff, signe, op = {}, None, 1.0, None
+
+    for ligne in lignes:
+        ligne = ligne.split('\\', 1)[0].strip()
+        if not ligne:
+            continue
+        cle = re.sub(r'\s+', ' ', ligne.lower())
+        if cle in _SECTIONS_LP:
+            section = _SECTIONS_LP[cle]
+            if section in ("max", "min"):
+                sens = section
+            reinitialiser()
+            if section == "end":
+                break
+            continue
+        entete = _ENTETE_LP.match(ligne)
+        if entete:
+            section = _SECTIONS_LP[re.sub(r'\s+', ' ', entete.group(1).lower())]
+            if section in ("max", "min"):
+                sens = section
+            reinitialiser()
+            ligne = entete.group(2)
+
+        jetons = _jetons_lp(ligne)
+        if section in ("int", "bin"):
+            for genre, valeur in jetons:
+                if genre == "nom":
+                    acc.entiers.add(valeur)
+                    acc.colonne(valeur)
+                    if section == "bin":
+                        acc.borne(valeur, '<=', 1.0)
+            continue
+
+        if section == "bounds":
+            _borne_lp(acc, jetons)
+            continue
+
+        if section not in ("max", "min", "st"):
+            continue
+
+        for k, (genre, valeur) in enumerate(jetons):
+            if genre == "nom" and k + 1 < len(jetons) and jetons[k + 1][0] == "deux_points":
+                continue
+            if genre == "deux_points":
+                continue
+            if genre == "signe":
+                signe *= -1.0 if valeur == '-' else 1.0
+            elif genre == "op":
+                op = {'<': '<=', '=<': '<=', '>': '>=', '=>': '>=', '=': '=='}.get(valeur, valeur)
+                signe = 1.0
+            elif genre == "nombre":
+                if op is None:
+                    coeff = signe * _nombre(valeur)
+                    signe = 1.0
+                elif section == "st":
+                    rhs = signe * _nombre(valeur)
+                    if abs(rhs) < INFINI:
+                        acc.nouvelle_ligne(termes, op, rhs)
+                    reinitialiser()
+            elif genre == "nom":
+                valeur_terme = (1.0 if coeff is None else coeff) * signe
+                if section == "st":
+                    termes[valeur] = termes.get(valeur, 0.0) + valeur_terme
+                else:
+                    j = acc.colonne(valeur)
+                    acc.c[j] = acc.c.get(j, 0.0) + valeur_terme
+                coeff, signe = None, 1.0
+
+    return acc.modele(sens), []
+
+
+def _borne_lp(acc, jetons):
+    """Une ligne de la section Bounds : « x <= 4 », « 0 <= x <= 4 », « x free »..."""
+    elements, signe = [], 1.0
+    for genre, valeur in jetons:
+        if genre == "signe":
+            signe = -1.0 if valeur == '-' else 1.0
+        elif genre == "nombre":
+            elements.append(("nombre", signe * _nombre(valeur)))
+            signe = 1.0
+        elif genre == "op":
+            elements.append(("op", {'<': '<=', '=<': '<=', '>': '>=', '=>': '>=', '=': '=='}
+                             .get(valeur, valeur)))
+        elif genre == "nom":
+            elements.append(("nom", valeur))
+
+    formes = [genre for genre, _ in elements]
+    v = [valeur for _, valeur in elements]
+    if formes == ["nom", "nom"] and str(v[1]).lower() == "free":
+        acc.borne(v[0], '>=', -INFINI)
+    elif formes == ["nom", "op", "nombre"]:
+        acc.borne(v[0], v[1], v[2])
+    elif formes == ["nombre", "op", "nom"]:
+        acc.borne(v[2], _INVERSE[v[1]], v[0])
+    elif formes == ["nombre", "op", "nom", "op", "nombre"]:
+        acc.borne(v[2], _INVERSE[v[1]], v[0])
+        acc.borne(v[2], v[3], v[4])
+    else:
+        raise ValueError("Borne LP illisible : " + " ".join(str(x) for x in v))
+
+
+def lire_modele(flux, nom):
+    """Choisit le lecteur d'après l'extension (.mps ou .lp)."""
+    if nom.lower().endswith(".lp"):
+        return lire_lp(flux)
+    return lire_mps(flux)
+
+
+# ==============================
+# Écriture
+# ==============================
+def _f(valeur):
+    return f"{valeur:.17g}"
+
+
+def _noms_lignes(modele):
+    return [f"C{i + 1}" for i in range(modele.n_contraintes)]
+
+
+def ecrire_mps(modele, flux, nom="MODELE"):
+    """Écrit le modèle au format MPS libre, colonne par colonne."""
+    lignes = _noms_lignes(modele)
+    A = modele.A.tocsc()
+    flux.write(f"NAME          {nom}\n")
+    flux.write(f"OBJSENSE\n    {'MAX' if modele.sens == 'max' else 'MIN'}\n")
+    flux.write("ROWS\n N  OBJ\n")
+    for nom_ligne, op in zip(lignes, modele.operateurs):
+        flux.write(f" {'L' if op == '<=' else 'G' if op == '>=' else 'E'}  {nom_ligne}\n")
+
+    flux.write("COLUMNS\n")
+    entieres = modele.entieres if modele.mip else np.zeros(modele.n_variables, dtype=bool)
+    marqueur = False
+    for j, var in enumerate(modele.variables):
+        if entieres[j] != marqueur:
+            marqueur = bool(entieres[j])
+            flux.write(f"    MARKER  'MARKER'  '{'INTORG' if marqueur else 'INTEND'}'\n")
+        ecrit = False
+        if modele.c[j] != 0:
+            flux.write(f"    {var}  OBJ  {_f(modele.c[j])}\n")
+            ecrit = True
+        for i, valeur in zip(A.indices[A.indptr[j]:A.indptr[j + 1]],
+                             A.data[A.indptr[j]:A.indptr[j + 1]]):
+            flux.write(f"    {var}  {lignes[i]}  {_f(valeur)}\n")
+            ecrit = True
+        if not ecrit:
+            flux.write(f"    {var}  OBJ  0\n")
+    if marqueur:
+        flux.write("    MARKER  'MARKER'  'INTEND'\n")
+
+    flux.write("RHS\n")
+    for nom_ligne, valeur in zip(lignes, modele.b):
+        if valeur != 0:
+            flux.write(f"    RHS  {nom_ligne}  {_f(valeur)}\n")
+    flux.write("ENDATA\n")
+
+
+def _expression_lp(noms, valeurs, par_ligne=8):
+    morceaux = []
+    for k, (nom, valeur) in enumerate(zip(noms, valeurs)):
+        signe = '-' if valeur < 0 else '+'
+        morceaux.append(f"{signe} {_f(abs(valeur))} {nom}")
+        if (k + 1) % par_ligne == 0:
+            morceaux.append("\n   ")
+    texte = " ".join(morceaux)
+    return texte[2:] if texte.startswith('+ ') else texte
+
+
+def ecrire_lp(modele, flux):
+    """Écrit le modèle au format CPLEX-LP, ligne par ligne."""
+    variables = modele.variables
+    flux.write("\\ Modèle exporté depuis le solveur de programmation linéaire\n")
+    flux.write("Maximize\n" if modele.sens == "max" else "Minimize\n")
+    non_nuls = np.flatnonzero(modele.c)
+    if len(non_nuls) or not variables:
+        flux.write(" obj: " + _expression_lp([variables[j] for j in non_nuls], modele.c[non_nuls]) + "\n")
+    else:
+        flux.write(f" obj: 0 {variables[0]}\n")
+
+    flux.write("Subject To\n")
+    A = modele.A.tocsr()
+    for i, nom_ligne in enumerate(_noms_lignes(modele)):
+        debut, fin = A.indptr[i], A.indptr[i + 1]
+        if debut == fin:
+            if not variables:
+                continue
+            expression = f"0 {variables[0]}"
+        else:
+            expression = _expression_lp([variables[j] for j in A.indices[debut:fin]],
+                                        A.data[debut:fin])
+        op = '=' if modele.operateurs[i] == '==' else modele.operateurs[i]
+        flux.write(f" {nom_ligne}: {expression} {op} {_f(modele.b[i])}\n")
+    if modele.mip:
+        flux.write("General\n")
+        entieres = [variables[j] for j in np.flatnonzero(modele.entieres)]
+        for k in range(0, len(entieres), 8):
+            flux.write(" " + " ".join(entieres[k:k + 8]) + "\n")
+    flux.write("End\n")
+
+
+def exporter(modele, ecrivain):
+    """Renvoie le texte produit par `ecrivain` (ecrire_mps ou ecrire_lp)."""
+    flux = io.StringIO()
+    ecrivain(modele, flux)
+    return flux.getvalue()
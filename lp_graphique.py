@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Représentation graphique d'un programme linéaire à deux variables.
+
+La zone réalisable est calculée une seule fois par intersection de
+demi-plans (lp_sommets) et dessinée comme un unique polygone ; chaque
+contrainte est tracée comme une droite, verticales comprises, et les axes
+s'ajustent aux sommets de la zone. Une variante Vega-Lite, rendue par le
+navigateur, sert aux mises à jour en direct (curseurs « et si »).
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.patches import Polygon
+
+from lp_sommets import TOLERANCE, cadre_affichage, demi_plans, polygone_realisable, sommets
+
+
+def tracer_zone_realisable(ax, modele, libelles, solution=None, couleur_zone="lightgreen",
+                           surlignees=()):
+    """Trace contraintes, zone réalisable et solution (x, y) sur `ax`.
+
+    `libelles` donne la légende de chaque ligne du modèle ; les lignes
+    `surlignees` (conflit d'un problème irréalisable) ressortent en rouge,
+    les autres s'estompent. Renvoie les sommets du polygone dessiné (vide
+    si le problème est irréalisable).
+    """
+    G, h = demi_plans(modele)
+    X, Y = cadre_affichage(sommets(G, h), solution)
+    polygone = polygone_realisable(G, h, (X, Y))
+
+    A = modele.A.toarray()
+    couleurs = plt.cm.tab10(np.arange(len(A)) % 10)
+    for i, ((a, b), rhs, libelle, couleur) in enumerate(zip(A, modele.b, libelles, couleurs)):
+        style = dict(label=libelle, linewidth=2, color=couleur)
+        if i in surlignees:
+            style.update(label=f"⚠ {libelle}", linewidth=3.5, color="red", linestyle="--")
+        elif len(surlignees):
+            style.update(alpha=0.35)
+        if abs(b) > TOLERANCE:
+            ax.plot([0, X], [rhs / b, (rhs - a * X) / b], **style)
+        elif abs(a) > TOLERANCE:
+            ax.axvline(rhs / a, **style)
+
+    if len(polygone):
+        ax.add_patch(Polygon(polygone, closed=True, facecolor=couleur_zone, edgecolor="darkgreen",
+                             alpha=0.4, label="Zone réalisable"))
+
+    if solution is not None and None not in solution:
+        x, y = solution
+        ax.plot(x, y, 'ro', markersize=10, label=f'Solution ({x:.2f}, {y:.2f})')
+
+    ax.set_xlim(0, X)
+    ax.set_ylim(0, Y)
+    return polygone
+
+
+def _bande(polygone):
+    """Polygone convexe -> (x, y bas, y haut) aux abscisses de ses sommets."""
+    xs = np.unique(polygone[:, 0])
+    p, q = polygone, np.roll(polygone, -1, axis=0)
+    bas, haut = np.full(len(xs), np.inf), np.full(len(xs), -np.inf)
+    for (x1, y1), (x2, y2) in zip(p, q):
+        dedans = (xs >= min(x1, x2) - TOLERANCE) & (xs <= max(x1, x2) + TOLERANCE)
+        if abs(x2 - x1) <= TOLERANCE:
+            ys_min, ys_max = np.full(len(xs), min(y1, y2)), np.full(len(xs), max(y1, y2))
+        else:
+            ys_min = ys_max = y1 + (xs - x1) * (y2 - y1) / (x2 - x1)
+        bas = np.where(dedans, np.minimum(bas, ys_min), bas)
+        haut = np.where(dedans, np.maximum(haut, ys_max), haut)
+    return xs, bas, haut
+
+
+def spec_vega_lite(modele, libelles, solution=None, cadre=None):
+    """Même figure que tracer_zone_realisable, en spécification Vega-Lite.
+
+    Rendue par le navigateur (st.vega_lite_chart) : le serveur ne fait que
+    construire ce dictionnaire, ce qui convient aux mises à jour en direct.
+    `cadre` (X, Y) fige les axes d'une mise à jour à l'autre.
+    """
+    G, h = demi_plans(modele)
+    X, Y = cadre or cadre_affichage(sommets(G, h), solution)
+    polygone = polygone_realisable(G, h, (X, Y))
+    x_nom, y_nom = modele.variables
+
+    def axe(champ, titre, borne):
+        return {"field": champ, "type": "quantitative", "title": titre,
+                "scale": {"domain": [0, float(borne)], "nice": False}}
+
+    couches = []
+    if len(polygone):
+        xs, bas, haut = _bande(polygone)
+        couches.append({
+            "data": {"values": [{"x": float(x), "bas": float(y1), "haut": float(y2)}
+                                for x, y1, y2 in zip(xs, bas, haut)]},
+            "mark": {"type": "area", "color": "lightgreen", "opacity": 0.5},
+            "encoding": {"x": axe("x", x_nom, X), "y": axe("bas", y_nom, Y), "y2": {"field": "haut"}},
+        })
+
+    segments = []
+    for (a, b), rhs, libelle in zip(modele.A.toarray(), modele.b, libelles):
+        if abs(b) > TOLERANCE:
+            segments += [(libelle, 0.0, rhs / b), (libelle, X, (rhs - a * X) / b)]
+        elif abs(a) > TOLERANCE:
+            segments += [(libelle, rhs / a, 0.0), (libelle, rhs / a, Y)]
+    if segments:
+        couches.append({
+            "data": {"values": [{"contrainte": l, "x": float(x), "y": float(y)} for l, x, y in segments]},
+            "mark": {"type": "line", "strokeWidth": 2, "clip": True},
+            "encoding": {"x": axe("x", x_nom, X), "y": axe("y", y_nom, Y),
+                         "color": {"field": "contrainte", "type": "nominal", "title": "Contraintes"}},
+        })
+
+    if solution is not None and None not in solution:
+        couches.append({
+            "data": {"values": [{"x": float(solution[0]), "y": float(solution[1])}]},
+            "mark": {"type": "point", "color": "red", "filled": True, "size": 150},
+            "encoding": {"x": axe("x", x_nom, X), "y": axe("y", y_nom, Y),
+                         "tooltip": [{"field": "x", "type": "quantitative", "title": x_nom, "format": ".4g"},
+                                     {"field": "y", "type": "quantitative", "title": y_nom, "format": ".4g"}]},
+        })
+    return {"height": 420, "layer": couches}
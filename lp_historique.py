@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Historique persistant des résolutions (SQLite).
+
+Chaque résolution effective passée par resoudre_en_cache (lp_cache) est
+enregistrée : problème sous forme canonique (empreinte SHA-1 et texte
+CPLEX-LP, une seule fois par problème), solveur, statut, solution et
+durées. Un index sur (empreinte, solveur) rend le rappel d'une solution
+déjà calculée immédiat, y compris après redémarrage du serveur ; la table
+des résolutions sert aussi aux statistiques de temps de calcul de tout le
+déploiement. Chemin du fichier : variable d'environnement LP_HISTORIQUE.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from lp_core import Resultat
+from lp_formats import ecrire_lp, exporter
+
+CHEMIN = os.environ.get("LP_HISTORIQUE", str(Path(__file__).with_name("historique_lp.sqlite")))
+RECENTS = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS problemes (
+    cle           TEXT PRIMARY KEY,
+    sens          TEXT NOT NULL,
+    n_variables   INTEGER NOT NULL,
+    n_contraintes INTEGER NOT NULL,
+    texte         TEXT NOT NULL,
+    date          REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS resolutions (
+    id           INTEGER PRIMARY KEY,
+    cle          TEXT NOT NULL REFERENCES problemes (cle),
+    solveur      TEXT NOT NULL,
+    methode      TEXT NOT NULL,
+    statut       TEXT NOT NULL,
+    objectif     REAL,
+    valeurs      TEXT NOT NULL,
+    temps        REAL NOT NULL,
+    construction REAL NOT NULL,
+    borne        REAL,
+    ecart        REAL,
+    rappels      INTEGER NOT NULL DEFAULT 0,
+    date         REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resolutions_cle ON resolutions (cle, solveur, date);
+"""
+
+
+class Historique:
+    """Connexion SQLite partagée par les sessions, protégée par un verrou."""
+
+    def __init__(self, chemin=CHEMIN):
+        self.chemin = chemin
+        self._connexion = sqlite3.connect(chemin, check_same_thread=False)
+        self._verrou = threading.Lock()
+        with self._verrou, self._connexion:
+            # WAL : plusieurs processus (serveurs, lots) peuvent lire pendant une écriture
+            self._connexion.execute("PRAGMA journal_mode=WAL")
+            self._connexion.executescript(_SCHEMA)
+
+    def retrouver(self, cle, solveur):
+        """Dernière résolution aboutie de (cle, solveur), ou None."""
+        with self._verrou, self._connexion:
+            ligne = self._connexion.execute(
+                "SELECT id, statut, valeurs, objectif, temps, methode, construction, borne, ecart "
+                "FROM resolutions WHERE cle = ? AND solveur = ? AND statut != 'Not Solved' "
+                "ORDER BY date DESC LIMIT 1", (cle, solveur)).fetchone()
+            if ligne is None:
+                return None
+            self._connexion.execute("UPDATE resolutions SET rappels = rappels + 1 WHERE id = ?",
+                                    (ligne[0],))
+        statut, valeurs, *reste = ligne[1:]
+        return Resultat(statut, json.loads(valeurs), *reste)
+
+    def enregistrer(self, cle, solveur, modele, resultat):
+        """Ajoute une résolution ; le problème n'est écrit qu'à sa première apparition."""
+        maintenant = time.time()
+        with self._verrou, self._connexion:
+            if self._connexion.execute("SELECT 1 FROM problemes WHERE cle = ?", (cle,)).fetchone() is None:
+                self._connexion.execute(
+                    "INSERT INTO problemes VALUES (?, ?, ?, ?, ?, ?)",
+                    (cle, modele.sens, modele.n_variables, modele.n_contraintes,
+                     exporter(modele, ecrire_lp), maintenant))
+            self._connexion.execute(
+                "INSERT INTO resolutions (cle, solveur, methode, statut, objectif, valeurs, temps, "
+                "construction, borne, ecart, date) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (cle, solveur, resultat.methode, resultat.statut, resultat.objectif,
+                 json.dumps(resultat.valeurs), resultat.temps, resultat.construction,
+                 resultat.borne, resultat.ecart, maintenant))
+
+    def _requete(self, sql, parametres=()):
+        with self._verrou:
+            return pd.read_sql_query(sql, self._connexion, params=parametres)
+
+    def statistiques(self):
+        """Temps de résolution agrégés par méthode, sur toutes les sessions."""
+        return self._requete(
+            "SELECT methode AS \"Méthode\", COUNT(*) AS \"Résolutions\", "
+            "SUM(rappels) AS \"Rappels\", AVG(temps) * 1000 AS \"Moyenne (ms)\", "
+            "MIN(temps) * 1000 AS \"Min (ms)\", MAX(temps) * 1000 AS \"Max (ms)\", "
+            "SUM(temps) AS \"Total (s)\", SUM(rappels * temps) AS \"Économisé (s)\" "
+            "FROM resolutions GROUP BY methode ORDER BY COUNT(*) DESC")
+
+    def recents(self, limite=RECENTS):
+        """Dernières résolutions, problème compris (texte CPLEX-LP)."""
+        return self._requete(
+            "SELECT r.id, r.date, r.methode, r.statut, r.objectif, r.valeurs, r.temps, r.rappels, "
+            "p.sens, p.n_variables, p.n_contraintes, p.texte "
+            "FROM resolutions AS r JOIN problemes AS p USING (cle) "
+            "ORDER BY r.date DESC LIMIT ?", (limite,))
+
+    def vider(self):
+        with self._verrou, self._connexion:
+            self._connexion.execute("DELETE FROM resolutions")
+            self._connexion.execute("DELETE FROM problemes")
+
+
+@st.cache_resource
+def historique_partage(chemin=CHEMIN):
+    """Instance unique pour tout le processus ; None si la base est inaccessible."""
+    try:
+        return Historique(chemin)
+    except sqlite3.Error:
+        return None
+
+
+# ==============================
+# Panneau d'historique
+# ==============================
+def _libelle(ligne):
+    date = time.strftime("%d/%m %H:%M", time.localtime(ligne.date))
+    z = "" if pd.isna(ligne.objectif) else f" • z = {ligne.objectif:.6g}"
+    return (f"{date} • {ligne.sens} {ligne.n_variables}×{ligne.n_contraintes} • "
+            f"{ligne.statut}{z} ({ligne.methode})")
+
+
+def afficher_historique(zone=st.sidebar, historique=None):
+    """Statistiques globales et rappel d'une résolution passée, sans la refaire."""
+    historique = historique if historique is not None else historique_partage()
+    if historique is None:
+        return
+    with zone.expander("🕘 Historique des résolutions"):
+        statistiques = historique.statistiques()
+        if statistiques.empty:
+            st.caption("Aucune résolution enregistrée.")
+            return
+        col1, col2 = st.columns(2)
+        col1.metric("Résolutions", int(statistiques["Résolutions"].sum()))
+        col2.metric("Rappels", int(statistiques["Rappels"].sum()))
+        st.dataframe(statistiques.round(3), hide_index=True)
+
+        recents = historique.recents()
+        choix = st.selectbox("Rappeler une résolution", range(len(recents)), index=None,
+                             format_func=lambda i: _libelle(recents.iloc[i]),
+                             placeholder="Choisir une résolution passée")
+        if choix is None:
+            return
+        ligne = recents.iloc[choix]
+        st.code(ligne.texte, language=None)
+        valeurs = json.loads(ligne.valeurs)
+        if valeurs:
+            st.dataframe(pd.DataFrame({"Variable": list(valeurs), "Valeur": list(valeurs.values())}),
+                         hide_index=True)
+        st.caption(f"Statut : {ligne.statut} • calculée en {ligne.temps * 1000:.2f} ms "
+                   f"par {ligne.methode} • rappelée {ligne.rappels} fois")
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Sous-système irréductible irréalisable (IIS) d'un programme linéaire.
+
+Deux filtres, dont les résolutions d'essai (objectif nul : simple test de
+réalisabilité) partent en parallèle dans un pool de processus :
+- filtre additif : le plus court préfixe de contraintes déjà irréalisable,
+  cherché par dichotomie à plusieurs points à la fois ;
+- filtre de suppression : chaque contrainte du préfixe est retirée à
+  l'essai ; si le reste devient réalisable, elle est indispensable (pour
+  de bon), sinon elle peut être écartée.
+Les bornes x >= 0 sont toujours conservées.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+
+import numpy as np
+import streamlit as st
+
+from lp_solveurs import resoudre_highs
+
+# En dessous, le démarrage du pool coûte plus que les essais eux-mêmes
+SEUIL_PARALLELE = 50
+
+_MODELE = None
+_SOLVEUR = resoudre_highs
+
+
+@dataclass
+class Iis:
+    """Lignes du modèle formant un sous-système irréalisable minimal."""
+    lignes: list
+    essais: int = 0
+    temps: float = 0.0
+
+
+def sous_modele(modele, lignes):
+    """Modèle réduit aux `lignes`, sans fonction économique."""
+    lignes = np.asarray(lignes, dtype=int)
+    return replace(modele, c=np.zeros(modele.n_variables), A=modele.A[lignes], b=modele.b[lignes],
+                   operateurs=[modele.operateurs[i] for i in lignes])
+
+
+def _initialiser(modele, solveur):
+    global _MODELE, _SOLVEUR
+    _MODELE, _SOLVEUR = modele, solveur
+
+
+def _irrealisable(lignes):
+    return _SOLVEUR(sous_modele(_MODELE, lignes)).statut == "Infeasible"
+
+
+class _EnLigne:
+    """Remplaçant séquentiel du pool (un seul processus : pas de coût de démarrage)."""
+
+    def map(self, fonction, *iterables):
+        return map(fonction, *iterables)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def trouver_iis(modele, solveur=resoudre_highs, processus=None):
+    """Renvoie l'Iis d'un modèle irréalisable, ou None s'il est réalisable.
+
+    `solveur` doit être une fonction de module (transmise aux processus).
+    Par défaut, un processus par cœur au-delà de SEUIL_PARALLELE contraintes.
+    """
+    debut = time.perf_counter()
+    if processus is None:
+        processus = 1 if modele.n_contraintes < SEUIL_PARALLELE else os.cpu_count() or 1
+    _initialiser(modele, solveur)
+    pool = _EnLigne() if processus == 1 else ProcessPoolExecutor(
+        max_workers=processus, initializer=_initialiser, initargs=(modele, solveur))
+    essais = 0
+    with pool:
+        # Filtre additif : plus petit k tel que les k premières lignes soient irréalisables
+        bas, haut = 0, modele.n_contraintes
+        if not _irrealisable(range(haut)):
+            return None
+        while haut - bas > 1:
+            points = np.unique(np.linspace(bas, haut, processus + 2, dtype=int)[1:-1])
+            points = points[(points > bas) & (points < haut)]
+            reponses = list(pool.map(_irrealisable, [range(k) for k in points]))
+            essais += len(points)
+            irrealisables = points[np.array(reponses, dtype=bool)]
+            realisables = points[~np.array(reponses, dtype=bool)]
+            haut = irrealisables.min() if irrealisables.size else haut
+            bas = realisables[realisables < haut].max(initial=bas)
+
+        # Filtre de suppression, par lots de `processus` essais
+        lignes, indispensables = list(range(haut)), {haut - 1}
+        while True:
+            candidates = [i for i in lignes if i not in indispensables][:processus]
+            if not candidates:
+                break
+            reponses = list(pool.map(_irrealisable, [[l for l in lignes if l != i] for i in candidates]))
+            essais += len(candidates)
+            indispensables.update(i for i, r in zip(candidates, reponses) if not r)
+            retirables = [i for i, r in zip(candidates, reponses) if r]
+            if not retirables:
+                continue
+            # Retrait groupé s'il laisse le système irréalisable, sinon une à une
+            reste = [l for l in lignes if l not in retirables]
+            if len(retirables) > 1:
+                essais += 1
+                if _irrealisable(reste):
+                    lignes = reste
+                    continue
+            lignes.remove(retirables[0])
+    return Iis(lignes, essais, time.perf_counter() - debut)
+
+
+def afficher_iis(iis, libelles=None):
+    """Liste les contraintes du conflit ; `libelles` nomme les lignes du modèle."""
+    if iis is None:
+        return
+    st.error("🚫 Contraintes incompatibles (sous-système irréductible) :")
+    for i in iis.lignes:
+        nom = libelles[i] if libelles is not None and i < len(libelles) else f"C{i + 1}"
+        st.markdown(f"- **{i + 1}.** `{nom}`")
+    st.caption(f"Retirer l'une d'elles rend ce sous-système réalisable • "
+               f"{iis.essais} résolutions d'essai en {iis.temps * 1000:.1f} ms")
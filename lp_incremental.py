@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Re-résolution incrémentale d'un programme linéaire saisi contrainte par contrainte.
+
+Une instance, gardée dans st.session_state, retient les dernières entrées,
+le modèle construit et la base optimale. À la saisie suivante, seules les
+lignes modifiées sont ré-analysées et remplacées dans la matrice ; le
+simplexe repart ensuite de l'ancienne base quand elle reste réalisable.
+"""
+
+import time
+from dataclasses import replace
+
+import numpy as np
+
+from lp_core import Resultat, analyse_lineaire, analyse_syntaxique, construire_modele
+from lp_simplexe import simplexe_a_chaud
+
+
+def _variables(expression):
+    return {var for _, var in analyse_syntaxique(expression)}
+
+
+class ResolutionIncrementale:
+    """Modèle et base de la dernière résolution d'une session.
+
+    S'utilise comme un solveur (instance(modele) -> Resultat). Après chaque
+    appel, `lignes_modifiees` et `a_chaud` décrivent le travail évité.
+    """
+
+    def __init__(self):
+        self.entrees = None
+        self.modele = None
+        self.base = None
+        self.variables_lignes = []
+        self.lignes_modifiees = None    # None : modèle reconstruit en entier
+        self.a_chaud = False
+
+    def modele_pour(self, sens, expression, contraintes):
+        """Modèle des nouvelles entrées, en ne remplaçant que les lignes modifiées."""
+        contraintes = [(lhs, '==' if op == '=' else op, float(rhs)) for lhs, op, rhs in contraintes]
+        precedent = self.entrees
+        if precedent is not None and len(precedent[2]) == len(contraintes):
+            modifiees = [i for i, (ancienne, nouvelle) in enumerate(zip(precedent[2], contraintes))
+                         if ancienne != nouvelle]
+            modele = self._mettre_a_jour(sens, expression, contraintes, modifiees)
+            if modele is not None:
+                self.modele, self.lignes_modifiees = modele, modifiees
+                self.entrees = (sens, expression, contraintes)
+                return modele
+
+        # Entrées retenues seulement si l'analyse aboutit (ErreurSyntaxe sinon)
+        self.modele = construire_modele(sens, expression, contraintes)
+        self.variables_lignes = [_variables(lhs) for lhs, _, _ in contraintes]
+        self.lignes_modifiees = None
+        self.entrees = (sens, expression, contraintes)
+        return self.modele
+
+    def _mettre_a_jour(self, sens, expression, contraintes, modifiees):
+        """Remplace les lignes `modifiees` ; None si l'ensemble des variables change."""
+        variables_lignes = list(self.variables_lignes)
+        for i in modifiees:
+            variables_lignes[i] = _variables(contraintes[i][0])
+        if set().union(_variables(expression), *variables_lignes) != set(self.modele.variables):
+            return None
+
+        modele = construire_modele(sens, expression, [])
+        index = {var: j for j, var in enumerate(self.modele.variables)}
+        c = np.zeros(len(index))
+        for var, coeff in zip(modele.variables, modele.c):
+            c[index[var]] = coeff
+
+        A, b = self.modele.A, self.modele.b
+        operateurs = list(self.modele.operateurs)
+        if modifiees:
+            A, b = A.tolil(), b.copy()
+            for i in modifiees:
+                lhs, op, rhs = contraintes[i]
+                A[i, :] = 0.0
+                gauche = analyse_lineaire(lhs)
+                for coeff, var in gauche.termes:
+                    A[i, index[var]] += coeff
+                b[i], operateurs[i] = rhs - gauche.constante, op
+            A = A.tocsr()
+            A.eliminate_zeros()
+        self.variables_lignes = variables_lignes
+        return replace(self.modele, sens=sens, c=c, A=A, b=b, operateurs=operateurs)
+
+    def __call__(self, modele):
+        debut = time.perf_counter()
+        statut, x, _, base, self.a_chaud = simplexe_a_chaud(modele, self.base)
+        self.base = base
+        temps = time.perf_counter() - debut
+        methode = "Simplexe NumPy (à chaud)" if self.a_chaud else "Simplexe NumPy"
+        if x is None:
+            return Resultat(statut, dict.fromkeys(modele.variables), None, temps, methode=methode)
+        valeurs = {var: float(v) + 0.0 for var, v in zip(modele.variables, x)}
+        return Resultat(statut, valeurs, float(modele.c @ x), temps, methode=methode)
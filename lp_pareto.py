@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Front de Pareto d'un programme linéaire à plusieurs fonctions économiques.
+
+Deux méthodes :
+- somme pondérée : une seule fonction Σ wᵢ fᵢ / étendueᵢ, les poids
+  parcourant le simplexe (points supportés du front) ;
+- epsilon-contrainte : la première fonction est optimisée, les autres
+  deviennent des contraintes fⱼ >= εⱼ (en maximisation), ε parcourant
+  l'intervalle entre point nadir et point idéal.
+Le modèle (lignes ε comprises) est compilé une seule fois et envoyé une
+fois à chaque processus du pool ; chaque point ne transporte que ses poids
+ou ses ε. Les points sont produits dans l'ordre d'achèvement, pour tracer
+le front au fur et à mesure.
+"""
+
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, replace
+
+import numpy as np
+import scipy.sparse as sp
+
+from lp_core import analyse_lineaire, analyse_objectif
+from lp_solveurs import resoudre_highs
+
+METHODES = ("Somme pondérée", "Epsilon-contrainte")
+# Petit terme des fonctions contraintes ajouté à l'objectif (epsilon-contrainte
+# augmentée) : écarte les points seulement faiblement efficaces
+AUGMENTATION = 1e-4
+
+_MODELE = None
+_G = None
+_ETENDUES = None
+_METHODE = None
+_SOLVEUR = resoudre_highs
+
+
+@dataclass
+class PointPareto:
+    """Résolution d'un point du front : `objectifs` dans le sens de chaque fonction."""
+    numero: int
+    parametre: tuple
+    statut: str
+    objectifs: tuple = None
+    valeurs: dict = None
+
+
+def lire_objectifs(modele, textes):
+    """Lignes « max 3x + y » / « min x » -> liste de (sens, vecteur de coûts).
+
+    La fonction du modèle vient en premier ; chaque ligne supplémentaire
+    doit n'employer que des variables du modèle.
+    """
+    index = {var: j for j, var in enumerate(modele.variables)}
+    objectifs = [(modele.sens, modele.c)]
+    for texte in textes:
+        if not texte.strip():
+            continue
+        sens, expression = analyse_objectif(texte)
+        c = np.zeros(modele.n_variables)
+        expression = analyse_lineaire(expression)
+        if expression.constante:
+            raise ValueError(f"Constante dans la fonction « {texte.strip()} » : retirez-la.")
+        for coeff, var in expression.termes:
+            if var not in index:
+                raise ValueError(f"Variable absente du modèle : {var}")
+            c[index[var]] += coeff
+        objectifs.append((sens, c))
+    return objectifs
+
+
+def matrice_max(objectifs):
+    """Fonctions économiques en lignes, toutes ramenées à la maximisation."""
+    return np.array([c if sens == "max" else -c for sens, c in objectifs], dtype=float)
+
+
+def poids_simplexe(k, n_points):
+    """Grille régulière du simplexe de dimension k, d'au plus `n_points` poids (au moins k)."""
+    if k == 1:
+        return [(1.0,)]
+    divisions = 1
+    while math.comb(divisions + k, k - 1) <= n_points:
+        divisions += 1
+    # Chaque placement de k-1 barres parmi divisions+k-1 cases découpe les divisions en k parts
+    return [tuple(float(p) for p in (np.diff([-1, *barres, divisions + k - 1]) - 1) / divisions)
+            for barres in itertools.combinations(range(divisions + k - 1), k - 1)]
+
+
+def non_domines(points):
+    """Masque des points non dominés (tous les critères à maximiser)."""
+    points = np.asarray(points, dtype=float)
+    if points.size == 0:
+        return np.zeros(0, dtype=bool)
+    tolerance = 1e-9 * (1 + np.abs(points).max())
+    au_moins = np.all(points[None, :, :] >= points[:, None, :] - tolerance, axis=2)
+    mieux = np.any(points[None, :, :] > points[:, None, :] + tolerance, axis=2)
+    return ~np.any(au_moins & mieux, axis=1)
+
+
+def table_gains(modele, G, solveur=resoudre_highs):
+    """Optimum de chaque fonction seule : renvoie (idéal, nadir) en maximisation.
+
+    Le nadir est estimé par le pire score de chaque fonction aux optimums des
+    autres (table des gains). ValueError si une fonction n'a pas d'optimum fini.
+    """
+    gains = np.empty((len(G), len(G)))
+    for i, g in enumerate(G):
+        resultat = solveur(replace(modele, sens="max", c=g))
+        if resultat.statut != "Optimal":
+            raise ValueError(f"Fonction {i + 1} seule : statut {resultat.statut}, "
+                             "pas de front de Pareto borné.")
+        x = np.array([resultat.valeurs[var] for var in modele.variables])
+        gains[i] = G @ x
+    return gains.max(axis=0), gains.min(axis=0)
+
+
+def modele_compile(modele, G, methode):
+    """Modèle commun à tous les points ; la méthode epsilon y ajoute une ligne par fₖ, k >= 1."""
+    if methode == "Somme pondérée" or len(G) < 2:
+        return replace(modele, sens="max")
+    return replace(modele, sens="max", A=sp.vstack([modele.A, sp.csr_matrix(G[1:])]).tocsr(),
+                   b=np.concatenate([modele.b, np.zeros(len(G) - 1)]),
+                   operateurs=list(modele.operateurs) + ['>='] * (len(G) - 1))
+
+
+def parametres(methode, ideal, nadir, n_points):
+    """Poids (somme pondérée) ou valeurs de ε (une par fonction contrainte) à parcourir."""
+    k = len(ideal)
+    if methode == "Somme pondérée":
+        return poids_simplexe(k, n_points)
+    par_axe = max(2, int(round(n_points ** (1 / max(k - 1, 1)))))
+    axes = [np.linspace(nadir[j], ideal[j], par_axe) for j in range(1, k)]
+    return [tuple(eps) for eps in itertools.product(*axes)]
+
+
+def _initialiser(modele, G, etendues, methode, solveur):
+    global _MODELE, _G, _ETENDUES, _METHODE, _SOLVEUR
+    _MODELE, _G, _ETENDUES, _METHODE, _SOLVEUR = modele, G, etendues, methode, solveur
+
+
+def _resoudre_point(numero, parametre):
+    if _METHODE == "Somme pondérée":
+        c = np.asarray(parametre) @ (_G / _ETENDUES[:, None])
+        modele = replace(_MODELE, c=c)
+    else:
+        b = _MODELE.b.copy()
+        b[len(b) - len(parametre):] = parametre
+        c = _G[0] + AUGMENTATION * _ETENDUES[0] * (_G[1:] / _ETENDUES[1:, None]).sum(axis=0)
+        modele = replace(_MODELE, c=c, b=b)
+    resultat = _SOLVEUR(modele)
+    if resultat.statut != "Optimal":
+        return PointPareto(numero, parametre, resultat.statut)
+    x = np.array([resultat.valeurs[var] for var in _MODELE.variables])
+    return PointPareto(numero, parametre, resultat.statut, tuple(_G @ x), resultat.valeurs)
+
+
+def front_pareto(modele, objectifs, methode="Somme pondérée", n_points=50, processus=None,
+                 solveur=resoudre_highs):
+    """Résout les points du front dans un pool de processus.
+
+    Générateur : produit d'abord le nombre de points prévus, puis chaque
+    PointPareto dès qu'il est résolu (ordre d'achèvement). Les objectifs
+    d'un point sont rendus dans le sens de chaque fonction (max ou min).
+    `solveur` doit être une fonction de module (transmise par pickle).
+    """
+    G = matrice_max(objectifs)
+    ideal, nadir = table_gains(modele, G, solveur)
+    etendues = np.where(ideal - nadir > 1e-9, ideal - nadir, 1.0)
+    commun = modele_compile(modele, G, methode)
+    liste = parametres(methode, ideal, nadir, n_points)
+    signes = np.array([1.0 if sens == "max" else -1.0 for sens, _ in objectifs])
+    yield len(liste)
+
+    processus = processus or max(1, min(len(liste), os.cpu_count() or 1))
+    with ProcessPoolExecutor(max_workers=processus, initializer=_initialiser,
+                             initargs=(commun, G, etendues, methode, solveur)) as pool:
+        taches = [pool.submit(_resoudre_point, i, p) for i, p in enumerate(liste)]
+        for tache in as_completed(taches):
+            point = tache.result()
+            if point.objectifs is not None:
+                point.objectifs = tuple(float(v) + 0.0 for v in signes * np.array(point.objectifs))
+            yield point
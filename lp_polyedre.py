@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Polyèdre réalisable d'un programme linéaire à trois variables.
+
+Tous les triplets de plans frontières (contraintes et plans x_j = 0) sont
+intersectés d'un seul calcul NumPy (systèmes 3×3 résolus par lots) ; on
+garde les sommets réalisables. Une zone non bornée est tronquée par une
+boîte [0, X] × [0, Y] × [0, Z] ajustée aux sommets : seuls les triplets
+touchant un plan de la boîte sont alors ajoutés. Chaque face regroupe les
+sommets saturant un même plan, ordonnés autour de leur centre. Le
+polyèdre est calculé une fois par problème (cache partagé, clé canonique)
+et la vue 3D est rendue en PNG, une fois par angle de vue.
+"""
+
+import itertools
+from dataclasses import dataclass
+
+import matplotlib.pyplot as plt
+import numpy as np
+import streamlit as st
+from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+
+from cache_lru import CacheLRU
+from lp_cache import cle_canonique
+from lp_sommets import TOLERANCE, demi_plans
+
+CAPACITE = 32
+# Triplets traités par lot : borne la mémoire du test de réalisabilité (lot × plans)
+TAILLE_LOT = 20_000
+MARGE = 1.5
+
+
+@dataclass
+class Polyedre:
+    """Sommets et faces ; `lignes[k]` est la contrainte de la face k (-1 : axe ou boîte)."""
+    sommets: np.ndarray
+    faces: list
+    lignes: list
+    cadre: tuple
+    borne: bool = True
+
+
+# ==============================
+# Sommets
+# ==============================
+def _triplets(n):
+    return np.fromiter(itertools.chain.from_iterable(itertools.combinations(range(n), 3)),
+                       dtype=np.intp).reshape(-1, 3)
+
+
+def sommets_3d(G, h, triplets=None):
+    """Intersecte les triplets de plans G[i] p = h[i] et garde les points réalisables."""
+    triplets = _triplets(len(G)) if triplets is None else triplets
+    echelle = TOLERANCE * (1 + np.abs(h))
+    resultats = [np.empty((0, 3))]
+    for debut in range(0, len(triplets), TAILLE_LOT):
+        lot = triplets[debut:debut + TAILLE_LOT]
+        M = G[lot]
+        ok = np.abs(np.linalg.det(M)) > TOLERANCE * (1 + np.abs(M).max(axis=(1, 2))) ** 3
+        if not ok.any():
+            continue
+        points = np.linalg.solve(M[ok], h[lot[ok]][:, :, None])[:, :, 0]
+        resultats.append(points[np.all(points @ G.T <= h + echelle, axis=1)])
+    points = np.vstack(resultats)
+    # Sommet dégénéré : plusieurs triplets donnent le même point
+    return np.unique(np.round(points, 9) + 0.0, axis=0)
+
+
+def _face(points, g):
+    """Sommets d'une face plane (normale g), dans l'ordre du contour."""
+    centre = points.mean(axis=0)
+    normale = g / np.linalg.norm(g)
+    u = np.cross(normale, np.eye(3)[np.argmin(np.abs(normale))])
+    u /= np.linalg.norm(u)
+    v = np.cross(normale, u)
+    relatifs = points - centre
+    return points[np.argsort(np.arctan2(relatifs @ v, relatifs @ u))]
+
+
+def polyedre_realisable(modele):
+    """Polyèdre {x >= 0 : A x (<=, >=, ==) b} d'un modèle à trois variables.
+
+    Renvoie un Polyedre sans face si le problème est irréalisable.
+    """
+    G, h = demi_plans(modele)
+    ops = np.asarray(modele.operateurs)
+    lignes = np.concatenate([np.flatnonzero(ops != '>='), np.flatnonzero(ops != '<='),
+                             np.full(3, -1)])
+    points = sommets_3d(G, h)
+    if len(points) == 0:
+        return Polyedre(points, [], [], (10.0, 10.0, 10.0))
+
+    # Boîte d'affichage : x_j <= MARGE × max ; seuls les triplets qui la touchent sont nouveaux
+    maximum = float(points.max())
+    cadre = tuple(MARGE * max(float(p), 0.2 * maximum) if maximum > TOLERANCE else 10.0
+                  for p in points.max(axis=0))
+    m = len(G)
+    G = np.vstack([G, np.eye(3)])
+    h = np.concatenate([h, cadre])
+    nouveaux = np.array([(i, j, k) for k in range(m, m + 3) for i, j in
+                         itertools.combinations(range(k), 2)], dtype=np.intp)
+    points = np.unique(np.vstack([points, sommets_3d(G, h, nouveaux)]), axis=0)
+    lignes = np.concatenate([lignes, np.full(3, -1)])
+
+    faces, origines, borne = [], [], True
+    vues = set()
+    ecarts = np.abs(points @ G.T - h) <= 1e-7 * (1 + np.abs(h))
+    for r in range(len(G)):
+        sur_plan = np.flatnonzero(ecarts[:, r])
+        # Une égalité donne deux demi-espaces de même face
+        if len(sur_plan) < 3 or tuple(sur_plan) in vues:
+            continue
+        vues.add(tuple(sur_plan))
+        faces.append(_face(points[sur_plan], G[r]))
+        origines.append(int(lignes[r]))
+        borne = borne and r < m
+    return Polyedre(points, faces, origines, cadre, borne)
+
+
+@st.cache_resource
+def cache_polyedres(capacite=CAPACITE):
+    """Instance unique du cache des polyèdres pour tout le processus Streamlit."""
+    return CacheLRU(capacite)
+
+
+def polyedre_en_cache(modele, cache=None):
+    """polyedre_realisable, calculé seulement à la première demande de ce problème."""
+    cache = cache if cache is not None else cache_polyedres()
+    cle = cle_canonique(modele)
+    polyedre = cache.obtenir(cle)
+    if polyedre is None:
+        polyedre = polyedre_realisable(modele)
+        cache.ajouter(cle, polyedre)
+    return polyedre
+
+
+# ==============================
+# Vue 3D
+# ==============================
+def tracer_polyedre(polyedre, variables, libelles, solution=None, elevation=25, azimut=-60):
+    """Figure Matplotlib 3D : faces colorées par contrainte, sommets, solution en rouge."""
+    fig = plt.figure(figsize=(8, 7))
+    ax = fig.add_subplot(projection="3d")
+    couleurs = plt.cm.tab10(np.arange(max(len(libelles), 1)) % 10)
+    deja = set()
+    for face, ligne in zip(polyedre.faces, polyedre.lignes):
+        if ligne < 0:
+            style = dict(facecolor="lightgrey", alpha=0.15, label=None)
+        else:
+            style = dict(facecolor=couleurs[ligne], alpha=0.45,
+                         label=None if ligne in deja else libelles[ligne])
+            deja.add(ligne)
+        ax.add_collection3d(Poly3DCollection([face], edgecolor="dimgrey", linewidth=0.6, **style))
+    if len(polyedre.sommets):
+        ax.scatter(*polyedre.sommets.T, color="black", s=12)
+    if solution is not None and None not in solution:
+        ax.scatter(*solution, color="red", s=90, depthshade=False,
+                   label="Solution (" + ", ".join(f"{v:.2f}" for v in solution) + ")")
+
+    X, Y, Z = polyedre.cadre
+    ax.set_xlim(0, X)
+    ax.set_ylim(0, Y)
+    ax.set_zlim(0, Z)
+    ax.set_xlabel(variables[0])
+    ax.set_ylabel(variables[1])
+    ax.set_zlabel(variables[2])
+    ax.view_init(elev=elevation, azim=azimut)
+    if deja or solution is not None:
+        ax.legend(loc="upper left", fontsize=8)
+    return fig
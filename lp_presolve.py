@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+Présolve : réduction du programme linéaire avant l'appel au solveur.
+
+Passes répétées jusqu'à stabilité :
+- lignes vides ou à une seule variable -> bornes explicites (x <= u, x >= l) ;
+- lignes parallèles (doublons, multiples) -> seule la plus serrée est gardée ;
+- lignes toujours satisfaites compte tenu des bornes -> supprimées ;
+- variables fixées (bornes égales, colonne vide) -> substituées ;
+- bornes impliquées par l'activité des lignes -> resserrées, et la
+  variable est fixée si elles se rejoignent.
+Les bornes des variables entières sont arrondies vers l'intérieur. Les
+bornes explicites restantes redeviennent des lignes à une variable.
+"""
+
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+import scipy.sparse as sp
+
+from lp_core import ModeleLineaire, Resultat, ecart_relatif, resoudre
+
+TOLERANCE = 1e-9
+PASSES_MAX = 10
+DECIMALES = 12
+
+
+class _Irrealisable(Exception):
+    pass
+
+
+@dataclass
+class Reduction:
+    """Modèle réduit et de quoi reconstruire la solution du modèle d'origine.
+
+    `statut` est renseigné lorsque le présolve conclut seul (Infeasible,
+    Unbounded ou Optimal si toutes les variables sont fixées).
+    """
+    modele: ModeleLineaire
+    fixees: dict = field(default_factory=dict)
+    constante: float = 0.0
+    statut: str = None
+    lignes_supprimees: int = 0
+    colonnes_supprimees: int = 0
+    bornes_resserrees: int = 0
+    temps: float = 0.0
+
+
+def _tol(v):
+    """Tolérance relative ; nulle pour une borne infinie."""
+    v = np.abs(v)
+    return np.where(np.isfinite(v), TOLERANCE * (1.0 + v), 0.0)
+
+
+def _arrondir(inf, sup, entieres):
+    """Bornes des variables entières ramenées aux entiers intérieurs (sur place)."""
+    if entieres is not None:
+        sup[entieres] = np.floor(sup[entieres] + _tol(sup[entieres]))
+        inf[entieres] = np.ceil(inf[entieres] - _tol(inf[entieres]))
+
+
+# ==============================
+# Passes de réduction
+# ==============================
+def _lignes_simples(A, r, egalite, lignes, inf, sup):
+    """Lignes vides (vérifiées puis supprimées) et singletons (convertis en bornes)."""
+    nnz = np.diff(A.indptr)
+    vides = lignes & (nnz == 0)
+    if np.any(vides & np.where(egalite, np.abs(r) > _tol(r), r < -_tol(r))):
+        raise _Irrealisable
+    simples = lignes & (nnz == 1)
+    if simples.any():
+        position = A.indptr[:-1][simples]
+        j, a = A.indices[position], A.data[position]
+        v, eq = r[simples] / a, egalite[simples]
+        haut, bas = eq | (a > 0), eq | (a < 0)
+        np.minimum.at(sup, j[haut], v[haut])
+        np.maximum.at(inf, j[bas], v[bas])
+    lignes &= ~(vides | simples)
+    return bool(vides.any() or simples.any())
+
+
+def _lignes_paralleles(A, r, egalite, lignes):
+    """Ne garde, par direction a/|a|max, que la ligne (ou le couple) la plus serrée."""
+    nnz = np.diff(A.indptr)
+    pleines = np.flatnonzero(nnz > 0)
+    echelles = np.ones(A.shape[0])
+    if pleines.size:
+        debuts = A.indptr[pleines]
+        echelles[pleines] = np.maximum.reduceat(np.abs(A.data), debuts) * np.sign(A.data[debuts])
+    normees = np.round(A.data / np.repeat(echelles, nnz), DECIMALES) + 0.0
+
+    groupes = {}
+    for i in np.flatnonzero(lignes):
+        debut, fin = A.indptr[i], A.indptr[i + 1]
+        cle = (A.indices[debut:fin].tobytes(), normees[debut:fin].tobytes())
+        groupes.setdefault(cle, []).append(i)
+
+    supprimees = []
+    for membres in groupes.values():
+        if len(membres) == 1:
+            continue
+        membres = np.array(membres)
+        rn, eq = r[membres] / echelles[membres], egalite[membres]
+        hauts, bas = ~eq & (echelles[membres] > 0), ~eq & (echelles[membres] < 0)
+        haut = rn[hauts].min() if hauts.any() else np.inf
+        plancher = rn[bas].max() if bas.any() else -np.inf
+        if plancher > haut + _tol(haut):
+            raise _Irrealisable
+        if eq.any():
+            v = rn[eq][0]
+            if np.ptp(rn[eq]) > _tol(v) or v > haut + _tol(v) or v < plancher - _tol(v):
+                raise _Irrealisable
+            gardees = {membres[eq][0]}
+        else:
+            gardees = {membres[hauts][np.argmin(rn[hauts])]} if hauts.any() else set()
+            gardees |= {membres[bas][np.argmax(rn[bas])]} if bas.any() else set()
+        supprimees.extend(i for i in membres if i not in gardees)
+    lignes[supprimees] = False
+    return bool(supprimees)
+
+
+def _activites(A, inf, sup):
+    """Activités minimale et maximale de chaque ligne sur la boîte [inf, sup]."""
+    positive, negative = A.maximum(0).tocsr(), A.minimum(0).tocsr()
+    positive.eliminate_zeros()
+    negative.eliminate_zeros()
+    return positive @ inf + negative @ sup, positive @ sup + negative @ inf
+
+
+def _lignes_redondantes(A, r, egalite, lignes, inf, sup):
+    """Supprime les inégalités satisfaites sur toute la boîte des bornes explicites."""
+    minimum, maximum = _activites(A, inf, sup)
+    if np.any(lignes & ((minimum > r + _tol(r)) | (egalite & (maximum < r - _tol(r))))):
+        raise _Irrealisable
+    redondantes = lignes & ~egalite & (maximum <= r + _tol(r))
+    lignes &= ~redondantes
+    return bool(redondantes.any())
+
+
+def _bornes_impliquees(A, r, egalite, lignes, inf, sup, entieres=None):
+    """Bornes déduites de chaque ligne : a_j x_j <= r - (activité minimale des autres)."""
+    A = sp.vstack([A[lignes], -A[lignes & egalite]]).tocoo()
+    r = np.concatenate([r[lignes], -r[lignes & egalite]])
+    inf, sup = inf.copy(), sup.copy()
+    for _ in range(PASSES_MAX):
+        apport = np.where(A.data > 0, A.data * inf[A.col], A.data * sup[A.col])
+        infini = np.isinf(apport)
+        n_infinis = np.bincount(A.row, weights=infini, minlength=len(r))
+        finie = np.bincount(A.row, weights=np.where(infini, 0.0, apport), minlength=len(r))
+        # Activité minimale des autres variables de la ligne
+        autres = np.where(infini, np.where(n_infinis[A.row] == 1, finie[A.row], -np.inf),
+                          np.where(n_infinis[A.row] == 0, finie[A.row] - apport, -np.inf))
+        borne = (r[A.row] - autres) / A.data
+        nouveau_sup, nouveau_inf = sup.copy(), inf.copy()
+        np.minimum.at(nouveau_sup, A.col[A.data > 0], borne[A.data > 0])
+        np.maximum.at(nouveau_inf, A.col[A.data < 0], borne[A.data < 0])
+        _arrondir(nouveau_inf, nouveau_sup, entieres)
+        if np.allclose(nouveau_sup, sup) and np.allclose(nouveau_inf, inf):
+            break
+        inf, sup = nouveau_inf, nouveau_sup
+    return inf, sup
+
+
+# ==============================
+# Présolve et reconstruction
+# ==============================
+def presolve(modele):
+    """Renvoie la Reduction du modèle (le modèle d'origine n'est pas modifié)."""
+    debut = time.perf_counter()
+    m, n = modele.A.shape
+    ops = np.asarray(modele.operateurs)
+    egalite = ops == '=='
+    signe = np.where(ops == '>=', -1.0, 1.0)
+    A = (sp.diags(signe) @ modele.A).tocsr()    # toutes les inégalités en '<='
+    b = signe * modele.b
+    couts = modele.c if modele.sens == "max" else -modele.c
+
+    lignes, colonnes = np.ones(m, dtype=bool), np.ones(n, dtype=bool)
+    x = np.zeros(n)
+    inf, sup = np.zeros(n), np.full(n, np.inf)
+    impliquees = 0
+    statut = None
+    try:
+        for _ in range(PASSES_MAX):
+            actives = (A @ sp.diags(colonnes.astype(float))).tocsr()
+            actives.eliminate_zeros()
+            actives.sort_indices()
+            r = b - A @ x
+            change = _lignes_simples(actives, r, egalite, lignes, inf, sup)
+            _arrondir(inf, sup, modele.entieres)
+            if np.any(inf > sup + _tol(sup)):
+                raise _Irrealisable
+            change |= _lignes_paralleles(actives, r, egalite, lignes)
+            change |= _lignes_redondantes(actives, r, egalite, lignes, inf, sup)
+
+            inf_i, sup_i = _bornes_impliquees(actives, r, egalite, lignes, inf, sup,
+                                              modele.entieres)
+            if np.any(colonnes & (inf_i > sup_i + _tol(sup_i))):
+                raise _Irrealisable
+            impliquees = int(np.sum(colonnes & ((sup_i < sup - _tol(sup_i)) |
+                                                (inf_i > inf + _tol(inf_i)))))
+
+            # Variables fixées : bornes (même impliquées) confondues, ou colonne vide
+            vide = actives[lignes].getnnz(axis=0) == 0
+            confondues = sup_i - inf_i <= _tol(sup_i)
+            fixer = colonnes & (confondues | (vide & ((couts <= 0) | np.isfinite(sup))))
+            x[fixer] = np.where(confondues, inf_i, np.where(couts <= 0, inf, sup))[fixer]
+            colonnes &= ~fixer
+            if not (change or fixer.any()):
+                break
+        if colonnes.any() and not lignes.any():
+            statut = "Unbounded"    # colonnes vides restantes : coût > 0 et aucune borne
+        elif not colonnes.any():
+            r = (b - A @ x)[lignes]
+            satisfaites = np.where(egalite[lignes], np.abs(r) <= _tol(r), r >= -_tol(r))
+            statut = "Optimal" if satisfaites.all() else "Infeasible"
+    except _Irrealisable:
+        statut = "Infeasible"
+
+    # Modèle réduit : lignes conservées (sens d'origine) + bornes explicites
+    garde = np.flatnonzero(colonnes)
+    A_reduite = modele.A[lignes][:, garde].tocoo()
+    b_reduit = modele.b[lignes] - modele.A[lignes] @ x
+    avec_sup = np.flatnonzero(np.isfinite(sup[garde]))
+    avec_inf = np.flatnonzero(inf[garde] > 0)
+    nb = A_reduite.shape[0]
+    bornes = np.concatenate([avec_sup, avec_inf])
+    reduit = ModeleLineaire(
+        modele.sens, [modele.variables[j] for j in garde], modele.c[garde],
+        sp.csr_matrix((np.concatenate([A_reduite.data, np.ones(len(bornes))]),
+                       (np.concatenate([A_reduite.row, nb + np.arange(len(bornes))]),
+                        np.concatenate([A_reduite.col, bornes]))),
+                      shape=(nb + len(bornes), len(garde))),
+        np.concatenate([b_reduit, sup[garde][avec_sup], inf[garde][avec_inf]]),
+        list(ops[lignes]) + ['<='] * len(avec_sup) + ['>='] * len(avec_inf),
+        None if modele.entieres is None else modele.entieres[garde])
+
+    fixees = {modele.variables[j]: float(x[j]) + 0.0 for j in np.flatnonzero(~colonnes)}
+    return Reduction(reduit, fixees, float(modele.c @ x), statut,
+                     m - reduit.n_contraintes, n - reduit.n_variables,
+                     impliquees, time.perf_counter() - debut)
+
+
+def restaurer(modele, reduction, resultat):
+    """Résultat du modèle réduit -> Resultat exprimé sur le modèle d'origine."""
+    methode = "Présolve" if reduction.statut else f"{resultat.methode} + présolve"
+    if resultat.statut not in ("Optimal", "Not Solved") or resultat.objectif is None:
+        return Resultat(resultat.statut, dict.fromkeys(modele.variables), None, resultat.temps,
+                        methode=methode, construction=resultat.construction)
+    valeurs = {**reduction.fixees, **resultat.valeurs}
+    objectif = (resultat.objectif or 0.0) + reduction.constante
+    borne = None
+    if reduction.statut == "Optimal":
+        borne = objectif    # tout est fixé par le présolve
+    elif resultat.borne is not None:
+        borne = resultat.borne + reduction.constante
+    return Resultat(resultat.statut, {var: valeurs[var] for var in modele.variables},
+                    objectif, resultat.temps, methode=methode, construction=resultat.construction,
+                    borne=borne, ecart=ecart_relatif(objectif, borne) if modele.mip else None)
+
+
+def resoudre_avec_presolve(modele, resolution=resoudre):
+    """Présolve, résolution du modèle réduit par `resolution`, reconstruction.
+
+    Renvoie (Resultat, Reduction).
+    """
+    reduction = presolve(modele)
+    if reduction.statut:
+        resultat = Resultat(reduction.statut, {}, 0.0, methode="Présolve")
+    else:
+        resultat = resolution(reduction.modele)
+    return restaurer(modele, reduction, resultat), reduction
+
+
+def afficher_presolve(reduction, gain=None):
+    """Bilan du présolve ; `gain` : temps de résolution économisé (s), si mesuré."""
+    # Streamlit chargé ici seulement : le présolve sert aussi hors interface
+    import streamlit as st
+
+    st.write("**Présolve :**")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Lignes supprimées", reduction.lignes_supprimees)
+    col2.metric("Colonnes supprimées", reduction.colonnes_supprimees)
+    col3.metric("Bornes resserrées", reduction.bornes_resserrees)
+    col4.metric("Durée", f"{reduction.temps * 1000:.1f} ms")
+    if gain is not None:
+        st.caption(f"Temps gagné par rapport à la résolution directe : {gain * 1000:.2f} ms")
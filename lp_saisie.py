@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+Saisie en masse des contraintes : grille matricielle, CSV et XLSX.
+
+Deux dispositions de tableau sont acceptées :
+- matricielle : une colonne par variable, puis « op » et « b » ;
+- textuelle : une colonne « contrainte » (ex. « 2x + 3y <= 12 »).
+Les contraintes textuelles sont lues par l'analyseur de lp_core. Les tableaux de
+transport et d'affectation (matrices de coûts) sont lus ici aussi.
+"""
+
+import io
+import re
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from lp_core import (OPERATEURS, ErreurSyntaxe, analyse_lineaire, analyse_syntaxique,
+                     assembler_modele, construire_modele)
+
+COLONNE_TEXTE = "contrainte"
+COLONNES_RESERVEES = ("op", "b")
+COLONNE_OFFRE = "offre"
+LIGNE_DEMANDE = "demande"
+COLONNE_LONGUEUR = "longueur"
+COLONNE_DEMANDE = "demande"
+COLONNE_SCENARIO = "scénario"
+COLONNE_PROBABILITE = "probabilité"
+
+_VARIABLE = re.compile(r'[a-zA-Z_]')
+
+
+# ==============================
+# Lecture des fichiers
+# ==============================
+def lire_xlsx(fichier):
+    """Lit la première feuille en mode lecture seule (ligne par ligne)."""
+    classeur = load_workbook(fichier, read_only=True, data_only=True)
+    try:
+        lignes = classeur.worksheets[0].iter_rows(values_only=True)
+        entete = next(lignes, None)
+        if entete is None:
+            return pd.DataFrame()
+        return pd.DataFrame.from_records(lignes, columns=[str(e).strip() for e in entete])
+    finally:
+        classeur.close()
+
+
+def lire_csv(fichier):
+    """Lit un CSV dont le séparateur (« , », « ; » ou tabulation) est déduit de l'en-tête."""
+    entete = fichier.readline()
+    fichier.seek(0)
+    if isinstance(entete, bytes):
+        entete = entete.decode("utf-8", errors="ignore")
+    return pd.read_csv(fichier, sep=max([",", ";", "\t"], key=entete.count))
+
+
+def lire_fichier(fichier, nom):
+    """Charge un CSV ou un XLSX téléversé en DataFrame."""
+    if nom.lower().endswith(".xlsx"):
+        return lire_xlsx(fichier)
+    return lire_csv(fichier)
+
+
+def tableau_vers_csv(df):
+    """Sérialise une grille de contraintes (pour téléchargement)."""
+    tampon = io.StringIO()
+    df.to_csv(tampon, index=False)
+    return tampon.getvalue()
+
+
+# ==============================
+# Construction du modèle
+# ==============================
+def _objectif(objectif, variables):
+    termes = analyse_syntaxique(objectif)
+    variables = sorted(set(variables) | {var for _, var in termes})
+    index = {var: j for j, var in enumerate(variables)}
+    c = np.zeros(len(variables))
+    for coeff, var in termes:
+        c[index[var]] += coeff
+    return variables, index, c
+
+
+def modele_depuis_matrice(sens, objectif, df):
+    """Disposition matricielle : colonnes variables + « op » + « b »."""
+    df = df.dropna(how="all")
+    noms = [col for col in df.columns if str(col) not in COLONNES_RESERVEES]
+    variables, index, c = _objectif(objectif, [str(col) for col in noms])
+
+    valeurs = df[noms].apply(pd.to_numeric, errors="coerce").fillna(0.0).to_numpy()
+    lignes, positions = np.nonzero(valeurs)
+    colonnes = np.array([index[str(col)] for col in noms], dtype=int)[positions]
+
+    b = pd.to_numeric(df["b"], errors="coerce").fillna(0.0).to_numpy()
+    operateurs = df["op"].fillna("<=").astype(str).str.strip().replace("=", "==")
+    inconnus = np.flatnonzero(~operateurs.isin(OPERATEURS))
+    if len(inconnus):
+        i = inconnus[0]
+        raise ValueError(f"Ligne {i + 1} : opérateur « {operateurs.iloc[i]} » inconnu "
+                         "(<=, >= ou = attendu).")
+    return assembler_modele(sens, variables, c, lignes, colonnes,
+                            valeurs[lignes, positions], b, operateurs.tolist())
+
+
+def _contrainte(numero, texte):
+    """(lhs, op, rhs) d'une ligne, analysée par lp_core ; ErreurSyntaxe repérée dans la ligne."""
+    op = next((op for op in OPERATEURS if op in texte), None)
+    if op is None:
+        raise ErreurSyntaxe(f"Ligne {numero} : opérateur <=, >= ou = attendu", texte,
+                            len(texte.rstrip()))
+    lhs, rhs = texte.split(op, 1)
+    decalage = 0
+    try:
+        analyse_lineaire(lhs)
+        decalage = len(lhs) + len(op)
+        droite = analyse_lineaire(rhs)
+    except ErreurSyntaxe as e:
+        raise ErreurSyntaxe(f"Ligne {numero} : {e.message}", texte, decalage + e.position) from None
+    if not rhs.strip():
+        raise ErreurSyntaxe(f"Ligne {numero} : second membre attendu", texte, len(texte))
+    if droite.termes:
+        raise ErreurSyntaxe(f"Ligne {numero} : second membre constant attendu", texte,
+                            decalage + _VARIABLE.search(rhs).start())
+    return lhs, op, droite.constante
+
+
+def modele_depuis_textes(sens, objectif, textes):
+    """Disposition textuelle : une contrainte « lhs op rhs » par ligne.
+
+    Chaque ligne passe par l'analyseur de lp_core (même syntaxe, constantes
+    du membre de gauche reportées dans b) ; les lignes vides sont ignorées.
+    """
+    contraintes = [_contrainte(numero, str(texte)) for numero, texte in enumerate(textes, 1)
+                   if str(texte).strip()]
+    return construire_modele(sens, objectif, contraintes)
+
+
+def modele_depuis_tableau(sens, objectif, df):
+    """Choisit la disposition selon la présence d'une colonne « contrainte »."""
+    df = df.rename(columns=lambda col: str(col).strip())
+    if COLONNE_TEXTE in df.columns:
+        return modele_depuis_textes(sens, objectif, df[COLONNE_TEXTE].dropna())
+    if not set(COLONNES_RESERVEES) <= set(df.columns):
+        raise ValueError("Le tableau doit contenir une colonne « contrainte », "
+                         "ou des colonnes de variables suivies de « op » et « b ».")
+    return modele_depuis_matrice(sens, objectif, df)
+
+
+# ==============================
+# Transport et affectation
+# ==============================
+def matrice_couts(df):
+    """Tableau -> (noms des lignes, noms des colonnes, matrice de coûts).
+
+    Une première colonne non numérique donne les noms des lignes ; les
+    cases vides ou illisibles sont refusées.
+    """
+    df = df.dropna(how="all").rename(columns=lambda col: str(col).strip())
+    premiere = df.columns[0] if len(df.columns) else None
+    if premiere is not None and pd.to_numeric(df[premiere], errors="coerce").isna().all():
+        noms, df = df[premiere].astype(str).str.strip().tolist(), df.drop(columns=premiere)
+    else:
+        noms = [str(i + 1) for i in range(len(df))]
+    couts = df.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    if couts.size == 0 or np.isnan(couts).any():
+        raise ValueError("La matrice de coûts doit être entièrement numérique.")
+    return noms, list(df.columns), couts
+
+
+def tableau_transport(df):
+    """Tableau de transport -> (sources, destinations, coûts, offres, demandes).
+
+    Disposition : une ligne par source (nom en première colonne), une colonne
+    de coûts par destination, une colonne « offre », et une dernière ligne
+    nommée « demande » (sa case « offre » est ignorée).
+    """
+    df = df.dropna(how="all").rename(columns=lambda col: str(col).strip())
+    if COLONNE_OFFRE not in df.columns:
+        raise ValueError("Le tableau de transport doit contenir une colonne « offre ».")
+    etiquettes = df[df.columns[0]].astype(str).str.strip().str.lower()
+    if not (etiquettes == LIGNE_DEMANDE).any():
+        raise ValueError("Le tableau de transport doit contenir une ligne « demande ».")
+    sources = df[etiquettes != LIGNE_DEMANDE]
+    couts = sources.drop(columns=[df.columns[0], COLONNE_OFFRE])
+    offres = pd.to_numeric(sources[COLONNE_OFFRE], errors="coerce").to_numpy(dtype=float)
+    demandes = pd.to_numeric(df[etiquettes == LIGNE_DEMANDE][couts.columns].iloc[0],
+                             errors="coerce").to_numpy(dtype=float)
+    couts = couts.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    if couts.size == 0 or np.isnan(couts).any():
+        raise ValueError("La matrice de coûts doit être entièrement numérique.")
+    if np.isnan(offres).any() or np.isnan(demandes).any():
+        raise ValueError("Offres et demandes doivent être numériques.")
+    return (sources[df.columns[0]].astype(str).str.strip().tolist(),
+            list(df.columns.drop([df.columns[0], COLONNE_OFFRE])), couts, offres, demandes)
+
+
+def tableau_decoupe(df):
+    """Tableau de découpe -> (longueurs, demandes) : colonnes « longueur » et « demande »."""
+    df = df.dropna(how="all").rename(columns=lambda col: str(col).strip().lower())
+    if COLONNE_LONGUEUR not in df.columns or COLONNE_DEMANDE not in df.columns:
+        raise ValueError("Le tableau de découpe doit contenir les colonnes « longueur » et « demande ».")
+    longueurs = pd.to_numeric(df[COLONNE_LONGUEUR], errors="coerce").to_numpy(dtype=float)
+    demandes = pd.to_numeric(df[COLONNE_DEMANDE], errors="coerce").to_numpy(dtype=float)
+    if longueurs.size == 0 or np.isnan(longueurs).any() or np.isnan(demandes).any():
+        raise ValueError("Longueurs et demandes doivent être numériques.")
+    return longueurs, demandes
+
+
+def tableau_scenarios(df, b, colonnes):
+    """Tableau de scénarios -> (noms, probabilités, seconds membres, un vecteur par scénario).
+
+    `colonnes[k]` nomme la colonne du second membre de la ligne k du modèle ;
+    une colonne absente ou une case vide garde la valeur `b[k]` du modèle.
+    """
+    df = df.dropna(how="all").rename(columns=lambda col: str(col).strip())
+    if COLONNE_PROBABILITE not in df.columns:
+        raise ValueError("Le tableau des scénarios doit contenir une colonne « probabilité ».")
+    probabilites = pd.to_numeric(df[COLONNE_PROBABILITE], errors="coerce").to_numpy(dtype=float)
+    if probabilites.size == 0 or np.isnan(probabilites).any():
+        raise ValueError("Chaque scénario doit avoir une probabilité numérique.")
+    seconds_membres = np.tile(np.asarray(b, dtype=float), (len(df), 1))
+    for k, colonne in enumerate(colonnes):
+        if colonne in df.columns:
+            valeurs = pd.to_numeric(df[colonne], errors="coerce").to_numpy(dtype=float)
+            seconds_membres[:, k] = np.where(np.isnan(valeurs), b[k], valeurs)
+    noms = df[COLONNE_SCENARIO].astype(str).str.strip().tolist() if COLONNE_SCENARIO in df.columns \
+        else [f"S{i + 1}" for i in range(len(df))]
+    return noms, probabilites, list(seconds_membres)
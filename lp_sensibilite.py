@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+Analyse de sensibilité à partir d'une seule solution optimale.
+
+On reconstruit la base optimale de la forme standard [A | S] z = b
+(S : variables d'écart), puis on en déduit prix ombre, écarts, coûts
+réduits et intervalles de validité du second membre et des coûts, sans
+nouvelle résolution.
+"""
+
+import itertools
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+TOLERANCE = 1e-9
+ESSAIS_MAX = 200
+LIGNES_MAX = 500
+
+
+@dataclass
+class Sensibilite:
+    """Grandeurs de sensibilité, exprimées dans le sens (max/min) du modèle."""
+    base: np.ndarray
+    inverse_base: np.ndarray
+    x_base: np.ndarray
+    prix_ombre: np.ndarray
+    ecarts: np.ndarray
+    couts_reduits: np.ndarray
+    b_augmentation: np.ndarray
+    b_diminution: np.ndarray
+    c_augmentation: np.ndarray
+    c_diminution: np.ndarray
+
+
+def forme_standard(modele):
+    """Renvoie (Ā, c̃, lignes avec écart) : matrice augmentée et coûts en maximisation."""
+    m, n = modele.A.shape
+    ops = np.asarray(modele.operateurs)
+    signes = np.where(ops == '<=', 1.0, -1.0)
+    avec_ecart = np.flatnonzero(ops != '==')
+
+    S = np.zeros((m, len(avec_ecart)))
+    S[avec_ecart, np.arange(len(avec_ecart))] = signes[avec_ecart]
+    A_bar = np.hstack([modele.A.toarray(), S])
+
+    c = modele.c if modele.sens == "max" else -modele.c
+    return A_bar, np.concatenate([c, np.zeros(len(avec_ecart))]), avec_ecart
+
+
+def _bases_candidates(A_bar, z):
+    """Colonnes strictement positives, complétées par des colonnes nulles."""
+    m = A_bar.shape[0]
+    positives = list(np.flatnonzero(z > TOLERANCE))
+    # Les colonnes d'écart (à droite) complètent la base en priorité
+    nulles = sorted(set(range(len(z))) - set(positives), reverse=True)
+    manquantes = m - len(positives)
+    if manquantes <= 0:
+        yield positives[:m]
+        return
+    for complement in itertools.islice(itertools.combinations(nulles, manquantes), ESSAIS_MAX):
+        yield positives + list(complement)
+
+
+def analyser_sensibilite(modele, valeurs):
+    """Calcule la Sensibilite de la solution `valeurs` ({variable: valeur}).
+
+    Renvoie None si aucune base régulière et duale réalisable n'est trouvée
+    (optimum dégénéré au-delà des ESSAIS_MAX bases essayées).
+    """
+    if modele.n_contraintes == 0:
+        return None
+    A_bar, c_bar, avec_ecart = forme_standard(modele)
+    m, n = modele.A.shape
+
+    x = np.array([valeurs[var] or 0.0 for var in modele.variables])
+    residus = modele.b - modele.A @ x
+    ops = np.asarray(modele.operateurs)
+    s = np.where(ops == '<=', residus, -residus)[avec_ecart]
+    z = np.concatenate([x, s])
+
+    retenue = None
+    for base in _bases_candidates(A_bar, z):
+        B = A_bar[:, base]
+        if np.linalg.matrix_rank(B) < m:
+            continue
+        B_inv = np.linalg.inv(B)
+        y = B_inv.T @ c_bar[base]
+        d = c_bar - A_bar.T @ y
+        # Seule une base duale réalisable (aucun coût réduit positif, en maximisation)
+        # donne des prix ombre et des intervalles justes
+        if np.all(d <= TOLERANCE * (1 + np.abs(c_bar))):
+            retenue = (base, B_inv, y, d)
+            break
+    if retenue is None:
+        return None
+    base, B_inv, y, d = retenue
+    base = np.array(base)
+    x_base = B_inv @ modele.b
+
+    # Intervalles du second membre : x_B + Δ B⁻¹ e_i >= 0
+    b_aug, b_dim = np.full(m, np.inf), np.full(m, np.inf)
+    for i in range(m):
+        u = B_inv[:, i]
+        neg, pos = u < -TOLERANCE, u > TOLERANCE
+        if neg.any():
+            b_aug[i] = np.min(x_base[neg] / -u[neg])
+        if pos.any():
+            b_dim[i] = np.min(x_base[pos] / u[pos])
+
+    # Intervalles des coûts (en maximisation) : les coûts réduits restent <= 0
+    hors_base = np.setdiff1d(np.arange(A_bar.shape[1]), base)
+    alpha = B_inv @ A_bar[:, hors_base]
+    c_aug, c_dim = np.full(n, np.inf), np.full(n, np.inf)
+    for j in range(n):
+        position = np.flatnonzero(base == j)
+        if position.size == 0:
+            c_aug[j] = -d[j]
+            continue
+        ligne = alpha[position[0]]
+        neg, pos = ligne < -TOLERANCE, ligne > TOLERANCE
+        if neg.any():
+            c_aug[j] = np.min(d[hors_base][neg] / ligne[neg])
+        if pos.any():
+            c_dim[j] = np.min(-d[hors_base][pos] / ligne[pos])
+    c_aug, c_dim = np.maximum(c_aug, 0.0), np.maximum(c_dim, 0.0)
+
+    if modele.sens == "min":
+        y, d = -y, -d
+        c_aug, c_dim = c_dim, c_aug
+
+    return Sensibilite(base, B_inv, x_base, y + 0.0, residus, d[:n] + 0.0,
+                       b_aug, b_dim, c_aug, c_dim)
+
+
+def reponse_par_base(modele, sensibilite, b, c):
+    """Solution pour un nouveau second membre `b` et de nouveaux coûts `c`, sans solveur.
+
+    Tant que la base optimale reste réalisable (B⁻¹ b >= 0) et optimale
+    (coûts réduits de même signe), x_B = B⁻¹ b ; renvoie alors (x, z),
+    sinon None. Les variations simultanées sont traitées exactement.
+    """
+    base, B_inv = sensibilite.base, sensibilite.inverse_base
+    b = np.asarray(b, dtype=float)
+    x_base = B_inv @ b
+    if np.any(x_base < -TOLERANCE * (1 + np.abs(b).max(initial=0.0))):
+        return None
+    A_bar, c_bar, _ = forme_standard(replace(modele, c=np.asarray(c, dtype=float)))
+    d = c_bar - A_bar.T @ (B_inv.T @ c_bar[base])
+    if np.any(d > TOLERANCE * (1 + np.abs(c_bar))):
+        return None
+    z = np.zeros(A_bar.shape[1])
+    z[base] = np.maximum(x_base, 0.0)
+    x = z[:modele.n_variables]
+    return x, float(np.asarray(c, dtype=float) @ x)
+
+
+def tableaux_sensibilite(modele, valeurs, sensibilite, libelles=None):
+    """Met en forme deux DataFrame : contraintes et variables."""
+    libelles = libelles or [f"C{i + 1}" for i in range(modele.n_contraintes)]
+    df_contraintes = pd.DataFrame({
+        "Contrainte": libelles,
+        "Écart": sensibilite.ecarts,
+        "Prix ombre": sensibilite.prix_ombre,
+        "Augmentation admissible": sensibilite.b_augmentation,
+        "Diminution admissible": sensibilite.b_diminution,
+    })
+    df_variables = pd.DataFrame({
+        "Variable": modele.variables,
+        "Valeur": [valeurs[var] for var in modele.variables],
+        "Coût réduit": sensibilite.couts_reduits,
+        "Augmentation admissible": sensibilite.c_augmentation,
+        "Diminution admissible": sensibilite.c_diminution,
+    })
+    return df_contraintes, df_variables
+
+
+def afficher_sensibilite(modele, resultat, libelles=None):
+    """Affiche les tableaux de sensibilité d'une solution optimale."""
+    if resultat.statut != "Optimal":
+        return
+    if modele.mip:
+        st.info("Analyse de sensibilité sans objet pour un modèle en nombres entiers.")
+        return
+    if modele.n_contraintes > LIGNES_MAX:
+        st.info(f"Analyse de sensibilité limitée aux modèles de {LIGNES_MAX} contraintes au plus.")
+        return
+    sensibilite = analyser_sensibilite(modele, resultat.valeurs)
+    if sensibilite is None:
+        st.info("Analyse de sensibilité indisponible (aucune base optimale régulière trouvée).")
+        return
+    df_contraintes, df_variables = tableaux_sensibilite(modele, resultat.valeurs,
+                                                        sensibilite, libelles)
+    st.write("**Analyse de sensibilité :**")
+    st.dataframe(df_contraintes.round(4), hide_index=True)
+    st.dataframe(df_variables.round(4), hide_index=True)
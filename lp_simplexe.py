@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+"""
+Simplexe en tableau, en NumPy (deux phases).
+
+Chaque pivot est une seule opération vectorisée sur tout le tableau :
+la ligne pivot est normalisée puis soustraite en produit extérieur
+(mise à jour de rang 1 BLAS, en place).
+La variable entrante suit la règle de Dantzig (plus grand coût réduit) ;
+après une série de pivots dégénérés, la règle de Bland prend le relais
+jusqu'au prochain pivot non dégénéré, ce qui évite le cyclage.
+
+Pour l'enseignement, simplexe_detaille suit la règle de Bland et consigne
+chaque tableau avec ses variables entrante et sortante (Journal).
+"""
+
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from scipy.linalg.blas import dger
+
+from lp_core import Resultat
+
+TOLERANCE = 1e-9
+DEGENERES_MAX = 20
+# Au-delà, le journal ne garde que les pivots, sans copie du tableau
+CELLULES_MAX = 20_000
+ETAPES_AFFICHEES = 30
+
+
+@dataclass
+class Etape:
+    """Un tableau du simplexe et le pivot qui va y être fait (aucun au dernier)."""
+    phase: int
+    colonnes: list
+    base: list
+    valeur: float
+    tableau: np.ndarray = None
+    entrante: str = None
+    sortante: str = None
+    ligne: int = None
+    colonne: int = None
+
+
+class Journal:
+    """Trace des itérations : noms des colonnes courantes et liste des Etape."""
+
+    def __init__(self, modele, cellules_max=CELLULES_MAX):
+        self.colonnes = noms_colonnes(modele)
+        self.signe = 1.0 if modele.sens == "max" else -1.0
+        self.cellules_max = cellules_max
+        self.etapes = []
+
+    def noter(self, phase, T, base, colonne=None, ligne=None):
+        # Phase 1 : somme des artificielles ; phase 2 : valeur de la fonction économique
+        valeur = T[0, -1] if phase == 1 else -self.signe * T[0, -1]
+        etape = Etape(phase, self.colonnes, [self.colonnes[j] for j in base], float(valeur),
+                      T.copy() if T.size <= self.cellules_max else None)
+        if colonne is not None:
+            etape.entrante, etape.colonne = self.colonnes[colonne], int(colonne)
+        if ligne is not None:
+            etape.sortante, etape.ligne = self.colonnes[base[ligne - 1]], int(ligne)
+        self.etapes.append(etape)
+
+
+def _pivoter(T, ligne, colonne):
+    T[ligne] /= T[ligne, colonne]
+    facteurs = T[:, colonne].copy()
+    facteurs[ligne] = 0.0
+    # Mise à jour de rang 1 en place (BLAS dger sur la vue Fortran de T),
+    # sans la matrice temporaire m × n de np.outer
+    resultat = dger(-1.0, T[ligne].copy(), facteurs, a=T.T, overwrite_a=True)
+    if not np.shares_memory(resultat, T):
+        T[:] = resultat.T
+
+
+def _entrante(T, bland):
+    """Bland : plus petit indice de coût réduit positif ; sinon Dantzig."""
+    couts = T[0, :-1]
+    candidates = np.flatnonzero(couts > TOLERANCE)
+    if candidates.size == 0:
+        return None
+    return candidates[0] if bland else candidates[np.argmax(couts[candidates])]
+
+
+def _sortante(T, colonne, base):
+    """Test du rapport minimal ; à égalité, plus petit indice de base (Bland)."""
+    a = T[1:, colonne]
+    positifs = np.flatnonzero(a > TOLERANCE)
+    if positifs.size == 0:
+        return None
+    rapports = T[1:, -1][positifs] / a[positifs]
+    minimaux = positifs[rapports <= rapports.min() + TOLERANCE]
+    return 1 + minimaux[np.argmin(base[minimaux])]
+
+
+def _iterer(T, base, iterations_max, regle, echeance=None, journal=None, phase=2):
+    degeneres = 0
+    for iteration in range(iterations_max):
+        if echeance is not None and time.perf_counter() > echeance:
+            return "Not Solved", iteration
+        colonne = _entrante(T, regle == "bland" or degeneres >= DEGENERES_MAX)
+        if colonne is None:
+            if journal is not None:
+                journal.noter(phase, T, base)
+            return "Optimal", iteration
+        ligne = _sortante(T, colonne, base)
+        if journal is not None:
+            journal.noter(phase, T, base, colonne, ligne)
+        if ligne is None:
+            return "Unbounded", iteration
+        degeneres = degeneres + 1 if T[ligne, -1] <= TOLERANCE else 0
+        _pivoter(T, ligne, colonne)
+        base[ligne - 1] = colonne
+    return "Not Solved", iterations_max
+
+
+def _operateurs_positifs(modele):
+    """Opérateurs après passage des lignes à second membre négatif du côté positif."""
+    ops = np.array(modele.operateurs, dtype=object)
+    negatifs = modele.b < 0
+    inferieures, superieures = negatifs & (ops == '<='), negatifs & (ops == '>=')
+    ops[inferieures], ops[superieures] = '>=', '<='
+    return ops, negatifs
+
+
+def noms_colonnes(modele):
+    """Noms des colonnes de tableau_initial : variables, écarts e_i, artificielles a_i, b."""
+    ops, _ = _operateurs_positifs(modele)
+    return (list(modele.variables) + [f"e{i + 1}" for i in np.flatnonzero(ops != '==')]
+            + [f"a{i + 1}" for i in np.flatnonzero(ops != '<=')] + ["b"])
+
+
+def tableau_initial(modele):
+    """Forme standard à second membre positif : [A | écarts | artificielles | b].
+
+    Renvoie (T, base, n_structurelles, colonnes artificielles).
+    """
+    A = modele.A.toarray()
+    b = modele.b.astype(float).copy()
+    ops, negatifs = _operateurs_positifs(modele)
+    m, n = A.shape
+
+    A[negatifs] *= -1
+    b[negatifs] *= -1
+
+    avec_ecart = np.flatnonzero(ops != '==')
+    S = np.zeros((m, len(avec_ecart)))
+    S[avec_ecart, np.arange(len(avec_ecart))] = np.where(ops[avec_ecart] == '<=', 1.0, -1.0)
+
+    # Une variable artificielle par ligne sans écart +1 disponible
+    lignes_art = np.flatnonzero(ops != '<=')
+    R = np.zeros((m, len(lignes_art)))
+    R[lignes_art, np.arange(len(lignes_art))] = 1.0
+
+    T = np.zeros((m + 1, n + S.shape[1] + R.shape[1] + 1))
+    T[1:, :n], T[1:, n:n + S.shape[1]], T[1:, n + S.shape[1]:-1], T[1:, -1] = A, S, R, b
+
+    base = np.empty(m, dtype=int)
+    colonne_ecart = dict(zip(avec_ecart, n + np.arange(len(avec_ecart))))
+    colonne_art = dict(zip(lignes_art, n + S.shape[1] + np.arange(len(lignes_art))))
+    for i in range(m):
+        base[i] = colonne_art[i] if i in colonne_art else colonne_ecart[i]
+    artificielles = n + S.shape[1] + np.arange(len(lignes_art))
+    return T, base, n, artificielles
+
+
+def _iterer_dual(T, base, iterations_max):
+    """Simplexe dual : base duale réalisable (coûts réduits <= 0), b quelconque."""
+    for iteration in range(iterations_max):
+        ligne = np.argmin(T[1:, -1])
+        if T[1 + ligne, -1] >= -TOLERANCE:
+            return "Optimal", iteration
+        r = T[1 + ligne, :-1]
+        candidates = np.flatnonzero(r < -TOLERANCE)
+        if candidates.size == 0:
+            return "Infeasible", iteration
+        colonne = candidates[np.argmin(T[0, candidates] / r[candidates])]
+        _pivoter(T, 1 + ligne, colonne)
+        base[ligne] = colonne
+    return "Not Solved", iterations_max
+
+
+def _couts(T, base, modele, n):
+    """Ligne 0 : coûts réduits de la vraie fonction économique (en maximisation)."""
+    c = np.zeros(T.shape[1] - 1)
+    c[:n] = modele.c if modele.sens == "max" else -modele.c
+    T[0, :-1] = c - c[base] @ T[1:, :-1]
+    T[0, -1] = -(c[base] @ T[1:, -1])
+
+
+def _phase2(T, base, modele, n, iterations_max, regle, echeance, journal=None):
+    _couts(T, base, modele, n)
+    statut, iterations = _iterer(T, base, iterations_max, regle, echeance, journal)
+    if statut == "Unbounded":
+        return statut, None, iterations
+    x = np.zeros(T.shape[1] - 1)
+    x[base] = T[1:, -1]
+    return statut, x[:n], iterations
+
+
+def _simplexe(modele, iterations_max=None, regle="dantzig", limite_temps=None, journal=None):
+    echeance = None if limite_temps is None else time.perf_counter() + limite_temps
+    T, base, n, artificielles = tableau_initial(modele)
+    m = T.shape[0] - 1
+    iterations_max = iterations_max or 50 * (m + T.shape[1])
+    total = 0
+
+    # Phase 1 : maximiser -Σ artificielles
+    if artificielles.size:
+        lignes_art = np.flatnonzero(np.isin(base, artificielles))
+        T[0, :] = T[1 + lignes_art].sum(axis=0)
+        T[0, artificielles] = 0.0
+        statut, total = _iterer(T, base, iterations_max, regle, echeance, journal, phase=1)
+        if statut == "Not Solved":
+            return statut, None, total, None
+        if T[0, -1] > TOLERANCE * (1 + np.abs(T[1:, -1]).sum()):
+            return "Infeasible", None, total, None
+
+        # Sortie des artificielles restées en base au niveau zéro
+        conservees = []
+        for i in range(m):
+            if base[i] in artificielles:
+                candidates = np.flatnonzero(np.abs(T[1 + i, :artificielles[0]]) > TOLERANCE)
+                if candidates.size == 0:
+                    continue  # ligne redondante
+                if journal is not None:
+                    journal.noter(1, T, base, candidates[0], 1 + i)
+                _pivoter(T, 1 + i, candidates[0])
+                base[i] = candidates[0]
+            conservees.append(i)
+        T = np.delete(T, artificielles, axis=1)
+        T = T[np.concatenate([[0], 1 + np.array(conservees, dtype=int)])]
+        base = base[conservees]
+        if journal is not None:
+            journal.colonnes = [nom for j, nom in enumerate(journal.colonnes)
+                                if j not in set(artificielles.tolist())]
+
+    statut, x, iterations = _phase2(T, base, modele, n, iterations_max - total, regle, echeance,
+                                    journal)
+    # Base finale réutilisable seulement si aucune ligne redondante n'a été retirée
+    return statut, x, total + iterations, base if len(base) == m else None
+
+
+def simplexe(modele, iterations_max=None, regle="dantzig", limite_temps=None):
+    """Résout le modèle ; renvoie (statut, x, nombre d'itérations).
+
+    `regle` vaut "dantzig" (avec repli sur Bland) ou "bland" (Bland seul).
+    Interrompu en phase 2 (itérations ou `limite_temps`), le simplexe rend
+    le sommet réalisable courant avec le statut "Not Solved".
+    """
+    return _simplexe(modele, iterations_max, regle, limite_temps)[:3]
+
+
+def simplexe_detaille(modele, iterations_max=None, regle="bland", cellules_max=CELLULES_MAX):
+    """Simplexe pas à pas : renvoie (statut, x, liste des Etape).
+
+    Chaque pivot est consigné avec le tableau sur lequel il porte, puis le
+    tableau final de chaque phase. Au-delà de `cellules_max` cellules, les
+    tableaux ne sont plus copiés (Etape.tableau vaut None) : seuls les
+    pivots restent, ce qui garde le suivi possible sur de grands modèles.
+    """
+    journal = Journal(modele, cellules_max)
+    statut, x, _, _ = _simplexe(modele, iterations_max, regle, journal=journal)
+    return statut, x, journal.etapes
+
+
+def _refactoriser(T, base):
+    """Exprime le tableau dans la `base` donnée (T <- B⁻¹ T, sur place) ; None si singulière.
+
+    Une factorisation LU remplace les pivots successifs d'un démarrage à froid.
+    """
+    try:
+        T[1:] = np.linalg.solve(T[1:, base], T[1:])
+    except np.linalg.LinAlgError:
+        return None
+    return base.copy() if np.all(np.isfinite(T)) else None
+
+
+def simplexe_a_chaud(modele, base=None, iterations_max=None):
+    """Simplexe repartant de la `base` d'une résolution précédente.
+
+    La base (colonnes structurelles et d'écart) est refactorisée sur le
+    nouveau modèle. Encore réalisable (coûts modifiés), elle sert de départ
+    au simplexe primal ; encore optimale pour les coûts mais plus réalisable
+    (second membre modifié), le simplexe dual la répare. Sinon on repart de
+    zéro. Renvoie (statut, x, itérations, base finale, à chaud ?).
+    """
+    T, _, n, artificielles = tableau_initial(modele)
+    T = np.delete(T, artificielles, axis=1)
+    m = T.shape[0] - 1
+    iterations_max = iterations_max or 50 * (m + T.shape[1])
+    if base is not None and len(base) == m and np.all(base < T.shape[1] - 1) \
+            and len(set(base.tolist())) == m:
+        base = _refactoriser(T, base)
+        if base is not None:
+            _couts(T, base, modele, n)
+            iterations = 0
+            if np.any(T[1:, -1] < -TOLERANCE) and np.all(T[0, :-1] <= TOLERANCE):
+                statut, iterations = _iterer_dual(T, base, iterations_max)
+                if statut == "Infeasible":
+                    return statut, None, iterations, None, True
+            if np.all(T[1:, -1] >= -TOLERANCE):
+                T[1:, -1] = np.maximum(T[1:, -1], 0.0)
+                statut, x, suite = _phase2(T, base, modele, n, iterations_max - iterations,
+                                           "dantzig", None)
+                return statut, x, iterations + suite, base, True
+    statut, x, iterations, base = _simplexe(modele, iterations_max)
+    return statut, x, iterations, base, False
+
+
+def resoudre_simplexe(modele, limite_temps=None, regle="dantzig"):
+    """Interface commune des solveurs : renvoie un Resultat."""
+    if modele.mip:
+        raise ValueError("Le simplexe NumPy ne traite pas les variables entières.")
+    debut = time.perf_counter()
+    statut, x, _ = simplexe(modele, limite_temps=limite_temps, regle=regle)
+    temps = time.perf_counter() - debut
+    if x is None:
+        return Resultat(statut, dict.fromkeys(modele.variables), None, temps,
+                        methode="Simplexe NumPy")
+    valeurs = {var: float(v) + 0.0 for var, v in zip(modele.variables, x)}
+    return Resultat(statut, valeurs, float(modele.c @ x), temps, methode="Simplexe NumPy")
+
+
+def _style_pivot(df, etape):
+    """Surligne la colonne entrante, la ligne sortante et le pivot."""
+    styles = pd.DataFrame("", index=df.index, columns=df.columns)
+    if etape.colonne is not None:
+        styles.iloc[:, etape.colonne] = "background-color: #FFF3B0"
+    if etape.ligne is not None:
+        styles.iloc[etape.ligne, :] = "background-color: #CDE7FF"
+        if etape.colonne is not None:
+            styles.iloc[etape.ligne, etape.colonne] = "background-color: #FFB3B3; font-weight: bold"
+    return styles
+
+
+def afficher_etapes(etapes, etapes_max=ETAPES_AFFICHEES):
+    """Résumé des pivots puis, pour les premières étapes, le tableau correspondant."""
+    # Seule fonction d'affichage du module : Streamlit n'est chargé qu'à l'appel
+    import streamlit as st
+
+    st.write("**Itérations du simplexe (règle de Bland) :**")
+    st.dataframe(pd.DataFrame({
+        "Phase": [e.phase for e in etapes],
+        "Entrante": [e.entrante or "—" for e in etapes],
+        "Sortante": [e.sortante or "—" for e in etapes],
+        "Valeur": [e.valeur for e in etapes],
+    }).round(4), hide_index=True)
+
+    for k, etape in enumerate(etapes[:etapes_max]):
+        if etape.tableau is None:
+            st.info("Tableaux trop grands pour être affichés : seuls les pivots sont listés.")
+            break
+        if etape.entrante is None:
+            titre = f"Phase {etape.phase} • tableau final"
+        elif etape.sortante is None:
+            titre = f"Phase {etape.phase} • {etape.entrante} entre, aucune sortante : non borné"
+        else:
+            titre = f"Phase {etape.phase} • étape {k + 1} : {etape.entrante} entre, {etape.sortante} sort"
+        with st.expander(titre):
+            df = pd.DataFrame(etape.tableau, columns=etape.colonnes,
+                              index=["w" if etape.phase == 1 else "z"] + etape.base)
+            st.dataframe(df.round(4).style.apply(_style_pivot, etape=etape, axis=None))
+    if len(etapes) > etapes_max:
+        st.caption(f"{len(etapes) - etapes_max} étapes suivantes non détaillées.")
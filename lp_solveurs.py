@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Solveurs interchangeables pour un ModeleLineaire.
+
+Tous partagent la même interface : solveur(modele) -> Resultat.
+- CBC (PuLP) : solveur de référence, lancé en sous-processus ;
+- HiGHS (SciPy) : appelé en mémoire sur la matrice creuse, sans traduction
+  (linprog, ou milp pour un modèle en nombres entiers) ;
+- Simplexe NumPy : repli sans dépendance, réservé aux petits modèles continus.
+"""
+
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import Bounds, LinearConstraint, linprog, milp
+
+from lp_core import Resultat, ecart_relatif, est_realisable, resoudre
+from lp_simplexe import resoudre_simplexe
+from lp_sommets import resoudre_2d
+
+# Codes de retour de linprog -> statuts PuLP
+_STATUTS_HIGHS = {0: "Optimal", 1: "Not Solved", 2: "Infeasible", 3: "Unbounded", 4: "Not Solved"}
+
+
+def matrices_highs(modele):
+    """Découpe A en (A_ub, b_ub, A_eq, b_eq) ; les lignes '>=' sont négativées."""
+    ops = np.asarray(modele.operateurs)
+    egalites = ops == '=='
+    signes = np.where(ops == '>=', -1.0, 1.0)[~egalites]
+    A_ub = sp.diags(signes) @ modele.A[~egalites]
+    b_ub = signes * modele.b[~egalites]
+    return A_ub.tocsr(), b_ub, modele.A[egalites], modele.b[egalites]
+
+
+def resoudre_highs_mip(modele, limite_temps=None, ecart_mip=None):
+    """Branch and bound HiGHS (scipy.optimize.milp) : incumbent, borne et écart."""
+    debut = time.perf_counter()
+    ops = np.asarray(modele.operateurs)
+    contraintes = LinearConstraint(modele.A, np.where(ops == '<=', -np.inf, modele.b),
+                                   np.where(ops == '>=', np.inf, modele.b))
+    c = -modele.c if modele.sens == "max" else modele.c
+    construction = time.perf_counter() - debut
+
+    options = {} if limite_temps is None else {"time_limit": float(limite_temps)}
+    if ecart_mip is not None:
+        options["mip_rel_gap"] = float(ecart_mip)
+    debut = time.perf_counter()
+    arguments = dict(integrality=modele.entieres.astype(int), bounds=Bounds(0, np.inf),
+                     constraints=contraintes if modele.n_contraintes else None)
+    sortie = milp(c, options=options, **arguments)
+    if sortie.status == 4 and "unbounded" in sortie.message.lower():
+        # « Irréalisable ou non borné » : on tranche par la seule réalisabilité (objectif nul)
+        verification = milp(np.zeros_like(c), options=options, **arguments)
+        if verification.status in (0, 2):
+            sortie.status, sortie.x = (3 if verification.status == 0 else 2), None
+    temps = time.perf_counter() - debut
+
+    statut = _STATUTS_HIGHS.get(sortie.status, "Not Solved")
+    if sortie.x is None or statut not in ("Optimal", "Not Solved"):
+        return Resultat(statut, dict.fromkeys(modele.variables), None, temps,
+                        methode="HiGHS", construction=construction)
+    objectif = float(modele.c @ sortie.x)
+    borne = getattr(sortie, "mip_dual_bound", None)
+    borne = None if borne is None else float(-borne if modele.sens == "max" else borne)
+    valeurs = {var: float(v) + 0.0 for var, v in zip(modele.variables, sortie.x)}
+    return Resultat(statut, valeurs, objectif, temps, methode="HiGHS", construction=construction,
+                    borne=borne, ecart=ecart_relatif(objectif, borne))
+
+
+def resoudre_highs(modele, limite_temps=None, threads=None, ecart_mip=None):
+    """Résout le modèle avec HiGHS (scipy.optimize.linprog, ou milp si entier).
+
+    `threads` est accepté pour l'interface commune mais SciPy ne l'expose pas.
+    """
+    if modele.mip:
+        return resoudre_highs_mip(modele, limite_temps, ecart_mip)
+    debut = time.perf_counter()
+    A_ub, b_ub, A_eq, b_eq = matrices_highs(modele)
+    c = -modele.c if modele.sens == "max" else modele.c
+    construction = time.perf_counter() - debut
+
+    arguments = dict(A_ub=A_ub if A_ub.shape[0] else None, b_ub=b_ub if A_ub.shape[0] else None,
+                     A_eq=A_eq if A_eq.shape[0] else None, b_eq=b_eq if A_eq.shape[0] else None,
+                     bounds=(0, None), method="highs")
+    options = {} if limite_temps is None else {"time_limit": float(limite_temps)}
+    debut = time.perf_counter()
+    sortie = linprog(c, options=options, **arguments)
+    if sortie.status == 2:
+        # Le présolve de HiGHS peut déclarer irréalisable un problème non borné
+        verification = linprog(c, options={**options, "presolve": False}, **arguments)
+        if verification.status in (0, 3):
+            sortie = verification
+    temps = time.perf_counter() - debut
+
+    statut = _STATUTS_HIGHS.get(sortie.status, "Not Solved")
+    # Limite atteinte : on ne garde le point courant que s'il est réalisable
+    incomplet = statut == "Not Solved" and sortie.x is not None and est_realisable(modele, sortie.x)
+    if statut != "Optimal" and not incomplet:
+        return Resultat(statut, dict.fromkeys(modele.variables), None, temps,
+                        methode="HiGHS", construction=construction)
+    valeurs = {var: float(v) + 0.0 for var, v in zip(modele.variables, sortie.x)}
+    return Resultat(statut, valeurs, float(modele.c @ sortie.x), temps,
+                    methode="HiGHS", construction=construction)
+
+
+SOLVEURS = {
+    "CBC (PuLP)": resoudre,
+    "HiGHS (SciPy)": resoudre_highs,
+    "Simplexe NumPy": resoudre_simplexe,
+}
+
+SOLVEURS_2D = {"Sommets NumPy (2 variables)": resoudre_2d, **SOLVEURS}
+
+# Solveurs capables de traiter des variables entières
+SOLVEURS_MIP = (resoudre, resoudre_highs)
+
+
+def choisir_solveur(solveurs=SOLVEURS, cle="solveur"):
+    """Liste déroulante de la barre latérale ; renvoie la fonction choisie."""
+    # Import local : resoudre_lot charge les solveurs sans Streamlit
+    import streamlit as st
+
+    nom = st.sidebar.selectbox("Solveur", list(solveurs), key=cle)
+    return solveurs[nom]
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Résolution directe des programmes linéaires à deux variables.
+
+Toutes les paires de droites frontières (contraintes et axes x = 0, y = 0)
+sont intersectées d'un seul coup avec NumPy ; on garde les sommets
+réalisables et on évalue la fonction économique dessus, sans lancer CBC.
+Les mêmes demi-plans servent à construire le polygone réalisable exact
+pour l'affichage graphique.
+"""
+
+import time
+
+import numpy as np
+
+from lp_core import Resultat, resoudre
+
+TOLERANCE = 1e-9
+
+
+def demi_plans(modele):
+    """Renvoie (G, h) tels que la zone réalisable soit {p : G p <= h}."""
+    A = modele.A.toarray()
+    ops = np.asarray(modele.operateurs)
+    b = modele.b
+
+    G = [A[ops != '>='], -A[ops != '<=']]
+    h = [b[ops != '>='], -b[ops != '<=']]
+    # Non-négativité : -x_j <= 0 (une ligne par variable, quel que soit leur nombre)
+    G.append(-np.eye(A.shape[1]))
+    h.append(np.zeros(A.shape[1]))
+    return np.vstack(G), np.concatenate(h)
+
+
+def sommets(G, h):
+    """Intersecte toutes les paires de droites et garde les points réalisables."""
+    i, j = np.triu_indices(len(G), k=1)
+    a1, b1, c1 = G[i, 0], G[i, 1], h[i]
+    a2, b2, c2 = G[j, 0], G[j, 1], h[j]
+
+    det = a1 * b2 - a2 * b1
+    ok = np.abs(det) > TOLERANCE
+    det = det[ok]
+    points = np.column_stack([
+        (c1[ok] * b2[ok] - c2[ok] * b1[ok]) / det,
+        (a1[ok] * c2[ok] - a2[ok] * c1[ok]) / det,
+    ])
+
+    echelle = 1 + np.abs(h)
+    realisables = np.all(points @ G.T <= h + TOLERANCE * echelle, axis=1)
+    return points[realisables]
+
+
+def _couper(polygone, g, h):
+    """Sutherland-Hodgman : garde la partie du polygone où g·p <= h."""
+    s = polygone @ g - h
+    suivants = np.roll(polygone, -1, axis=0)
+    s_suivants = np.roll(s, -1)
+    tolerance = TOLERANCE * (1 + abs(h))
+    dedans = s <= tolerance
+    croise = dedans != (s_suivants <= tolerance)
+    t = s / np.where(croise, s - s_suivants, 1.0)
+    intersections = polygone + t[:, None] * (suivants - polygone)
+    # Pour chaque arête : le sommet s'il est dedans, puis le point de traversée
+    candidats = np.stack([polygone, intersections], axis=1).reshape(-1, 2)
+    return candidats[np.stack([dedans, croise], axis=1).ravel()]
+
+
+def polygone_realisable(G, h, cadre):
+    """Intersection des demi-plans G p <= h avec le rectangle [0, X] x [0, Y].
+
+    Renvoie les sommets du polygone convexe, dans l'ordre du contour
+    (tableau vide si la zone réalisable ne coupe pas le cadre). Une zone
+    non bornée est tronquée au cadre.
+    """
+    X, Y = cadre
+    polygone = np.array([[0.0, 0.0], [X, 0.0], [X, Y], [0.0, Y]])
+    for g, valeur in zip(G, h):
+        if len(polygone) == 0:
+            break
+        polygone = _couper(polygone, g, valeur)
+    return polygone
+
+
+def cadre_affichage(points, solution=None, marge=1.5, defaut=10.0):
+    """Dimensions (X, Y) d'un cadre contenant les sommets et la solution."""
+    if solution is not None and None not in solution:
+        points = np.vstack([points.reshape(-1, 2), np.asarray(solution, dtype=float)])
+    if len(points) == 0 or not np.any(points > TOLERANCE):
+        return defaut, defaut
+    x_max, y_max = points.max(axis=0)
+    # Un sommet sur un axe ne doit pas écraser l'autre dimension
+    return marge * max(x_max, 0.2 * y_max), marge * max(y_max, 0.2 * x_max)
+
+
+def direction_non_bornee(G, c):
+    """Cherche une direction d (G d <= 0) qui améliore indéfiniment c·d.
+
+    En dimension 2, les rayons extrêmes du cône de récession sont portés
+    par les normales tournées de 90° des demi-plans.
+    """
+    normales = np.column_stack([-G[:, 1], G[:, 0]])
+    directions = np.vstack([normales, -normales])
+    longueurs = np.linalg.norm(directions, axis=1)
+    directions = directions[longueurs > TOLERANCE] / longueurs[longueurs > TOLERANCE, None]
+
+    admissibles = np.all(directions @ G.T <= TOLERANCE, axis=1)
+    return np.any(directions[admissibles] @ c > TOLERANCE)
+
+
+def resoudre_sommets(modele):
+    """Résout un modèle à 2 variables par énumération des sommets.
+
+    Renvoie None pour les entrées dégénérées (ligne de contrainte nulle,
+    valeurs non finies), que l'appelant confie alors à PuLP.
+    """
+    debut = time.perf_counter()
+    if modele.n_variables != 2:
+        return None
+    G, h = demi_plans(modele)
+    if not (np.all(np.isfinite(G)) and np.all(np.isfinite(h))):
+        return None
+    if np.any(np.all(np.abs(G) <= TOLERANCE, axis=1)):
+        return None
+
+    # On maximise toujours : min c·x = -max (-c)·x
+    c = modele.c if modele.sens == "max" else -modele.c
+    points = sommets(G, h)
+
+    if len(points) == 0:
+        statut, valeurs, objectif = "Infeasible", dict.fromkeys(modele.variables), None
+    elif direction_non_bornee(G, c):
+        statut, valeurs, objectif = "Unbounded", dict.fromkeys(modele.variables), None
+    else:
+        meilleur = points[np.argmax(points @ c)]
+        statut = "Optimal"
+        valeurs = {var: float(v) + 0.0 for var, v in zip(modele.variables, meilleur)}
+        objectif = float(meilleur @ modele.c)
+
+    return Resultat(statut, valeurs, objectif, time.perf_counter() - debut,
+                    methode="Sommets NumPy")
+
+
+def resoudre_2d(modele):
+    """Voie rapide NumPy, avec repli sur CBC pour les cas dégénérés ou entiers."""
+    resultat = None if modele.mip else resoudre_sommets(modele)
+    return resultat if resultat is not None else resoudre(modele)
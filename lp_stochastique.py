@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+Programme linéaire stochastique à deux niveaux, par scénarios de seconds membres.
+
+Chaque scénario s (probabilité pₛ) remplace le vecteur b du modèle. Les
+variables de premier niveau x sont décidées avant l'aléa, les autres
+(recours y) après, scénario par scénario :
+- équivalent déterministe (RP) : un seul modèle, x commun et une copie
+  yₛ par scénario, objectif c₁x + Σ pₛ c₂yₛ ;
+- problème en valeur moyenne (EV) : b remplacé par Σ pₛ bₛ ; sa décision
+  x̄ est ensuite évaluée dans chaque scénario (EEV), d'où la valeur de la
+  solution stochastique VSS = |RP - EEV| ;
+- attente de l'information (WS) : chaque scénario résolu seul, d'où la
+  valeur de l'information parfaite EVPI = |WS - RP|.
+Les résolutions par scénario partent dans un pool de processus : le modèle
+est envoyé une fois à chaque processus, chaque tâche ne transporte que son b.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+
+import numpy as np
+import scipy.sparse as sp
+
+from lp_core import ModeleLineaire
+from lp_solveurs import resoudre_highs
+
+# En dessous, le démarrage du pool coûte plus que les résolutions elles-mêmes
+SEUIL_PARALLELE = 8
+
+_MODELE = None
+_SOLVEUR = resoudre_highs
+
+
+@dataclass
+class AnalyseStochastique:
+    """Résultats RP, EV, EEV et WS ; listes alignées sur les scénarios."""
+    probabilites: np.ndarray
+    rp: object = None
+    ev: object = None
+    valeurs_rp: list = None
+    eev: list = None
+    ws: list = None
+
+    def esperance(self, resultats):
+        """Σ pₛ zₛ ; nan si un scénario n'a pas d'optimum, None si non calculé."""
+        if resultats is None:
+            return None
+        if any(r.statut != "Optimal" for r in resultats):
+            return float("nan")
+        return float(self.probabilites @ [r.objectif for r in resultats])
+
+
+# ==============================
+# Modèles dérivés
+# ==============================
+def equivalent_deterministe(modele, premier_niveau, seconds_membres, probabilites):
+    """Modèle RP : x (premier niveau) commun, une copie y_s1, y_s2... des autres par scénario."""
+    masque = np.isin(modele.variables, list(premier_niveau))
+    A = modele.A.tocsc()
+    A1, A2 = A[:, masque], A[:, ~masque]
+    n_scenarios = len(seconds_membres)
+    recours = [var for var in modele.variables if var not in premier_niveau]
+    variables = [var for var in modele.variables if var in premier_niveau] + \
+        [f"{var}_s{s + 1}" for s in range(n_scenarios) for var in recours]
+    matrice = sp.hstack([sp.vstack([A1] * n_scenarios), sp.kron(sp.identity(n_scenarios), A2)])
+    c = np.concatenate([modele.c[masque], np.kron(probabilites, modele.c[~masque])])
+    entieres = None if modele.entieres is None else \
+        np.concatenate([modele.entieres[masque], np.tile(modele.entieres[~masque], n_scenarios)])
+    return ModeleLineaire(modele.sens, variables, c, matrice.tocsr(),
+                          np.concatenate(seconds_membres).astype(float),
+                          list(modele.operateurs) * n_scenarios, entieres)
+
+
+def modele_fixe(modele, valeurs):
+    """Modèle où les variables de `valeurs` sont fixées (lignes x_j == valeur ajoutées en fin)."""
+    index = [modele.variables.index(var) for var in valeurs]
+    fixation = sp.csr_matrix((np.ones(len(index)), (np.arange(len(index)), index)),
+                             shape=(len(index), modele.n_variables))
+    return replace(modele, A=sp.vstack([modele.A, fixation]).tocsr(),
+                   b=np.concatenate([modele.b, list(valeurs.values())]),
+                   operateurs=list(modele.operateurs) + ["=="] * len(index))
+
+
+# ==============================
+# Résolutions par scénario (pool)
+# ==============================
+def _initialiser(modele, solveur):
+    global _MODELE, _SOLVEUR
+    _MODELE, _SOLVEUR = modele, solveur
+
+
+def _resoudre_scenario(b):
+    # Les lignes ajoutées en fin de modèle (fixations) gardent leur second membre
+    return _SOLVEUR(replace(_MODELE, b=np.concatenate([b, _MODELE.b[len(b):]])))
+
+
+def resoudre_scenarios(modele, seconds_membres, solveur=resoudre_highs, processus=None):
+    """Un Resultat par vecteur b, dans l'ordre des scénarios.
+
+    `solveur` doit être une fonction de module (transmise aux processus).
+    Par défaut, un processus par cœur au-delà de SEUIL_PARALLELE scénarios.
+    """
+    if processus is None:
+        processus = 1 if len(seconds_membres) < SEUIL_PARALLELE else os.cpu_count() or 1
+    if processus == 1:
+        _initialiser(modele, solveur)
+        return [_resoudre_scenario(b) for b in seconds_membres]
+    with ProcessPoolExecutor(max_workers=processus, initializer=_initialiser,
+                             initargs=(modele, solveur)) as pool:
+        return list(pool.map(_resoudre_scenario, seconds_membres,
+                             chunksize=max(1, len(seconds_membres) // (4 * processus))))
+
+
+# ==============================
+# Analyse complète
+# ==============================
+def analyser_scenarios(modele, premier_niveau, seconds_membres, probabilites,
+                       solveur=resoudre_highs, deterministe=True, processus=None):
+    """Analyse par scénarios ; sans `deterministe`, seuls les scénarios indépendants (WS).
+
+    Les probabilités sont normalisées à 1. ValueError si l'une est négative.
+    """
+    probabilites = np.asarray(probabilites, dtype=float)
+    if np.any(probabilites < 0) or probabilites.sum() <= 0:
+        raise ValueError("Probabilités positives, de somme non nulle, attendues.")
+    probabilites = probabilites / probabilites.sum()
+    seconds_membres = [np.asarray(b, dtype=float) for b in seconds_membres]
+    analyse = AnalyseStochastique(probabilites)
+    analyse.ws = resoudre_scenarios(modele, seconds_membres, solveur, processus)
+    if not deterministe:
+        return analyse
+
+    rp = equivalent_deterministe(modele, premier_niveau, seconds_membres, probabilites)
+    analyse.rp = solveur(rp)
+    if analyse.rp.statut == "Optimal":
+        # Valeur de la solution RP dans chaque scénario : c₁x + c₂yₛ
+        masque = np.isin(modele.variables, list(premier_niveau))
+        x = np.array([analyse.rp.valeurs[var] for var in rp.variables])
+        x1, y = x[:masque.sum()], x[masque.sum():].reshape(len(seconds_membres), -1)
+        analyse.valeurs_rp = (modele.c[masque] @ x1 + y @ modele.c[~masque]).tolist()
+
+    analyse.ev = solveur(replace(modele, b=sum(p * b for p, b in zip(probabilites, seconds_membres))))
+    if analyse.ev.statut == "Optimal":
+        decision = {var: analyse.ev.valeurs[var] for var in modele.variables if var in premier_niveau}
+        analyse.eev = resoudre_scenarios(modele_fixe(modele, decision), seconds_membres, solveur,
+                                         processus)
+    return analyse
+
+
+def vss(analyse, sens):
+    """Valeur de la solution stochastique (>= 0) ; inf si la décision EV est irréalisable."""
+    rp, eev = analyse.rp, analyse.esperance(analyse.eev)
+    if rp is None or rp.statut != "Optimal" or eev is None:
+        return None
+    if np.isnan(eev):
+        return float("inf")
+    return (rp.objectif - eev) if sens == "max" else (eev - rp.objectif)
+
+
+def evpi(analyse, sens):
+    """Valeur espérée de l'information parfaite (>= 0)."""
+    rp, ws = analyse.rp, analyse.esperance(analyse.ws)
+    if rp is None or rp.statut != "Optimal" or ws is None or np.isnan(ws):
+        return None
+    return (ws - rp.objectif) if sens == "max" else (rp.objectif - ws)
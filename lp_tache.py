@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Résolution en arrière-plan : limite de temps, suivi et annulation.
+
+Le solveur tourne dans un processus séparé ; le script Streamlit se
+contente d'interroger le tube de retour à intervalles réguliers. Toute
+réexécution du script (bouton « Annuler », modification d'un widget)
+interrompt la boucle d'attente, et le processus est alors arrêté.
+"""
+
+import multiprocessing
+import os
+import signal
+import tempfile
+import time
+
+from lp_core import Resultat, ecart_relatif, lire_journal_cbc
+
+INTERVALLE = 0.1
+# Délai laissé au solveur, au-delà de sa limite, pour rendre sa meilleure solution
+MARGE = 5.0
+
+
+def _executer(connexion, solveur, modele, options):
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()    # groupe propre : l'annulation atteint aussi CBC
+    try:
+        connexion.send(solveur(modele, **options))
+    except Exception as e:
+        connexion.send(e)
+    finally:
+        connexion.close()
+
+
+def _arreter(processus):
+    if not processus.is_alive():
+        return
+    try:
+        os.killpg(processus.pid, signal.SIGTERM)
+    except (AttributeError, ProcessLookupError, PermissionError):
+        processus.terminate()    # Windows, ou groupe pas encore créé
+
+
+class ResolutionArrierePlan:
+    """Solveur exécuté dans un processus séparé.
+
+    S'utilise comme le solveur qu'il enveloppe (instance(modele) -> Resultat),
+    y compris comme clé du cache. `options` (threads, ecart_mip...) sont
+    transmises au solveur. `suivi(ecoule, solution, borne)` est appelé à
+    chaque interrogation ; solution et borne ne sont connues que si
+    `journal` est vrai (CBC en nombres entiers, journal relu au vol). Si la
+    limite est dépassée de plus de MARGE secondes, le processus est arrêté
+    et le statut est "Not Solved".
+    """
+
+    def __init__(self, solveur, limite_temps=None, suivi=None, intervalle=INTERVALLE,
+                 journal=False, **options):
+        self.solveur = solveur
+        self.limite_temps = limite_temps
+        self.suivi = suivi
+        self.intervalle = intervalle
+        self.journal = journal
+        self.options = options
+        self.__module__ = solveur.__module__
+        # Les options qui changent la réponse (écart MIP...) changent la clé du cache
+        self.__name__ = solveur.__name__ + (repr(sorted(options.items())) if options else "")
+
+    def __call__(self, modele):
+        options = dict(self.options)
+        if self.limite_temps is not None:
+            options["limite_temps"] = self.limite_temps
+        chemin = None
+        if self.journal:
+            descripteur, chemin = tempfile.mkstemp(suffix=".log")
+            os.close(descripteur)
+            options["journal"] = chemin
+
+        reception, envoi = multiprocessing.Pipe(duplex=False)
+        processus = multiprocessing.Process(target=_executer, daemon=True,
+                                            args=(envoi, self.solveur, modele, options))
+        debut = time.perf_counter()
+        processus.start()
+        envoi.close()
+        try:
+            while not reception.poll(self.intervalle):
+                ecoule = time.perf_counter() - debut
+                if self.limite_temps is not None and ecoule > self.limite_temps + MARGE:
+                    return Resultat("Not Solved", dict.fromkeys(modele.variables), None, ecoule,
+                                    methode="Arrêt forcé")
+                if self.suivi is not None:
+                    self.suivi(ecoule, *self._progression(chemin, modele.sens))
+            try:
+                resultat = reception.recv()
+            except EOFError:    # processus disparu sans réponse
+                return Resultat("Not Solved", dict.fromkeys(modele.variables), None,
+                                time.perf_counter() - debut, methode="Arrêt forcé")
+            if isinstance(resultat, Exception):
+                raise resultat
+            return resultat
+        finally:
+            # Fin normale, limite dépassée, ou script interrompu par une réexécution
+            _arreter(processus)
+            processus.join()
+            reception.close()
+            if chemin is not None and os.path.exists(chemin):
+                os.remove(chemin)
+
+    @staticmethod
+    def _progression(chemin, sens):
+        if chemin is None or not os.path.exists(chemin):
+            return None, None
+        with open(chemin, encoding="utf-8", errors="ignore") as f:
+            return lire_journal_cbc(f.read(), sens)
+
+
+def suivi_streamlit(zone, limite_temps):
+    """Fonction de suivi affichant le temps écoulé (et l'incumbent) dans `zone`."""
+    def suivi(ecoule, solution=None, borne=None):
+        texte = f"⏳ Résolution en cours… {ecoule:.1f} s / {limite_temps:g} s"
+        if solution is not None:
+            texte += f" • meilleure solution {solution:.6g}"
+        if borne is not None:
+            texte += f" • borne {borne:.6g}"
+        ecart = ecart_relatif(solution, borne)
+        if ecart is not None:
+            texte += f" • écart {ecart:.2%}"
+        zone.progress(min(ecoule / limite_temps, 1.0), text=texte)
+    return suivi
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+Problèmes de transport et d'affectation, résolus sans passer par un PL générique.
+
+- Transport (offres, demandes, coûts) : simplexe des transports, c'est-à-dire
+  le simplexe réseau sur le graphe biparti sources -> destinations. La base
+  est un arbre couvrant de m + n - 1 cases, de potentiels (u, v) ; chaque
+  itération calcule les coûts réduits de toutes les cases d'un seul calcul
+  NumPy, puis fait circuler θ sur le cycle créé par la case entrante.
+  Départ par la méthode du moindre coût.
+- Affectation (matrice de coûts) : algorithme hongrois de SciPy
+  (linear_sum_assignment, O(n³)).
+Les mêmes instances peuvent être traduites en ModeleLineaire pour mesurer
+le gain sur la résolution générique.
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from lp_core import assembler_modele
+
+TOLERANCE = 1e-9
+DEGENERES_MAX = 50
+
+
+@dataclass
+class Plan:
+    """Solution d'un problème de transport ou d'affectation."""
+    statut: str
+    flux: np.ndarray = None
+    cout: float = None
+    temps: float = 0.0
+    iterations: int = 0
+    methode: str = ""
+
+
+# ==============================
+# Transport
+# ==============================
+def _moindre_cout(couts, offres, demandes):
+    """Base initiale : cases prises par coût croissant, une ligne ou colonne épuisée à chaque fois.
+
+    Renvoie (flux, masque des cases de base) ; la base compte m + n - 1 cases.
+    """
+    m, n = couts.shape
+    offres, demandes = offres.copy(), demandes.copy()
+    # Offres fractionnaires : les restes d'arrondi (~1e-16) ne doivent pas décider
+    echelle = TOLERANCE * (1 + max(offres.max(), demandes.max()))
+    flux = np.zeros((m, n))
+    base = np.zeros((m, n), dtype=bool)
+    lignes_actives, colonnes_actives = np.ones(m, dtype=bool), np.ones(n, dtype=bool)
+    restantes = m
+    for case in np.argsort(couts, axis=None, kind="stable"):
+        i, j = divmod(int(case), n)
+        if not (lignes_actives[i] and colonnes_actives[j]):
+            continue
+        q = min(offres[i], demandes[j])
+        ligne_epuisee = offres[i] <= demandes[j] + echelle
+        flux[i, j], base[i, j] = q, True
+        offres[i] -= q
+        demandes[j] -= q
+        if ligne_epuisee and restantes > 1:
+            lignes_actives[i] = False
+            restantes -= 1
+        else:
+            colonnes_actives[j] = False
+            if not colonnes_actives.any():
+                break
+    _completer_arbre(couts, base)
+    return flux, base
+
+
+def _completer_arbre(couts, base):
+    """Relie les composantes de la base par des cases de flux nul (coût croissant).
+
+    Garantit un arbre couvrant de m + n - 1 cases même si le moindre coût
+    s'est arrêté avec des lignes ou colonnes hors de la base.
+    """
+    m, n = couts.shape
+    racines = list(range(m + n))
+
+    def racine(noeud):
+        while racines[noeud] != noeud:
+            racines[noeud] = racines[racines[noeud]]
+            noeud = racines[noeud]
+        return noeud
+
+    composantes = m + n
+    for i, j in np.argwhere(base).tolist():
+        a, b = racine(i), racine(m + j)
+        if a != b:
+            racines[a] = b
+            composantes -= 1
+    if composantes == 1:
+        return
+    for case in np.argsort(couts, axis=None, kind="stable"):
+        i, j = divmod(int(case), n)
+        a, b = racine(i), racine(m + j)
+        if a != b:
+            racines[a] = b
+            base[i, j] = True
+            composantes -= 1
+            if composantes == 1:
+                return
+
+
+def _enraciner(voisins, racine, parent, profondeur, pere):
+    """Parcourt la composante de `racine` et y fixe parent et profondeur ; renvoie ses nœuds."""
+    parent[racine] = pere
+    profondeur[racine] = 0 if pere < 0 else profondeur[pere] + 1
+    noeuds, file = [racine], deque([racine])
+    while file:
+        noeud = file.popleft()
+        for suivant in voisins[noeud]:
+            if suivant != parent[noeud]:
+                parent[suivant], profondeur[suivant] = noeud, profondeur[noeud] + 1
+                noeuds.append(suivant)
+                file.append(suivant)
+    return noeuds
+
+
+def _potentiels(couts, parent, ordre, m):
+    """u_i + v_j = c_ij sur chaque case de base, avec u_0 = 0."""
+    u, v = np.zeros(m), np.zeros(couts.shape[1])
+    for noeud in ordre[1:]:
+        pere = parent[noeud]
+        if noeud >= m:
+            v[noeud - m] = couts[pere, noeud - m] - u[pere]
+        else:
+            u[noeud] = couts[noeud, pere - m] - v[pere - m]
+    return u, v
+
+
+def _chemin(parent, profondeur, a, b):
+    """Nœuds du chemin de a à b dans l'arbre ; RuntimeError si la base n'est pas connexe."""
+    depuis_a, depuis_b = [a], [b]
+    while a != b:
+        if profondeur[a] == profondeur[b] == 0:
+            raise RuntimeError("Base du simplexe des transports non connexe.")
+        if profondeur[a] >= profondeur[b]:
+            a = parent[a]
+            depuis_a.append(a)
+        else:
+            b = parent[b]
+            depuis_b.append(b)
+    return depuis_a + depuis_b[-2::-1]
+
+
+def simplexe_transport(couts, offres, demandes, iterations_max=None):
+    """Résout un problème équilibré : renvoie (statut, flux, itérations).
+
+    L'arbre (nœuds 0..m-1 : sources, m..m+n-1 : destinations) est tenu à
+    jour d'un pivot à l'autre : seul le sous-arbre détaché par l'arête
+    sortante est ré-enraciné, et ses potentiels décalés du coût réduit de
+    la case entrante.
+    """
+    m, n = couts.shape
+    flux, base = _moindre_cout(couts, offres, demandes)
+    voisins = [set() for _ in range(m + n)]
+    for i, j in np.argwhere(base).tolist():
+        voisins[i].add(m + j)
+        voisins[m + j].add(i)
+    parent, profondeur = [-1] * (m + n), [0] * (m + n)
+    u, v = _potentiels(couts, parent, _enraciner(voisins, 0, parent, profondeur, -1), m)
+
+    echelle = TOLERANCE * (1 + np.abs(couts).max())
+    iterations_max = iterations_max or 50 * m * n
+    reduits = np.empty_like(couts)
+    degeneres = 0
+    for iteration in range(iterations_max):
+        np.subtract(couts, u[:, None], out=reduits)
+        reduits -= v[None, :]
+        entrante = int(np.argmin(reduits))
+        if reduits.flat[entrante] >= -echelle:
+            return "Optimal", flux, iteration
+        # Dantzig ; après une série de pivots dégénérés, premier indice (Bland)
+        if degeneres >= DEGENERES_MAX:
+            entrante = int(np.flatnonzero(reduits < -echelle)[0])
+        i, j = divmod(entrante, n)
+        reduit = reduits[i, j]
+
+        # Cycle : case entrante (+), puis chemin de la source i à la destination j
+        # dans l'arbre, dont les cases alternent -, +, -, ...
+        noeuds = _chemin(parent, profondeur, i, m + j)
+        aretes = list(zip(noeuds, noeuds[1:]))
+        cases = [(a, b - m) if a < m else (b, a - m) for a, b in aretes]
+        lignes, colonnes = np.array(cases).T
+        k = 2 * int(np.argmin(flux[lignes[0::2], colonnes[0::2]]))
+        theta = flux[lignes[k], colonnes[k]]
+        degeneres = degeneres + 1 if theta <= echelle else 0
+        flux[lignes[0::2], colonnes[0::2]] -= theta
+        flux[lignes[1::2], colonnes[1::2]] += theta
+        flux[i, j] = theta
+        flux[lignes[k], colonnes[k]] = 0.0
+
+        # Arête sortante retirée : le côté enfant forme le sous-arbre détaché
+        a, b = aretes[k]
+        voisins[a].discard(b)
+        voisins[b].discard(a)
+        # Le chemin monte de i vers l'ancêtre commun puis descend vers j : si l'enfant
+        # est le premier nœud de l'arête, elle était du côté de i
+        enfant = b if parent[b] == a else a
+        detache, autre = (i, m + j) if enfant == a else (m + j, i)
+        sous_arbre = _enraciner(voisins, detache, parent, profondeur, autre)
+        voisins[i].add(m + j)
+        voisins[m + j].add(i)
+        lignes_s = [x for x in sous_arbre if x < m]
+        colonnes_s = [x - m for x in sous_arbre if x >= m]
+        signe = 1.0 if detache == i else -1.0
+        u[lignes_s] += signe * reduit
+        v[colonnes_s] -= signe * reduit
+    return "Not Solved", flux, iterations_max
+
+
+def resoudre_transport(couts, offres, demandes):
+    """min Σ c_ij x_ij  s.c.  Σ_j x_ij <= offre_i, Σ_i x_ij = demande_j, x >= 0.
+
+    Une offre excédentaire part vers une destination fictive de coût nul ;
+    une demande totale supérieure à l'offre rend le problème irréalisable.
+    """
+    debut = time.perf_counter()
+    couts = np.asarray(couts, dtype=float)
+    offres, demandes = np.asarray(offres, dtype=float), np.asarray(demandes, dtype=float)
+    m, n = couts.shape
+    if offres.shape != (m,) or demandes.shape != (n,):
+        raise ValueError("Dimensions incompatibles entre coûts, offres et demandes.")
+    if np.any(offres < 0) or np.any(demandes < 0):
+        raise ValueError("Offres et demandes doivent être positives.")
+    excedent = offres.sum() - demandes.sum()
+    if excedent < -TOLERANCE * (1 + demandes.sum()):
+        return Plan("Infeasible", temps=time.perf_counter() - debut, methode="Simplexe des transports")
+    if excedent > 0:
+        couts = np.hstack([couts, np.zeros((m, 1))])
+        demandes = np.append(demandes, excedent)
+    else:
+        offres = offres * (demandes.sum() / offres.sum()) if offres.sum() else offres
+
+    statut, flux, iterations = simplexe_transport(couts, offres, demandes)
+    flux = flux[:, :n]
+    return Plan(statut, flux, float((couts[:, :n] * flux).sum()), time.perf_counter() - debut,
+                iterations, "Simplexe des transports")
+
+
+def modele_transport(couts, offres, demandes):
+    """Même problème sous forme de ModeleLineaire (variables x_i_j), pour le solveur générique."""
+    couts = np.asarray(couts, dtype=float)
+    m, n = couts.shape
+    i, j = np.divmod(np.arange(m * n), n)
+    lignes = np.concatenate([i, m + j])
+    colonnes = np.tile(np.arange(m * n), 2)
+    variables = [f"x_{a + 1}_{b + 1}" for a, b in zip(i, j)]
+    return assembler_modele("min", variables, couts.ravel(), lignes, colonnes, np.ones(2 * m * n),
+                            np.concatenate([offres, demandes]), ["<="] * m + ["=="] * n)
+
+
+# ==============================
+# Affectation
+# ==============================
+def resoudre_affectation(couts, maximiser=False):
+    """Affectation de coût minimal (ou de gain maximal) : méthode hongroise.
+
+    Matrice rectangulaire acceptée : chaque ligne (ou chaque colonne, la
+    dimension la plus petite) reçoit exactement une affectation.
+    """
+    debut = time.perf_counter()
+    couts = np.asarray(couts, dtype=float)
+    lignes, colonnes = linear_sum_assignment(couts, maximize=maximiser)
+    flux = np.zeros_like(couts)
+    flux[lignes, colonnes] = 1.0
+    return Plan("Optimal", flux, float(couts[lignes, colonnes].sum()), time.perf_counter() - debut,
+                methode="Méthode hongroise")
+
+
+def modele_affectation(couts, maximiser=False):
+    """Relaxation linéaire de l'affectation (totalement unimodulaire : solution entière)."""
+    couts = np.asarray(couts, dtype=float)
+    m, n = couts.shape
+    i, j = np.divmod(np.arange(m * n), n)
+    lignes = np.concatenate([i, m + j])
+    colonnes = np.tile(np.arange(m * n), 2)
+    # La plus petite dimension est couverte exactement, l'autre au plus une fois
+    operateurs = (["=="] * m + ["<="] * n) if m <= n else (["<="] * m + ["=="] * n)
+    variables = [f"x_{a + 1}_{b + 1}" for a, b in zip(i, j)]
+    return assembler_modele("max" if maximiser else "min", variables, couts.ravel(), lignes,
+                            colonnes, np.ones(2 * m * n), np.ones(m + n), operateurs)
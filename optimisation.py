@@ -5,34 +5,15 @@ Created on Fri Sep 26 12:59:11 2025
 @author: mokrane
 """
 
-import streamlit as st
-from pulp import LpMaximize, LpMinimize, LpProblem, LpVariable, LpStatus
-import re
+import time
 
-# Fonction de parsing pour les expressions linéaires
-def parse_expression(expr):
-    expr = expr.replace(" ", "")
-    terms = re.findall(r'([+-]?[\d.]*[a-zA-Z]+)', expr)
-    parsed = []
-    
-    for term in terms:
-        sign = 1
-        if term.startswith('-'):
-            sign = -1
-            term = term[1:]
-        elif term.startswith('+'):
-            term = term[1:]
-        
-        coeff_part = re.match(r'^[\d.]+', term)
-        var_part = term[len(coeff_part.group()):] if coeff_part else term
-        
-        coeff = float(coeff_part.group()) if coeff_part else 1.0
-        coeff *= sign
-        
-        if var_part:
-            parsed.append((coeff, var_part))
-    
-    return parsed
+import streamlit as st
+from lp_core import analyse_contrainte, analyse_objectif, construire_modele, resoudre
+from lp_solveurs import SOLVEURS_2D, choisir_solveur
+from lp_cache import resoudre_en_cache, afficher_statistiques
+from lp_historique import afficher_historique
+from lp_sensibilite import afficher_sensibilite
+from lp_simplexe import afficher_etapes, simplexe_detaille
 
 # ------------------------
 # Interface Streamlit
@@ -66,6 +47,11 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+zone_cache = st.sidebar.empty()
+afficher_statistiques(zone_cache)
+solveur = choisir_solveur(SOLVEURS_2D)
+afficher_historique()
+
 # Choix max/min et saisie de la fonction objectif
 st.markdown("**Fonction économique  max ou min suivi de :ax + by**")
 objectif = st.text_input("Fonction économique: ")  
@@ -78,71 +64,70 @@ contraintes = []
 for i in range(n_contraintes):
     contrainte = st.text_input(f"Contrainte {i+1} (ex: 2x + 3y <= 12)")  
     if contrainte:
-        for op in ['<=', '>=', '==', '=']:
-            if op in contrainte:
-                lhs, rhs = contrainte.split(op, 1)
-                contraintes.append((lhs.strip(), op.strip(), float(rhs.strip())))
-                break
+        analysee = analyse_contrainte(contrainte)
+        if analysee:
+            contraintes.append(analysee)
+
+comparer_cbc = st.checkbox("Comparer le temps de calcul avec CBC")
+pas_a_pas = st.checkbox("Montrer les itérations du simplexe (tableaux, règle de Bland)")
 
 if st.button("Résoudre"):
     if not objectif:
         st.error("Veuillez entrer une fonction économique valide.")
     else:
         # Type du problème
-        if objectif.lower().startswith("max"):
-            modele_type = LpMaximize
-            expr = objectif[3:].strip()
-        elif objectif.lower().startswith("min"):
-            modele_type = LpMinimize
-            expr = objectif[3:].strip()
-        else:
-            st.error("La fonction doit commencer par 'max' ou 'min'.")
+        try:
+            sens, expr = analyse_objectif(objectif)
+            modele = construire_modele(sens, expr, contraintes)
+        except ValueError as e:
+            st.error(str(e))
             st.stop()
         
-        probleme = LpProblem("Probleme_Lineaire", modele_type)
-        termes_objectif = parse_expression(expr)
-        
-        # Collecte des variables
-        variables = set()
-        for coeff, var in termes_objectif:
-            variables.add(var)
-        for lhs, _, _ in contraintes:
-            for coeff, var in parse_expression(lhs):
-                variables.add(var)
-        variables = sorted(variables)
+        variables = modele.variables
         
         if len(variables) != 2:
             st.error("⚠️ La résolution est disponible uniquement pour 2 variables (ex: x et y).")
             st.stop()
         
-        # Création des variables PuLP
-        lp_vars = LpVariable.dicts("Var", variables, lowBound=0)
-        
-        # Fonction objectif
-        probleme += sum(coeff * lp_vars[var] for coeff, var in termes_objectif)
-        
-        # Contraintes
-        for lhs, op, rhs in contraintes:
-            expr = sum(coeff * lp_vars[var] for coeff, var in parse_expression(lhs))
-            if op == '<=':
-                probleme += expr <= rhs
-            elif op == '>=':
-                probleme += expr >= rhs
-            else:
-                probleme += expr == rhs
-        
         # Résolution
-        probleme.solve()
+        # Solveur de la barre latérale (par défaut : sommets NumPy, repli sur CBC si entrée dégénérée)
+        resultat = resoudre_en_cache(modele, solveur)
+        afficher_statistiques(zone_cache)
         
         # Résultats
         st.subheader("Résultats de l'optimisation")
-        st.write("**Statut :**", LpStatus[probleme.status])
+        st.write("**Statut :**", resultat.statut)
+        temps = f"⏱️ {resultat.methode} : {resultat.temps * 1000:.2f} ms"
+        if comparer_cbc and resultat.methode != "CBC":
+            temps += f" • CBC : {resoudre(modele).temps * 1000:.2f} ms"
+        st.caption(temps)
+        
+        # Simplexe pas à pas : mêmes statut et optimum que CBC, tableaux à l'appui
+        if pas_a_pas:
+            debut = time.perf_counter()
+            statut_simplexe, x_simplexe, etapes = simplexe_detaille(modele)
+            duree = time.perf_counter() - debut
+            afficher_etapes(etapes)
+            reference = resultat if resultat.methode == "CBC" else resoudre(modele)
+            accord = statut_simplexe == reference.statut and (
+                x_simplexe is None or abs(modele.c @ x_simplexe - reference.objectif)
+                <= 1e-6 * (1 + abs(reference.objectif)))
+            st.caption(f"{'✅' if accord else '⚠️'} Simplexe : {statut_simplexe}, "
+                       f"{sum(e.ligne is not None for e in etapes)} pivots en {duree * 1000:.2f} ms"
+                       f" • CBC : {reference.statut} en {reference.temps * 1000:.2f} ms")
+        
+        if resultat.statut == "Infeasible":
+            st.warning("Aucune solution réalisable : les contraintes sont incompatibles.")
+            st.stop()
+        if resultat.statut == "Unbounded":
+            st.warning("Problème non borné : la fonction économique n'a pas d'optimum fini.")
+            st.stop()
+        if resultat.objectif is None:
+            st.warning("Pas de solution optimale pour ce problème.")
+            st.stop()
         
         # Récupération des valeurs des variables
-        solution = {}
-        for var in variables:
-            val = lp_vars[var].varValue
-            solution[var] = val
+        solution = resultat.valeurs
         
         # Formatage de l'affichage selon votre demande
         if len(variables) == 2:
@@ -153,10 +138,13 @@ if st.button("Résoudre"):
             # Affichage au format (x;y) z=
             st.write(f"**Solution optimale :** ({var1};{var2}) = ({x_val:.2f};{y_val:.2f})")
         
-        optimal_value = probleme.objective.value()
+        optimal_value = resultat.objectif
         st.write(f"**Valeur optimale :** z = {optimal_value:.2f}")
         
         # Affichage détaillé supplémentaire
         st.write("**Détail des valeurs :**")
         for var in variables:
-            st.write(f"- {var} = {solution[var]:.2f}")
\ No newline at end of file
+            st.write(f"- {var} = {solution[var]:.2f}")
+        
+        afficher_sensibilite(modele, resultat,
+                             [f"{lhs} {op} {rhs}" for lhs, op, rhs in contraintes])
\ No newline at end of file
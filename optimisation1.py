@@ -8,84 +8,68 @@ Created on Fri Sep 26 16:26:28 2025
 import streamlit as st
 import matplotlib.pyplot as plt
 import numpy as np
-from pulp import LpMaximize, LpMinimize, LpProblem, LpVariable, LpStatus
-import re
-import io
-# ==============================
-# Fonction de parsing linéaire
-# ==============================
-def analyse_syntaxique(expression):
-    expression = expression.replace(" ", "")
-    termes = re.findall(r'([+-]?[\d.]*[a-zA-Z]+)', expression)
-    analysee = []
-    
-    for terme in termes:
-        signe = 1
-        if terme.startswith('-'):
-            signe = -1
-            terme = terme[1:]
-        elif terme.startswith('+'):
-            terme = terme[1:]
-        
-        partie_coef = re.match(r'^[\d.]+', terme)
-        partie_variable = terme[len(partie_coef.group()):] if partie_coef else terme
-        
-        coeff = float(partie_coef.group()) if partie_coef else 1.0
-        coeff *= signe
-        
-        if partie_variable:
-            analysee.append((coeff, partie_variable))
-    
-    return analysee
+import time
+from dataclasses import replace
+from lp_core import (analyse_contrainte, analyse_objectif,
+                     construire_modele, resoudre)
+from lp_simplexe import resoudre_simplexe
+from lp_solveurs import SOLVEURS_2D, choisir_solveur
+from lp_cache import resoudre_en_cache, afficher_statistiques, cle_canonique
+from lp_historique import afficher_historique
+from cache_figures import afficher_figure
+from lp_graphique import spec_vega_lite, tracer_zone_realisable
+from lp_iis import afficher_iis, trouver_iis
+from lp_incremental import ResolutionIncrementale
+from lp_sensibilite import afficher_sensibilite, analyser_sensibilite, reponse_par_base
+from lp_sommets import cadre_affichage, demi_plans, sommets
 
 # ==============================
 # Affichage graphique
 # ==============================
-def affichage_graphique(contraintes, solution_x, solution_y, variables):
+def affichage_graphique(modele, contraintes, solution_x, solution_y, conflit=()):
     fig, ax = plt.subplots(figsize=(10, 8))
-    x_max = max(solution_x * 2, 50) if solution_x > 0 else 50
-    x_vals = np.linspace(0, x_max, 400)
-    colors = ['blue', 'green', 'red', 'orange', 'purple']
+    variables = modele.variables
+    libelles = [f'{lhs} {op} {rhs}' for lhs, op, rhs in contraintes]
+    tracer_zone_realisable(ax, modele, libelles, (solution_x, solution_y), surlignees=conflit)
     
-    for i, (lhs, op, rhs) in enumerate(contraintes):
-        if i < len(colors):
-            termes = analyse_syntaxique(lhs)
-            if len(termes) == 2:
-                a, var1 = termes[0]
-                b, var2 = termes[1]
-                if b != 0:
-                    y_vals = (rhs - a * x_vals) / b
-                    label = f'{lhs} {op} {rhs}'
-                    ax.plot(x_vals, y_vals, label=label, linewidth=2, color=colors[i])
-                    if op == '>=':
-                        ax.fill_between(x_vals, y_vals, y_vals + 100, alpha=0.2, color=colors[i])
-                    elif op == '<=':
-                        ax.fill_between(x_vals, y_vals, 0, alpha=0.2, color=colors[i])
-    
-    if solution_x is not None and solution_y is not None:
-        ax.plot(solution_x, solution_y, 'ro', markersize=10, 
-                label=f'Solution ({solution_x:.2f}, {solution_y:.2f})')
-    
-    ax.set_xlabel(variables[0] if variables else 'x')
-    ax.set_ylabel(variables[1] if len(variables) > 1 else 'y')
-    ax.set_title("Zone réalisable et solution optimale", fontsize=16, fontweight='bold')
+    ax.set_xlabel(variables[0])
+    ax.set_ylabel(variables[1])
+    titre = "Contraintes incompatibles" if len(conflit) else "Zone réalisable et solution optimale"
+    ax.set_title(titre, fontsize=16, fontweight='bold')
     ax.legend()
     ax.set_facecolor("#f8f9fa")
     ax.spines['top'].set_visible(False)
     ax.spines['right'].set_visible(False)
     ax.grid(True, linestyle='--', alpha=0.4)
     
-  
-    
-    if solution_x is not None and solution_y is not None:
-        ax.set_xlim(0, max(solution_x * 1.5, 10))
-        ax.set_ylim(0, max(solution_y * 1.5, 10))
-    else:
-        ax.set_xlim(0, 50)
-        ax.set_ylim(0, 50)
-    
     return fig
-   
+
+
+# ==============================
+# Résumé du problème
+# ==============================
+def afficher_resume(objectif, contraintes, conflit=()):
+    """Rappel de la saisie ; les contraintes du `conflit` (IIS) sont surlignées."""
+    st.subheader("📋 Résumé")
+
+    st.write("**Fonction économique :** ")
+    st.markdown(
+        f"<span style='color:#FFD700; font-weight:bold;'>{objectif}.</span> ",
+        unsafe_allow_html=True)
+    st.write("**Contraintes :**")
+    for i, (lhs, op, rhs) in enumerate(contraintes, 1):
+        en_conflit = i - 1 in conflit
+        fond = "background:rgba(255,0,0,0.45); border-radius:4px; padding:2px 6px;" if en_conflit else ""
+        st.markdown(
+            f"<span style='{fond}'>"
+            f"<span style='color:#FFD700; font-weight:bold;'>{i}.</span> "
+            f"<span style='color:#00FFFF;'>{lhs}</span> "
+            f"<span style='color:white;'>{op}</span> "
+            f"<span style='color:#FFA500;'>{rhs}</span>"
+            f"{' ⚠️' if en_conflit else ''}</span>",
+            unsafe_allow_html=True
+        )
+
 
 # ==============================
 # Interface Streamlit
@@ -141,6 +125,16 @@ section[data-testid="stSidebar"] div.stButton > button:hover {
 </style>
 """, unsafe_allow_html=True)
 
+zone_cache = st.sidebar.empty()
+afficher_statistiques(zone_cache)
+solveur = choisir_solveur(SOLVEURS_2D)
+afficher_historique()
+# Proposée avec le simplexe NumPy seulement : elle contourne le cache et l'historique
+incremental = solveur is resoudre_simplexe and st.sidebar.checkbox(
+    "Re-résolution incrémentale", value=False,
+    help="Ne reconstruit que les contraintes modifiées depuis la dernière résolution et "
+         "relance le simplexe NumPy depuis la base précédente.")
+
 st.sidebar.header("🎨 Fond dégradé de la page")
 
 gradient_type = st.sidebar.selectbox(
@@ -219,13 +213,12 @@ contraintes = []
 for i in range(n_contraintes):
     contrainte = st.text_input(f"Contrainte {i+1} (ex: 2x + 3y <= 12)")  
     if contrainte:
-        for op in ['<=', '>=', '==', '=']:
-            if op in contrainte:
-                lhs, rhs = contrainte.split(op, 1)
-                contraintes.append((lhs.strip(), op.strip(), float(rhs.strip())))
-                break
+        analysee = analyse_contrainte(contrainte)
+        if analysee:
+            contraintes.append(analysee)
 
 afficher_graphique = st.checkbox("Afficher la représentation graphique")
+comparer_cbc = st.checkbox("Comparer le temps de calcul avec CBC")
 
 # ==============================
 # Résolution du problème
@@ -234,52 +227,67 @@ if st.button("Résoudre"):
     if not objectif:
         st.error("Veuillez entrer une fonction économique valide.")
     else:
-        if objectif.lower().startswith("max"):
-            modele_type = LpMaximize
-            expression = objectif[3:].strip()
-        elif objectif.lower().startswith("min"):
-            modele_type = LpMinimize
-            expression = objectif[3:].strip()
-        else:
-            st.error("La fonction doit commencer par 'max' ou 'min'.")
+        st.session_state.pop("quoi_si", None)
+        try:
+            sens, expression = analyse_objectif(objectif)
+            if incremental:
+                # Modèle et base de la résolution précédente, propres à la session
+                etat = st.session_state.setdefault("incremental", ResolutionIncrementale())
+                modele = etat.modele_pour(sens, expression, contraintes)
+            else:
+                modele = construire_modele(sens, expression, contraintes)
+        except ValueError as e:
+            st.error(str(e))
             st.stop()
-        
-        probleme = LpProblem("Probleme_Lineaire", modele_type)
-        termes_objectif = analyse_syntaxique(expression)
-        
-        variables = set()
-        for coeff, var in termes_objectif:
-            variables.add(var)
-        for lhs, _, _ in contraintes:
-            for coeff, var in analyse_syntaxique(lhs):
-                variables.add(var)
-        variables = sorted(variables)
+        variables = modele.variables
         
         if len(variables) != 2:
             st.error("⚠️ La résolution est disponible uniquement pour 2 variables (ex: x et y).")
             st.stop()
         
-        lp_vars = LpVariable.dicts("Var", variables, lowBound=0)
-        probleme += sum(coeff * lp_vars[var] for coeff, var in termes_objectif)
-        
-        for lhs, op, rhs in contraintes:
-            expression = sum(coeff * lp_vars[var] for coeff, var in analyse_syntaxique(lhs))
-            if op == '<=':
-                probleme += expression <= rhs
-            elif op == '>=':
-                probleme += expression >= rhs
-            else:
-                probleme += expression == rhs
-        
-        probleme.solve()
+        # Simplexe à chaud de la session, ou solveur de la barre latérale
+        # (par défaut : sommets NumPy, repli sur CBC si entrée dégénérée)
+        resultat = etat(modele) if incremental else resoudre_en_cache(modele, solveur)
+        afficher_statistiques(zone_cache)
         
         st.subheader("Résultats de l'optimisation")
-        st.write("**Statut :**", LpStatus[probleme.status])
+        st.write("**Statut :**", resultat.statut)
+        temps = f"⏱️ {resultat.methode} : {resultat.temps * 1000:.2f} ms"
+        if incremental:
+            temps += (" • modèle reconstruit" if etat.lignes_modifiees is None
+                      else f" • {len(etat.lignes_modifiees)} contrainte(s) modifiée(s)")
+        if comparer_cbc and resultat.methode != "CBC":
+            temps += f" • CBC : {resoudre(modele).temps * 1000:.2f} ms"
+        st.caption(temps)
         
-        solution = {}
-        for var in variables:
-            val = lp_vars[var].varValue
-            solution[var] = val
+        if resultat.statut == "Infeasible":
+            st.warning("Aucune solution réalisable : les contraintes sont incompatibles.")
+            # Plus petit groupe de contraintes en conflit, surligné partout
+            iis = trouver_iis(modele)
+            afficher_iis(iis, [f"{lhs} {op} {rhs}" for lhs, op, rhs in contraintes])
+            conflit = tuple(iis.lignes) if iis else ()
+            if afficher_graphique:
+                st.subheader("📈 Représentation Graphique")
+                cle = ("optimisation1", cle_canonique(modele), tuple(contraintes), "conflit", conflit)
+                afficher_figure(cle, lambda: affichage_graphique(modele, contraintes, None, None, conflit),
+                                "graphique.png", bbox_inches="tight")
+            st.markdown("---")
+            afficher_resume(objectif, contraintes, conflit)
+            st.stop()
+        if resultat.statut == "Unbounded":
+            st.warning("Problème non borné : la fonction économique n'a pas d'optimum fini.")
+            st.stop()
+        if resultat.objectif is None:
+            st.warning("Pas de solution optimale pour ce problème.")
+            st.stop()
+        
+        solution = resultat.valeurs
+        # Point de départ des curseurs « et si » (base optimale comprise)
+        st.session_state["quoi_si"] = {
+            "origine": modele, "cle": cle_canonique(modele)[:8], "contraintes": contraintes,
+            "sensibilite": analyser_sensibilite(modele, solution),
+            "cadre": cadre_affichage(sommets(*demi_plans(modele)), tuple(solution.values())),
+        }
         
         if len(variables) == 2:
             var1, var2 = variables
@@ -287,19 +295,23 @@ if st.button("Résoudre"):
             y_val = solution[var2]
             st.write(f"**Solution optimale :** ({var1};{var2}) = ({x_val:.2f};{y_val:.2f})")
         
-        optimal_value = probleme.objective.value()
+        optimal_value = resultat.objectif
         st.write(f"**Valeur optimale :** z = {optimal_value:.2f}")
         
         st.write("**Détail des valeurs :**")
         for var in variables:
             #st.write(f"- {var} = {solution[var]:.2f}")
             st.markdown(f"<span style='color:#00C9FF;'>{var} = {solution[var]:.2f}</span>", unsafe_allow_html=True)
+        afficher_sensibilite(modele, resultat,
+                             [f"{lhs} {op} {rhs}" for lhs, op, rhs in contraintes])
         if afficher_graphique:
             st.subheader("📈 Représentation Graphique")
             try:
                 if x_val is not None and y_val is not None:
-                    fig = affichage_graphique(contraintes, x_val, y_val, variables)
-                    st.pyplot(fig)
+                    # Rendu PNG unique par (problème, solution), partagé avec le téléchargement
+                    cle = ("optimisation1", cle_canonique(modele), tuple(contraintes), x_val, y_val)
+                    afficher_figure(cle, lambda: affichage_graphique(modele, contraintes, x_val, y_val),
+                                    "graphique.png", bbox_inches="tight")
                     st.markdown("""
 <div style='color:white; font-size:16px;'>
     <b>Légende du graphique :</b><br><br>
@@ -314,40 +326,78 @@ if st.button("Résoudre"):
                     st.warning("Impossible d'afficher le graphique : solution non trouvée")
             except Exception as e:
                 st.warning(f"Impossible d'afficher le graphique : {e}")
-                # 📥 Bouton de téléchargement du graphique
-            buf = io.BytesIO()
-            fig.savefig(buf, format="png", bbox_inches="tight")
-            buf.seek(0)  # 🔹 très important pour que le fichier soit lu depuis le début
-            st.download_button(
-                "📸 Télécharger le graphique",
-                data=buf,
-                file_name="graphique.png",
-                mime="image/png"
-            )
-
 
             # Téléchargement des résultats
             texte = f"Solution : {solution}\nValeur optimale : {optimal_value}"
             st.download_button("📥 Télécharger les résultats", data=texte, file_name="resultats.txt")
         
         st.markdown("---")
-        st.subheader("📋 Résumé")
-        
-        st.write("**Fonction économique :** ")
-        st.markdown(
-         f"<span style='color:#FFD700; font-weight:bold;'>{objectif}.</span> " ,
-         unsafe_allow_html=True)
-        st.write("**Contraintes :**")
-        for i, (lhs, op, rhs) in enumerate(contraintes, 1):
-            st.markdown(
-              
-       f"<span style='color:#FFD700; font-weight:bold;'>{i}.</span> "
-       f"<span style='color:#00FFFF;'>{lhs}</span> "
-       f"<span style='color:white;'>{op}</span> "
-       f"<span style='color:#FFA500;'>{rhs}</span>",
-       unsafe_allow_html=True
-   )
+        afficher_resume(objectif, contraintes)
                
+# ==============================
+# Et si… ? (curseurs sur les coûts et les seconds membres)
+# ==============================
+# Un fragment ne réexécute que lui-même quand un curseur bouge
+_fragment = getattr(st, "fragment", lambda fonction: fonction)
+
+
+def _curseur(valeur):
+    """Curseur centré sur la valeur résolue, de ± max(|valeur|, 1)."""
+    ecart = max(abs(valeur), 1.0)
+    return dict(min_value=float(valeur - ecart), max_value=float(valeur + ecart),
+                value=float(valeur), step=ecart / 50)
+
+
+@_fragment
+def panneau_quoi_si():
+    etat = st.session_state.get("quoi_si")
+    if etat is None:
+        return
+    # Les curseurs partent du problème résolu ; la clé change avec le problème
+    modele, contraintes, suffixe = etat["origine"], etat["contraintes"], etat["cle"]
+
+    st.markdown("---")
+    st.subheader("🎚️ Et si… ?")
+    col_c, col_b = st.columns(2)
+    c = np.array([col_c.slider(f"Coût de {var}", **_curseur(valeur), key=f"quoi_si_c{j}_{suffixe}")
+                  for j, (var, valeur) in enumerate(zip(modele.variables, modele.c))])
+    b = np.array([col_b.slider(f"{lhs} {op} …", **_curseur(rhs), key=f"quoi_si_b{i}_{suffixe}")
+                  for i, (lhs, op, rhs) in enumerate(contraintes)])
+
+    debut = time.perf_counter()
+    variante = replace(modele, b=b, c=c)
+    reponse = None if etat["sensibilite"] is None else reponse_par_base(modele, etat["sensibilite"], b, c)
+    if reponse is not None:
+        (x_val, y_val), z = reponse
+        origine = "base inchangée : réponse tirée de la sensibilité, sans solveur"
+    else:
+        resultat = resoudre_en_cache(variante, solveur)
+        origine = f"base modifiée : nouvelle résolution ({resultat.methode})"
+        if resultat.statut != "Optimal":
+            x_val = y_val = z = None
+        else:
+            x_val, y_val = (resultat.valeurs[var] for var in modele.variables)
+            z = resultat.objectif
+            # La nouvelle base optimale répond aux mouvements suivants
+            etat["sensibilite"] = analyser_sensibilite(variante, resultat.valeurs)
+    libelles = [f"{lhs} {op} {rhs:g}" for (lhs, op, _), rhs in zip(contraintes, b)]
+    spec = spec_vega_lite(variante, libelles, (x_val, y_val), etat["cadre"])
+    duree = (time.perf_counter() - debut) * 1000
+
+    if z is None:
+        st.warning(f"Pas de solution optimale pour ces valeurs ({resultat.statut}).")
+    else:
+        var1, var2 = modele.variables
+        col1, col2, col3 = st.columns(3)
+        col1.metric("z", f"{z:.4g}")
+        col2.metric(var1, f"{x_val:.4g}")
+        col3.metric(var2, f"{y_val:.4g}")
+    st.vega_lite_chart(spec)
+    st.caption(f"⚡ {duree:.1f} ms • {origine}")
+
+
+panneau_quoi_si()
+
 # ==============================
 # Instructions
 # ==============================
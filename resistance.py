@@ -7,7 +7,7 @@ Created on Fri Oct 10 18:17:28 2025
 
 import streamlit as st
 import matplotlib.pyplot as plt
-import io
+from cache_figures import afficher_figure
 
 st.set_page_config(page_title="Calculateur de résistance ", layout="centered")
 st.sidebar.markdown("""
@@ -219,37 +219,33 @@ if st.button("🧮 Calculer la résistance"):
             # ======================
             # 🧱 Dessin de la résistance
             # ======================
-            fig, ax = plt.subplots(figsize=(6, 2))
-            ax.axis("off")
-
-            # Corps principal
-            ax.add_patch(plt.Rectangle((0, 0.3), 6, 0.4, color="#F4E1C1", ec="black"))
-            # Connexions
-            ax.plot([-1, 0], [0.5, 0.5], color="gray", linewidth=5)
-            ax.plot([6, 7], [0.5, 0.5], color="gray", linewidth=5)
-
-            # Positions et couleurs
-            positions = [1.2, 2.2, 3.2, 4.8]
-            colors_map = {
-                "Noir": "black", "Marron": "#6B3E26", "Rouge": "red", "Orange": "orange",
-                "Jaune": "yellow", "Vert": "green", "Bleu": "blue", "Violet": "purple",
-                "Gris": "gray", "Blanc": "white", "Or": "#C9B037", "Argent": "#C0C0C0"
-            }
-
-            for i, color in enumerate([b1, b2, b3, b4]):
-                ax.add_patch(plt.Rectangle((positions[i], 0.3), 0.2, 0.4, color=colors_map[color]))
-
-            ax.set_xlim(-1, 7)
-            ax.set_ylim(0, 1)
-            st.pyplot(fig)
-
-            # ======================
-            # 💾 Téléchargement
-            # ======================
-            buf = io.BytesIO()
-            fig.savefig(buf, format="png")
-            st.download_button("📸 Télécharger le graphique", data=buf.getvalue(),
-                               file_name="resistance.png", mime="image/png")
+            def dessiner_resistance():
+                fig, ax = plt.subplots(figsize=(6, 2))
+                ax.axis("off")
+
+                # Corps principal
+                ax.add_patch(plt.Rectangle((0, 0.3), 6, 0.4, color="#F4E1C1", ec="black"))
+                # Connexions
+                ax.plot([-1, 0], [0.5, 0.5], color="gray", linewidth=5)
+                ax.plot([6, 7], [0.5, 0.5], color="gray", linewidth=5)
+
+                # Positions et couleurs
+                positions = [1.2, 2.2, 3.2, 4.8]
+                colors_map = {
+                    "Noir": "black", "Marron": "#6B3E26", "Rouge": "red", "Orange": "orange",
+                    "Jaune": "yellow", "Vert": "green", "Bleu": "blue", "Violet": "purple",
+                    "Gris": "gray", "Blanc": "white", "Or": "#C9B037", "Argent": "#C0C0C0"
+                }
+
+                for i, color in enumerate([b1, b2, b3, b4]):
+                    ax.add_patch(plt.Rectangle((positions[i], 0.3), 0.2, 0.4, color=colors_map[color]))
+
+                ax.set_xlim(-1, 7)
+                ax.set_ylim(0, 1)
+                return fig
+
+            # Rendu PNG unique par combinaison de bandes : affichage et téléchargement
+            afficher_figure(("resistance", b1, b2, b3, b4), dessiner_resistance, "resistance.png")
 
             texte = f"Résistance = {valeur_aff} ± {tol}%"
             st.download_button("📥 Télécharger les résultats", data=texte.encode("utf-8"), file_name="resultat_resistance.txt")
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Résolution en lot de programmes linéaires, sans Streamlit.
+
+Chaque ligne du fichier d'entrée (JSONL) décrit un problème :
+    {"id": "p1", "objectif": "max 3x + 5y", "contraintes": ["x <= 4", "2y <= 12"],
+     "entieres": "int x, y"}
+("sens" peut aussi être donné à part, "entieres" est facultatif). Les
+problèmes sont analysés et résolus par un pool de processus ; une ligne de
+résultat JSON est écrite par problème, dans l'ordre d'entrée, dès qu'elle
+est prête. Le débit (problèmes par seconde) est affiché sur la sortie
+d'erreur.
+
+Usage : python resoudre_lot.py problemes.jsonl [--sortie resultats.jsonl]
+        cat problemes.jsonl | python resoudre_lot.py --solveur "HiGHS (SciPy)"
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+from lp_core import (analyse_contrainte, analyse_declaration, analyse_objectif,
+                     construire_modele, declarer_entieres)
+from lp_presolve import resoudre_avec_presolve
+from lp_solveurs import SOLVEURS, SOLVEURS_MIP
+
+TAILLE_PAQUET = 16
+
+_SOLVEUR = None
+_OPTIONS = {}
+_PRESOLVE = False
+
+
+def modele_depuis_probleme(probleme):
+    """Construit le ModeleLineaire d'un problème décodé du JSONL."""
+    if "sens" in probleme:
+        sens, expression = str(probleme["sens"]).lower(), probleme["objectif"]
+    else:
+        sens, expression = analyse_objectif(probleme["objectif"])
+
+    contraintes, declarations = [], []
+    for texte in probleme.get("contraintes", []):
+        if not texte.strip():
+            continue
+        declaration = analyse_declaration(texte)
+        if declaration:
+            declarations.append(declaration)
+            continue
+        analysee = analyse_contrainte(texte)
+        if analysee is None:
+            raise ValueError(f"Contrainte sans opérateur : {texte!r}")
+        contraintes.append(analysee)
+    declarations += [analyse_declaration(partie)
+                     for partie in probleme.get("entieres", "").split(";")]
+
+    modele = construire_modele(sens, expression, contraintes)
+    entieres = [var for d in declarations if d and d[0] == "int" for var in d[1]]
+    binaires = [var for d in declarations if d and d[0] == "bin" for var in d[1]]
+    if entieres or binaires:
+        modele = declarer_entieres(modele, entieres, binaires)
+    return modele
+
+
+def _initialiser(solveur, options, presolve):
+    global _SOLVEUR, _OPTIONS, _PRESOLVE
+    _SOLVEUR, _OPTIONS, _PRESOLVE = solveur, options, presolve
+
+
+def _resoudre(modele):
+    return _SOLVEUR(modele, **_OPTIONS)
+
+
+def resoudre_ligne(numero_texte):
+    """(numéro, ligne JSON) -> (ligne JSON de résultat, erreur ?).
+
+    Les erreurs d'analyse ou de résolution sont consignées dans le résultat.
+    """
+    numero, texte = numero_texte
+    sortie = {"ligne": numero}
+    try:
+        probleme = json.loads(texte)
+        sortie["id"] = probleme.get("id", numero)
+        modele = modele_depuis_probleme(probleme)
+        if modele.mip and _SOLVEUR not in SOLVEURS_MIP:
+            raise ValueError("Ce solveur ne traite pas les variables entières.")
+        if _PRESOLVE:
+            resultat, _ = resoudre_avec_presolve(modele, _resoudre)
+        else:
+            resultat = _resoudre(modele)
+        sortie.update(statut=resultat.statut, objectif=resultat.objectif,
+                      valeurs=resultat.valeurs, temps_ms=resultat.temps * 1000,
+                      methode=resultat.methode)
+        if resultat.borne is not None:
+            sortie.update(borne=resultat.borne, ecart=resultat.ecart)
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        sortie["erreur"] = f"{type(e).__name__} : {e}"
+    return json.dumps(sortie, ensure_ascii=False), "erreur" in sortie
+
+
+def resoudre_flux(lignes, solveur, options=None, presolve=False, processus=None,
+                  taille_paquet=TAILLE_PAQUET):
+    """Générateur des (ligne de résultat, erreur ?), dans l'ordre des lignes non vides."""
+    numerotees = ((numero, texte) for numero, texte in enumerate(lignes, 1) if texte.strip())
+    with Pool(processus or os.cpu_count() or 1, initializer=_initialiser,
+              initargs=(solveur, options or {}, presolve)) as pool:
+        yield from pool.imap(resoudre_ligne, numerotees, chunksize=taille_paquet)
+
+
+def main(arguments=None):
+    parseur = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parseur.add_argument("entree", nargs="?", default="-",
+                         help="fichier JSONL de problèmes (défaut : entrée standard)")
+    parseur.add_argument("--sortie", help="fichier JSONL de résultats (défaut : sortie standard)")
+    parseur.add_argument("--solveur", default="CBC (PuLP)", choices=list(SOLVEURS))
+    parseur.add_argument("--presolve", action="store_true", help="réduire le modèle avant résolution")
+    parseur.add_argument("--limite-temps", type=float, help="limite par problème, en secondes")
+    parseur.add_argument("--processus", type=int, help="taille du pool (défaut : nombre de cœurs)")
+    parseur.add_argument("--paquet", type=int, default=TAILLE_PAQUET,
+                         help="problèmes envoyés à la fois à chaque processus")
+    args = parseur.parse_args(arguments)
+
+    options = {} if args.limite_temps is None else {"limite_temps": args.limite_temps}
+    entree = sys.stdin if args.entree == "-" else open(args.entree, encoding="utf-8")
+    sortie = sys.stdout if args.sortie is None else open(args.sortie, "w", encoding="utf-8")
+    total = erreurs = 0
+    debut = time.perf_counter()
+    try:
+        for ligne, erreur in resoudre_flux(entree, SOLVEURS[args.solveur], options,
+                                           args.presolve, args.processus, args.paquet):
+            sortie.write(ligne + "\n")
+            total += 1
+            erreurs += erreur
+    finally:
+        if entree is not sys.stdin:
+            entree.close()
+        if sortie is not sys.stdout:
+            sortie.close()
+    duree = time.perf_counter() - debut
+    print(f"{total} problèmes en {duree:.2f} s : {total / duree if duree else 0:.1f} problèmes/s"
+          f" ({erreurs} erreurs)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
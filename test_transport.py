@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Non-régression du simplexe des transports sur des offres fractionnaires.
+
+Les restes d'arrondi de 10/6 faisaient fermer une colonne au lieu d'une
+ligne dans le moindre coût : base non couvrante, puis boucle sans fin dans
+_chemin ou coût faux. Le coût est comparé à HiGHS sur le même problème.
+"""
+
+import numpy as np
+import pytest
+
+from lp_solveurs import resoudre_highs
+from lp_transport import _chemin, _moindre_cout, modele_transport, resoudre_transport
+
+COUTS = np.array([[4, 4], [2, 1], [5, 0], [4, 3], [1, 4], [2, 4]], dtype=float)
+
+
+def _cout_highs(couts, offres, demandes):
+    return resoudre_highs(modele_transport(couts, offres, demandes)).objectif
+
+
+def test_base_initiale_couvrante():
+    flux, base = _moindre_cout(COUTS, np.full(6, 10 / 6), np.array([5.0, 5.0]))
+    assert base.sum() == 6 + 2 - 1
+
+
+def test_offres_fractionnaires():
+    offres, demandes = np.full(6, 10 / 6), np.array([5.0, 5.0])
+    plan = resoudre_transport(COUTS, offres, demandes)
+    assert plan.statut == "Optimal"
+    assert plan.cout == pytest.approx(_cout_highs(COUTS, offres, demandes))
+
+
+@pytest.mark.parametrize("graine", range(20))
+def test_parts_egales_aleatoires(graine):
+    rng = np.random.default_rng(graine)
+    m, n = rng.integers(2, 8, size=2)
+    couts = rng.integers(0, 6, (m, n)).astype(float)
+    total = float(rng.integers(1, 30))
+    offres, demandes = np.full(m, total / m), np.full(n, total / n)
+    plan = resoudre_transport(couts, offres, demandes)
+    assert plan.statut == "Optimal"
+    assert plan.cout == pytest.approx(_cout_highs(couts, offres, demandes), abs=1e-7)
+    assert np.allclose(plan.flux.sum(axis=0), demandes)
+
+
+def test_chemin_entre_composantes():
+    # Deux nœuds isolés (racines distinctes) : erreur plutôt que boucle infinie
+    with pytest.raises(RuntimeError):
+        _chemin([-1, -1], [0, 0], 0, 1)